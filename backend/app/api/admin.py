@@ -1,8 +1,10 @@
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
 from app.services.pokedex_data_loader import get_data_loader
+from app.services.response_cache import pokedex_list_cache
 from app.services.crawler_service import crawler
 from app.services.email_service import email_service
 from app.core.database import SessionLocal
@@ -15,6 +17,7 @@ logger = logging.getLogger(__name__)
 class ReloadResponse(BaseModel):
     status: str
     message: str
+    data_version: Optional[str] = None
 
 
 @router.post("/reload-data", response_model=ReloadResponse)
@@ -32,14 +35,20 @@ async def reload_data():
 
     This allows you to update season data, add new Pokémon, or modify
     tier rankings without server downtime.
+
+    The new data is loaded into a separate snapshot in a worker thread and
+    swapped in atomically, so in-flight requests keep reading the old version.
     """
     try:
         loader = get_data_loader()
-        loader.reload_data()
+        snapshot = await run_in_threadpool(loader.reload_data)
+        # Cached list bodies are keyed by data version, drop the old ones now
+        pokedex_list_cache.clear()
 
         return ReloadResponse(
             status="success",
-            message="All data files reloaded successfully"
+            message="All data files reloaded successfully",
+            data_version=snapshot.version
         )
     except Exception as e:
         return ReloadResponse(
@@ -59,10 +68,14 @@ async def get_data_stats():
     - Seasonal tiers
     - Raid counters
     - PvP rankings
+    - Data snapshot version
     """
-    loader = get_data_loader()
+    loader = get_data_loader().pinned()
 
     return {
+        "data_version": loader.data_version,
+        "data_loaded_at": loader.snapshot.loaded_at.isoformat(),
+        "data_source": loader.snapshot.source,
         "pokemon_count": len(loader.pokemon_base),
         "moves_count": len(loader.moves),
         "pokemon_moves_count": len(loader.pokemon_moves),
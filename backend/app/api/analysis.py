@@ -1,14 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
-from typing import Optional, List, Optional
+from typing import Optional, List, Optional, Set, Tuple
+import asyncio
+import logging
 import os
+import tempfile
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.models.analysis_job import AnalysisJob
 from app.models.pokemon_analysis import PokemonAnalysis
+from app.models.iv_session import IVSession
+from app.services import iv_session
+from app.services.analysis_engine import AnalysisBusyError, analysis_engine
 from app.services.iv_calculator import iv_calculator
-from pydantic import BaseModel
+from app.services.pokedex_data_loader import get_data_loader
+from app.services.screen_recording import EncodedFrame, iter_encoded_frames
+from app.services.screenshot_cache import Fingerprint, fingerprint, screenshot_cache
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/analysis", tags=["analysis"])
 
@@ -16,6 +31,17 @@ router = APIRouter(prefix="/api/analysis", tags=["analysis"])
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Most screenshots accepted by one /batch request
+MAX_BATCH_FILES = 100
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Seconds a recording waits before retrying when the analysis queue is full
+RECORDING_RETRY_SECONDS = 0.5
+
+# Keep background tasks (jobs, upload writes) referenced until they finish
+_background_tasks: Set["asyncio.Task"] = set()
+
 
 class AnalysisResponse(BaseModel):
     id: int
@@ -30,65 +56,775 @@ class AnalysisResponse(BaseModel):
     battle_rating: Optional[str]
     raid_rating: Optional[str]
     recommendations: Optional[dict]
+    iv_details: Optional[dict] = None
     analyzed_at: datetime
 
     class Config:
         from_attributes = True
 
 
+def _validate_image(file: UploadFile):
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be an image")
+
+
+async def _read_upload(file: UploadFile) -> bytearray:
+    """
+    Read an upload into a single buffer in chunks, rejecting it with 413
+    as soon as it passes ANALYSIS_MAX_UPLOAD_MB
+    """
+    max_bytes = settings.ANALYSIS_MAX_UPLOAD_MB * 1024 * 1024
+    too_large = HTTPException(status_code=413, detail=f"File is larger than {settings.ANALYSIS_MAX_UPLOAD_MB} MB")
+    if file.size is not None and file.size > max_bytes:
+        raise too_large
+
+    data = bytearray()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        data += chunk
+        if len(data) > max_bytes:
+            raise too_large
+    return data
+
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def _write_upload(file_path: str, data: bytes):
+    try:
+        with open(file_path, "wb") as buffer:
+            buffer.write(data)
+    except OSError as e:
+        logger.error(f"Failed to save upload {file_path}: {e}")
+
+
+def _persist_upload(data: bytes, original_filename: Optional[str]) -> Optional[str]:
+    """
+    Save the original screenshot in the background if ANALYSIS_SAVE_UPLOADS
+    is on, returning its filename under uploads/ (None when not kept)
+    """
+    if not settings.ANALYSIS_SAVE_UPLOADS:
+        return None
+    file_extension = os.path.splitext(original_filename or "")[1]
+    unique_filename = f"{uuid.uuid4()}{file_extension}"
+    _spawn(asyncio.to_thread(_write_upload, os.path.join(UPLOAD_DIR, unique_filename), data))
+    return unique_filename
+
+
+def _submit_analysis(data: bytes, trainer_level: Optional[int] = None) -> "asyncio.Future[dict]":
+    """Queue an upload on the analysis engine, or reject it with 429"""
+    try:
+        return analysis_engine.submit(data, trainer_level)
+    except AnalysisBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+
+async def _find_duplicate(db: Session, data: bytes) -> Tuple[Optional[PokemonAnalysis], Optional[Fingerprint]]:
+    """
+    Stored analysis of the same screenshot, or of a re-compressed copy
+    whose CP/HP crops read the same, plus the upload's fingerprint
+    """
+    fp = await asyncio.to_thread(fingerprint, data)
+    if fp is None:
+        return None, None
+    match = screenshot_cache.lookup(db, fp)
+    if match is None:
+        return None, fp
+    analysis = db.query(PokemonAnalysis).filter(PokemonAnalysis.id == match.analysis_id).first()
+    if analysis is None:
+        return None, fp
+
+    if not match.exact:
+        # Perceptual hashes can't see single digits; confirm CP/HP first
+        if analysis.cp is None or analysis.hp is None:
+            return None, fp
+        try:
+            same = await analysis_engine.submit_numbers_check(data, analysis.cp, analysis.hp)
+        except AnalysisBusyError:
+            return None, fp
+        if not same:
+            return None, fp
+    return analysis, fp
+
+
+def _analysis_row(analysis_result: dict, image_filename: Optional[str]) -> PokemonAnalysis:
+    return PokemonAnalysis(
+        pokemon_name=analysis_result['pokemon_name'],
+        cp=analysis_result['cp'],
+        hp=analysis_result['hp'],
+        level=analysis_result['level'],
+        iv_percentage=analysis_result['iv_percentage'],
+        attack_iv=analysis_result['attack_iv'],
+        defense_iv=analysis_result['defense_iv'],
+        stamina_iv=analysis_result['stamina_iv'],
+        battle_rating=analysis_result['battle_rating'],
+        raid_rating=analysis_result['raid_rating'],
+        recommendations=analysis_result['recommendations'],
+        iv_details=analysis_result.get('iv_details'),
+        image_filename=image_filename
+    )
+
+
 @router.post("/upload", response_model=AnalysisResponse)
 async def upload_screenshot(
     file: UploadFile = File(...),
+    trainer_level: Optional[int] = Query(None, ge=1, le=50, description="Trainer level, enables level-arc detection"),
     db: Session = Depends(get_db)
 ):
     """
     Upload Pokemon screenshot and analyze IV
     """
     try:
-        # Validate file type
-        if not file.content_type or not file.content_type.startswith('image/'):
-            raise HTTPException(status_code=400, detail="File must be an image")
+        _validate_image(file)
+        data = await _read_upload(file)
 
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
+        # Repeat uploads return the stored analysis without a full analysis
+        cached, fp = await _find_duplicate(db, data)
+        if cached is not None:
+            return cached
 
-        # Save uploaded file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # Analyze the image
-        analysis_result = iv_calculator.analyze_screenshot(file_path)
+        # Analyze the image in a worker process, decoding from memory
+        future = _submit_analysis(data, trainer_level)
+        unique_filename = _persist_upload(data, file.filename)
+        analysis_result = await future
 
         # Save to database
-        db_analysis = PokemonAnalysis(
-            pokemon_name=analysis_result['pokemon_name'],
-            cp=analysis_result['cp'],
-            hp=analysis_result['hp'],
-            level=analysis_result['level'],
-            iv_percentage=analysis_result['iv_percentage'],
-            attack_iv=analysis_result['attack_iv'],
-            defense_iv=analysis_result['defense_iv'],
-            stamina_iv=analysis_result['stamina_iv'],
-            battle_rating=analysis_result['battle_rating'],
-            raid_rating=analysis_result['raid_rating'],
-            recommendations=analysis_result['recommendations'],
-            image_filename=unique_filename
-        )
-
+        db_analysis = _analysis_row(analysis_result, unique_filename)
         db.add(db_analysis)
         db.commit()
         db.refresh(db_analysis)
 
+        if fp is not None:
+            screenshot_cache.store(db, fp, db_analysis.id)
+
         return db_analysis
 
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+class BatchItemResult(BaseModel):
+    filename: Optional[str]
+    status: str  # completed or failed
+    error: Optional[str] = None
+    analysis: Optional[AnalysisResponse] = None
+
+
+class BatchResponse(BaseModel):
+    total: int
+    completed: int
+    failed: int
+    results: List[BatchItemResult]
+
+
+async def _analyze_batch(
+    files: List[UploadFile], db: Session, trainer_level: Optional[int] = None
+) -> Tuple[List[object], List[Optional[str]], List[Optional[Fingerprint]]]:
+    """
+    Run uploads through the analysis engine concurrently
+
+    Each file is read right before it's queued and fed to the engine as
+    queue slots free up, so a batch larger than the queue waits on its own
+    analyses instead of being rejected, and only about one queue's worth of
+    images is held in memory. Returns, per file, a result dict, a cached
+    PokemonAnalysis or an exception, plus saved filenames and fingerprints.
+    """
+    outcomes: List[object] = [None] * len(files)
+    filenames: List[Optional[str]] = [None] * len(files)
+    fingerprints: List[Optional[Fingerprint]] = [None] * len(files)
+    pending = {}
+
+    async def wait_for_one():
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            i = pending.pop(future)
+            outcomes[i] = future.exception() or future.result()
+
+    for i, file in enumerate(files):
+        try:
+            _validate_image(file)
+            data = await _read_upload(file)
+        except HTTPException as e:
+            outcomes[i] = ValueError(e.detail)
+            continue
+
+        cached, fingerprints[i] = await _find_duplicate(db, data)
+        if cached is not None:
+            outcomes[i] = cached
+            continue
+
+        while True:
+            try:
+                pending[analysis_engine.submit(data, trainer_level)] = i
+                filenames[i] = _persist_upload(data, file.filename)
+                break
+            except AnalysisBusyError as e:
+                if not pending:
+                    # Saturated by other requests; nothing of ours will free a slot
+                    outcomes[i] = e
+                    break
+                await wait_for_one()
+
+    while pending:
+        await wait_for_one()
+    return outcomes, filenames, fingerprints
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def upload_screenshot_batch(
+    files: List[UploadFile] = File(...),
+    trainer_level: Optional[int] = Query(None, ge=1, le=50, description="Trainer level, enables level-arc detection"),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload many screenshots and analyze them concurrently
+
+    Every analysis is saved with one bulk insert; results are returned per
+    file in upload order.
+    """
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_FILES} files per batch")
+
+    outcomes, filenames, fingerprints = await _analyze_batch(files, db, trainer_level)
+
+    rows: List[Optional[PokemonAnalysis]] = []
+    errors: List[Optional[str]] = []
+    new_rows = []
+    for outcome, filename, fp in zip(outcomes, filenames, fingerprints):
+        if isinstance(outcome, dict):
+            rows.append(_analysis_row(outcome, filename))
+            errors.append(None)
+            new_rows.append((rows[-1], fp))
+        elif isinstance(outcome, PokemonAnalysis):
+            rows.append(outcome)
+            errors.append(None)
+        else:
+            rows.append(None)
+            errors.append(str(outcome) or type(outcome).__name__)
+
+    try:
+        # One multi-row INSERT ... RETURNING; build responses before commit
+        # expires the rows so they aren't re-selected one by one
+        db.add_all([row for row, _ in new_rows])
+        db.flush()
+        new_ids = [(row.id, fp) for row, fp in new_rows]
+
+        results = []
+        for file, row, error in zip(files, rows, errors):
+            if row is not None:
+                results.append(BatchItemResult(filename=file.filename, status="completed",
+                                               analysis=AnalysisResponse.model_validate(row)))
+            else:
+                results.append(BatchItemResult(filename=file.filename, status="failed", error=error))
+
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Saving batch failed: {str(e)}")
+
+    # Fingerprints are committed one by one after the analyses, so a file
+    # stored concurrently by another request only skips its own fingerprint
+    stored = set()
+    for analysis_id, fp in new_ids:
+        if fp is not None and fp.sha256 not in stored:
+            screenshot_cache.store(db, fp, analysis_id)
+            stored.add(fp.sha256)
+
+    completed = sum(1 for row in rows if row is not None)
+    return BatchResponse(total=len(files), completed=completed, failed=len(files) - completed, results=results)
+
+
+class JobResponse(BaseModel):
+    id: str
+    status: str
+    analysis_id: Optional[int]
+    error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
+    result: Optional[AnalysisResponse] = None
+
+
+async def _run_job(job_id: str, future: "asyncio.Future[dict]", fp: Optional[Fingerprint]):
+    """Wait for a queued analysis and record its outcome on the job"""
+    try:
+        # Shielded so a timed-out analysis keeps its pool slot until the worker is really done
+        analysis_result = await asyncio.wait_for(asyncio.shield(future), settings.ANALYSIS_JOB_TIMEOUT_S)
+        error = None
+    except asyncio.TimeoutError:
+        logger.error(f"Analysis job {job_id} timed out")
+        analysis_result = None
+        error = "Analysis timed out"
+    except Exception as e:
+        logger.error(f"Analysis job {job_id} failed: {e}")
+        analysis_result = None
+        error = str(e) or type(e).__name__
+
+    db = SessionLocal()
+    try:
+        job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        if job is None:
+            return
+        if analysis_result is not None:
+            db_analysis = _analysis_row(analysis_result, job.image_filename)
+            db.add(db_analysis)
+            db.flush()
+            job.analysis_id = db_analysis.id
+            job.status = "completed"
+        else:
+            job.status = "failed"
+            job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+
+        if fp is not None and job.analysis_id is not None:
+            screenshot_cache.store(db, fp, job.analysis_id)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to save analysis job {job_id}: {e}")
+    finally:
+        db.close()
+
+
+def fail_interrupted_jobs(db: Session) -> int:
+    """
+    Mark jobs left pending by a dead process as failed; their analyses ran
+    in that process's memory and will never finish. Called at startup.
+
+    Other instances (zero-downtime deploys, several workers) share the
+    table, so only jobs pending well past ANALYSIS_JOB_TIMEOUT_S are
+    touched; a live process finishes or times out its own jobs before then.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=2 * settings.ANALYSIS_JOB_TIMEOUT_S)
+    count = (
+        db.query(AnalysisJob)
+        .filter(AnalysisJob.status == "pending", AnalysisJob.created_at < cutoff)
+        .update({
+            AnalysisJob.status: "failed",
+            AnalysisJob.error: "Interrupted by a server restart",
+            AnalysisJob.finished_at: datetime.now(timezone.utc),
+        }, synchronize_session=False)
+    )
+    db.commit()
+    return count
+
+
+def _job_response(job: AnalysisJob, db: Session) -> JobResponse:
+    result = None
+    if job.analysis_id is not None:
+        analysis = db.query(PokemonAnalysis).filter(PokemonAnalysis.id == job.analysis_id).first()
+        if analysis is not None:
+            result = AnalysisResponse.model_validate(analysis)
+    return JobResponse(
+        id=job.id,
+        status=job.status,
+        analysis_id=job.analysis_id,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        result=result,
+    )
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_analysis_job(
+    file: UploadFile = File(...),
+    trainer_level: Optional[int] = Query(None, ge=1, le=50, description="Trainer level, enables level-arc detection"),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload a screenshot for background analysis
+
+    Returns a job id right away; poll GET /api/analysis/jobs/{id} for the result.
+    """
+    _validate_image(file)
+    data = await _read_upload(file)
+
+    # Repeat uploads complete with the stored analysis
+    cached, fp = await _find_duplicate(db, data)
+    if cached is not None:
+        job = AnalysisJob(id=uuid.uuid4().hex, status="completed", analysis_id=cached.id,
+                          image_filename=cached.image_filename, finished_at=datetime.now(timezone.utc))
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return _job_response(job, db)
+
+    future = _submit_analysis(data, trainer_level)
+    unique_filename = _persist_upload(data, file.filename)
+
+    job = AnalysisJob(id=uuid.uuid4().hex, status="pending", image_filename=unique_filename)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    _spawn(_run_job(job.id, future, fp))
+
+    return _job_response(job, db)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_analysis_job(job_id: str, db: Session = Depends(get_db)):
+    """Get the status of an analysis job, and its result once completed"""
+    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job, db)
+
+
+class RecordingFrameResult(BaseModel):
+    frame: int
+    seconds: float
+    status: str  # completed or failed
+    error: Optional[str] = None
+    analysis: Optional[AnalysisResponse] = None
+
+
+class RecordingSummary(BaseModel):
+    status: str = "done"  # done, or error if decoding stopped early
+    frames: int
+    completed: int
+    failed: int
+    error: Optional[str] = None
+
+
+def _validate_video(file: UploadFile):
+    if not file.content_type or not file.content_type.startswith('video/'):
+        raise HTTPException(status_code=400, detail="File must be a video")
+
+
+async def _save_recording(file: UploadFile) -> str:
+    """
+    Stream an upload to a temporary file in chunks, rejecting it with 413
+    as soon as it passes ANALYSIS_MAX_RECORDING_MB
+    """
+    max_bytes = settings.ANALYSIS_MAX_RECORDING_MB * 1024 * 1024
+    too_large = HTTPException(status_code=413, detail=f"File is larger than {settings.ANALYSIS_MAX_RECORDING_MB} MB")
+    if file.size is not None and file.size > max_bytes:
+        raise too_large
+
+    suffix = os.path.splitext(file.filename or "")[1] or ".mp4"
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise too_large
+                await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _save_frame_analysis(frame: EncodedFrame, outcome) -> RecordingFrameResult:
+    """Store one frame's analysis (own DB session: the stream outlives the request's)"""
+    if isinstance(outcome, BaseException):
+        return RecordingFrameResult(frame=frame.index, seconds=frame.seconds, status="failed",
+                                    error=str(outcome) or type(outcome).__name__)
+
+    db = SessionLocal()
+    try:
+        row = _analysis_row(outcome, _persist_upload(frame.data, f"frame{frame.index}.jpg"))
+        db.add(row)
+        db.commit()
+        db.refresh(row)
+        return RecordingFrameResult(frame=frame.index, seconds=frame.seconds, status="completed",
+                                    analysis=AnalysisResponse.model_validate(row))
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Saving analysis of frame {frame.index} failed: {e}")
+        return RecordingFrameResult(frame=frame.index, seconds=frame.seconds, status="failed", error=str(e))
+    finally:
+        db.close()
+
+
+def _release_recording(path: str, frames):
+    """Close a recording's decoder and delete its temporary file; safe to call twice"""
+    try:
+        frames.close()
+    except ValueError:
+        # Still being advanced in a thread (client went away); it is
+        # released when garbage collected
+        pass
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _stream_recording(path: str, frames, first: Optional[EncodedFrame], trainer_level: Optional[int]):
+    """
+    Analyze a recording's distinct frames and yield NDJSON lines as each
+    analysis finishes
+
+    Holds one decoded frame and at most one encoded frame per worker at a
+    time, so memory does not grow with the length of the video.
+    """
+    pending = {}
+    held = first
+    exhausted = first is None
+    completed = failed = 0
+    error = None
+    try:
+        while True:
+            # Keep every worker busy, but take no more of the queue than that
+            while not exhausted and len(pending) < analysis_engine.max_workers:
+                try:
+                    frame = held or await asyncio.to_thread(next, frames, None)
+                except Exception as e:
+                    # Finish the analyses already queued, then report
+                    logger.error(f"Decoding recording {path} failed: {e}")
+                    error = str(e) or type(e).__name__
+                    frame = None
+                held = None
+                if frame is None:
+                    exhausted = True
+                    break
+                try:
+                    pending[analysis_engine.submit(frame.data, trainer_level)] = frame
+                except AnalysisBusyError:
+                    held = frame
+                    break
+
+            if not pending:
+                if held is None:
+                    break
+                # Saturated by other requests; wait for a slot instead of dropping frames
+                await asyncio.sleep(RECORDING_RETRY_SECONDS)
+                continue
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                frame = pending.pop(future)
+                result = _save_frame_analysis(frame, future.exception() or future.result())
+                completed += result.status == "completed"
+                failed += result.status == "failed"
+                yield result.model_dump_json() + "\n"
+
+        summary = RecordingSummary(frames=completed + failed, completed=completed, failed=failed)
+        if error is not None:
+            summary.status, summary.error = "error", error
+        yield summary.model_dump_json() + "\n"
+    finally:
+        _release_recording(path, frames)
+
+
+@router.post("/recordings")
+async def analyze_recording(
+    file: UploadFile = File(...),
+    trainer_level: Optional[int] = Query(None, ge=1, le=50, description="Trainer level, enables level-arc detection"),
+):
+    """
+    Upload a screen recording of swiping through Pokémon detail screens
+
+    Each distinct detail screen is analyzed and saved; results stream back
+    as newline-delimited JSON in the order they finish, followed by a
+    summary line with status "done".
+    """
+    _validate_video(file)
+    path = await _save_recording(file)
+
+    # Decode up to the first detail screen now, so unreadable videos get a 400
+    frames = iter_encoded_frames(path)
+    try:
+        first = await asyncio.to_thread(next, frames, None)
+    except BaseException as e:
+        os.remove(path)
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=400, detail=str(e))
+        if isinstance(e, Exception):
+            logger.error(f"Decoding recording {file.filename} failed: {e}")
+            raise HTTPException(status_code=400, detail="Could not read the recording")
+        raise
+
+    # The background task also cleans up when the client leaves before the stream starts
+    return StreamingResponse(_stream_recording(path, frames, first, trainer_level),
+                             media_type="application/x-ndjson",
+                             background=BackgroundTask(_release_recording, path, frames))
+
+
+class SessionObservation(BaseModel):
+    type: str = Field(..., description="cp_hp, appraisal or evolution")
+    cp: Optional[int] = None
+    hp: Optional[int] = None
+    power_ups: int = Field(0, ge=0, description="Half-level power-ups since the session started")
+    level: Optional[float] = None
+    stardust: Optional[int] = None
+    pokemon_id: Optional[int] = Field(None, description="Evolved species (evolution only)")
+    stars: Optional[int] = Field(None, ge=0, le=4)
+    attack_iv_range: Optional[Tuple[int, int]] = None
+    defense_iv_range: Optional[Tuple[int, int]] = None
+    stamina_iv_range: Optional[Tuple[int, int]] = None
+
+
+class SessionCreate(BaseModel):
+    pokemon_id: Optional[int] = None
+    analysis_id: Optional[int] = None
+    observations: List[SessionObservation] = []
+
+
+class SessionResponse(BaseModel):
+    id: int
+    analysis_id: Optional[int]
+    pokemon_id: int
+    candidate_count: int
+    observations: List[dict]
+    result: dict
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+
+def _session_response(session: IVSession) -> SessionResponse:
+    return SessionResponse(
+        id=session.id,
+        analysis_id=session.analysis_id,
+        pokemon_id=session.pokemon_id,
+        candidate_count=session.candidate_count,
+        observations=session.observations or [],
+        result=iv_session.summarize(session.candidates),
+        created_at=session.created_at,
+        updated_at=session.updated_at,
+    )
+
+
+def _apply_observations(session: IVSession, observations: List[SessionObservation], loader):
+    """Narrow a session by each observation in turn"""
+    bits = session.candidates
+    pokemon_id = session.pokemon_id
+    applied = list(session.observations or [])
+
+    for observation in observations:
+        obs = observation.model_dump(exclude_none=True)
+        if obs["type"] == "evolution" and not obs.get("pokemon_id"):
+            raise HTTPException(status_code=400, detail="evolution observation needs pokemon_id")
+        pokemon_id = iv_session.evolved_species(obs) or pokemon_id
+
+        pokemon = loader.get_pokemon_by_id(pokemon_id)
+        if not pokemon:
+            raise HTTPException(status_code=404, detail=f"Pokemon #{pokemon_id} not found")
+
+        try:
+            bits, count = iv_session.apply_observation(bits, obs, pokemon)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        obs["candidate_count"] = count
+        applied.append(obs)
+
+    session.candidates = bits
+    session.candidate_count = iv_session.count(bits)
+    session.pokemon_id = pokemon_id
+    session.observations = applied
+
+
+@router.post("/sessions", response_model=SessionResponse)
+async def create_session(body: SessionCreate, db: Session = Depends(get_db)):
+    """
+    Start an IV narrowing session
+
+    Pass a pokemon_id, or an analysis_id to seed the session with that
+    analysis' species and CP/HP.
+    """
+    loader = get_data_loader().pinned()
+    pokemon_id = body.pokemon_id
+    observations = list(body.observations)
+
+    if body.analysis_id is not None:
+        analysis = db.query(PokemonAnalysis).filter(PokemonAnalysis.id == body.analysis_id).first()
+        if not analysis:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        if pokemon_id is None:
+            pokemon = loader.get_pokemon_by_name(analysis.pokemon_name or "")
+            if not pokemon:
+                raise HTTPException(status_code=400, detail="Species of the analysis is unknown, pass pokemon_id")
+            pokemon_id = pokemon["pokedex_number"]
+        if analysis.cp and analysis.hp:
+            observations.insert(0, SessionObservation(type="cp_hp", cp=analysis.cp, hp=analysis.hp))
+
+    if pokemon_id is None:
+        raise HTTPException(status_code=400, detail="pokemon_id or analysis_id is required")
+    if not loader.get_pokemon_by_id(pokemon_id):
+        raise HTTPException(status_code=404, detail=f"Pokemon #{pokemon_id} not found")
+
+    bits = iv_session.all_candidates()
+    session = IVSession(
+        analysis_id=body.analysis_id,
+        pokemon_id=pokemon_id,
+        candidates=bits,
+        candidate_count=iv_session.count(bits),
+        observations=[],
+    )
+    _apply_observations(session, observations, loader)
+
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return _session_response(session)
+
+
+@router.post("/sessions/{session_id}/observations", response_model=SessionResponse)
+async def add_session_observation(
+    session_id: int,
+    observation: SessionObservation,
+    db: Session = Depends(get_db)
+):
+    """Narrow a session's candidates with one more observation"""
+    session = db.query(IVSession).filter(IVSession.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    _apply_observations(session, [observation], get_data_loader().pinned())
+    db.commit()
+    db.refresh(session)
+    return _session_response(session)
+
+
+@router.post("/sessions/{session_id}/appraisal", response_model=SessionResponse)
+async def add_session_appraisal(
+    session_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """Narrow a session with the IV ranges read from an appraisal screenshot's stat bars"""
+    session = db.query(IVSession).filter(IVSession.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    _validate_image(file)
+    data = await _read_upload(file)
+    bars = await asyncio.to_thread(iv_calculator.read_appraisal, data)
+    if bars is None:
+        raise HTTPException(status_code=422, detail="No appraisal bars found in the screenshot")
+
+    _apply_observations(session, [SessionObservation(**bars.to_observation())], get_data_loader().pinned())
+    db.commit()
+    db.refresh(session)
+    return _session_response(session)
+
+
+@router.get("/sessions/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: int, db: Session = Depends(get_db)):
+    """Get an IV narrowing session and its remaining candidates"""
+    session = db.query(IVSession).filter(IVSession.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return _session_response(session)
+
+
 @router.get("/history", response_model=List[AnalysisResponse])
 async def get_analysis_history(
     skip: int = 0,
@@ -1,19 +1,54 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
 from typing import List, Optional
 from app.schemas.pokedex import (
-    PokemonListItem, PokemonDetail, MoveResponse,
+    PokemonListItem, PokemonDetail, MoveResponse, AutocompleteItem,
     EvolutionInfo, RaidPerfectCP, CurrentSeasonInfo
 )
 from app.services.pokedex_data_loader import get_data_loader
+from app.services.pokemon_stat_store import SORT_KEYS
+from app.services.response_cache import CachedResponse, pokedex_list_cache
 from app.utils.cp_calculator import calculate_raid_perfect_cp
 
 router = APIRouter(prefix="/api/pokedex", tags=["Pokédex"])
 
+REGION_RANGES = {
+    "kanto": (1, 151),
+    "johto": (152, 251),
+    "hoenn": (252, 386),
+    "sinnoh": (387, 493),
+    "unova": (494, 649),
+    "kalos": (650, 721),
+    "alola": (722, 809),
+    "galar": (810, 905),
+    "paldea": (906, 1025)
+}
+
+_pokemon_list_adapter = TypeAdapter(List[PokemonListItem])
+
+
+def _cached_json_response(entry: CachedResponse, request: Request) -> Response:
+    """Serve a pre-encoded body, or 304 if the client already has it"""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
 
 @router.get("", response_model=List[PokemonListItem])
 async def list_pokemon(
+    request: Request,
     search: Optional[str] = Query(None, description="Search by Korean or English name"),
     region: Optional[str] = Query(None, description="Filter by region (kanto, johto, hoenn, sinnoh, unova, kalos, alola, galar, paldea)"),
+    type: Optional[str] = Query(None, description="Filter by type, comma-separated types must all match (e.g., Fire,Flying)"),
+    min_attack: Optional[int] = Query(None, ge=0),
+    max_attack: Optional[int] = Query(None, ge=0),
+    min_defense: Optional[int] = Query(None, ge=0),
+    max_defense: Optional[int] = Query(None, ge=0),
+    min_stamina: Optional[int] = Query(None, ge=0),
+    max_stamina: Optional[int] = Query(None, ge=0),
+    sort_by: Optional[str] = Query(None, description="Sort by: number, attack, defense, stamina, stat_product"),
+    order: Optional[str] = Query(None, description="Sort order: asc or desc (default: asc for number, desc for stats)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(2000, ge=1, le=2000)
 ):
@@ -22,32 +57,57 @@ async def list_pokemon(
 
     - **search**: Search query (Korean or English name)
     - **region**: Filter by region
+    - **type**: Filter by type (comma-separated for dual types)
+    - **min_/max_attack, defense, stamina**: Base stat ranges (inclusive)
+    - **sort_by**: Sort key (number, attack, defense, stamina, stat_product)
+    - **order**: asc or desc (default: asc for number, desc for stats)
     - **skip**: Number of records to skip
     - **limit**: Maximum number of records to return
+
+    Responses are cached as encoded JSON per data version and query, and
+    carry an ETag so unchanged lists can be answered with 304 Not Modified.
     """
-    loader = get_data_loader()
+    if sort_by is not None and sort_by not in SORT_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort_by. Must be one of: {', '.join(SORT_KEYS)}"
+        )
+    if order is not None and order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Invalid order. Must be asc or desc")
+
+    loader = get_data_loader().pinned()
+
+    cache_key = (
+        loader.data_version, search, region.lower() if region else None, type.lower() if type else None,
+        min_attack, max_attack, min_defense, max_defense, min_stamina, max_stamina,
+        sort_by, order, skip, limit
+    )
+    cached = pokedex_list_cache.get(cache_key)
+    if cached is not None:
+        return _cached_json_response(cached, request)
 
     if search:
         pokemon_list = loader.search_pokemon(search)
     else:
         pokemon_list = loader.get_all_pokemon()
 
-    # Filter by region
-    if region:
-        region_ranges = {
-            "kanto": (1, 151),
-            "johto": (152, 251),
-            "hoenn": (252, 386),
-            "sinnoh": (387, 493),
-            "unova": (494, 649),
-            "kalos": (650, 721),
-            "alola": (722, 809),
-            "galar": (810, 905),
-            "paldea": (906, 1025)
-        }
-        if region.lower() in region_ranges:
-            start, end = region_ranges[region.lower()]
-            pokemon_list = [p for p in pokemon_list if start <= p["pokedex_number"] <= end]
+    # Filter by region (unknown regions are ignored)
+    number_range = REGION_RANGES.get(region.lower(), (None, None)) if region else (None, None)
+    types = [t.strip() for t in type.split(",") if t.strip()] if type else None
+
+    if (types or sort_by or number_range != (None, None)
+            or any(v is not None for v in (min_attack, max_attack, min_defense,
+                                           max_defense, min_stamina, max_stamina))):
+        pokemon_list = loader.query_pokemon(
+            types=types,
+            attack=(min_attack, max_attack),
+            defense=(min_defense, max_defense),
+            stamina=(min_stamina, max_stamina),
+            number=number_range,
+            sort_by=sort_by,
+            descending=order == "desc" if order else sort_by != "number",
+            within=pokemon_list if search else None
+        )
 
     # Pagination
     pokemon_list = pokemon_list[skip:skip + limit]
@@ -66,7 +126,31 @@ async def list_pokemon(
             can_gigantamax=pokemon.get("can_gigantamax", False)
         ))
 
-    return result
+    entry = pokedex_list_cache.put(cache_key, _pokemon_list_adapter.dump_json(result))
+    return _cached_json_response(entry, request)
+
+
+@router.get("/autocomplete", response_model=List[AutocompleteItem])
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=50, description="Name prefix (English, Korean or initial consonants)"),
+    kind: Optional[str] = Query(None, description="Restrict to pokemon or move"),
+    limit: int = Query(10, ge=1, le=10)
+):
+    """
+    Autocomplete Pokémon and move names
+
+    - **q**: Name prefix, e.g. "char", "리자", "ㄹㅈ"
+    - **kind**: pokemon or move (default: both)
+    - **limit**: Maximum number of suggestions (default: 10)
+
+    Returns small payloads (id, names, sprite or move type) for
+    keystroke-level search boxes.
+    """
+    if kind is not None and kind not in ("pokemon", "move"):
+        raise HTTPException(status_code=400, detail="Invalid kind. Must be pokemon or move")
+
+    loader = get_data_loader().pinned()
+    return loader.autocomplete(q, kind=kind, limit=limit)
 
 
 @router.get("/{pokemon_id}", response_model=PokemonDetail)
@@ -84,7 +168,7 @@ async def get_pokemon_detail(pokemon_id: int):
     - Raid perfect IV CP (level 20 and 25)
     - Current season tier information
     """
-    loader = get_data_loader()
+    loader = get_data_loader().pinned()
 
     pokemon = loader.get_pokemon_by_id(pokemon_id)
     if not pokemon:
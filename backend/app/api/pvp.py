@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from pydantic import BaseModel
 from app.services.pokedex_data_loader import get_data_loader
+from app.services.pvp_rank import LEAGUE_CP_CAPS, DEFAULT_LEVEL_CEILING, league_rank
 
 router = APIRouter(prefix="/api/pvp", tags=["PvP"])
 
@@ -31,6 +32,34 @@ class PvPPartyRankingsResponse(BaseModel):
     rankings: List[PvPPartyRanking]
 
 
+class PvPBestIVs(BaseModel):
+    attack_iv: int
+    defense_iv: int
+    stamina_iv: int
+
+
+class PvPRankResponse(BaseModel):
+    pokemon_id: int
+    pokemon_name_ko: str
+    pokemon_name_en: str
+    league: str
+    cp_cap: Optional[int]
+    level_cap: float
+    attack_iv: int
+    defense_iv: int
+    stamina_iv: int
+    rank: int
+    eligible: bool
+    level: float
+    cp: int
+    attack: float
+    defense: float
+    hp: int
+    stat_product: int
+    percent_of_best: float
+    best_ivs: PvPBestIVs
+
+
 @router.get("/party-rankings", response_model=PvPPartyRankingsResponse)
 async def get_pvp_party_rankings(
     league: str = Query("Great", description="League: Great, Ultra, or Master"),
@@ -48,7 +77,7 @@ async def get_pvp_party_rankings(
     - Estimated rating
     - Strategy notes in Korean
     """
-    loader = get_data_loader()
+    loader = get_data_loader().pinned()
 
     # Validate league
     valid_leagues = ["Great", "Ultra", "Master"]
@@ -112,3 +141,52 @@ async def get_pvp_party_rankings(
         season_id=ranking_data.get("season_id", "unknown"),
         rankings=rankings
     )
+
+
+@router.get("/rank", response_model=PvPRankResponse)
+async def get_pvp_iv_rank(
+    pokemon_id: int = Query(..., description="Pokédex number"),
+    atk: int = Query(..., ge=0, le=15, description="Attack IV"),
+    def_: int = Query(..., alias="def", ge=0, le=15, description="Defense IV"),
+    sta: int = Query(..., ge=0, le=15, description="Stamina IV"),
+    league: str = Query("Great", description="League: Great, Ultra, or Master"),
+    level_cap: float = Query(DEFAULT_LEVEL_CEILING, ge=1, le=DEFAULT_LEVEL_CEILING, description="Highest level allowed (e.g. 40 without XL candy)")
+):
+    """
+    Get the league rank of an IV combination
+
+    - **pokemon_id**: Pokédex number
+    - **atk / def / sta**: IVs (0-15)
+    - **league**: Great (1500), Ultra (2500) or Master (uncapped)
+    - **level_cap**: Highest level allowed (default: 50)
+
+    All 4096 IV combinations are ranked by stat product at their best level
+    under the CP cap. Ranks come from the precomputed memory-mapped tables
+    when available, otherwise from tables memoized per species and league,
+    so lookups are O(1) after the first computation.
+    """
+    if league not in LEAGUE_CP_CAPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid league. Must be one of: {', '.join(LEAGUE_CP_CAPS)}"
+        )
+    if level_cap * 2 != int(level_cap * 2):
+        raise HTTPException(status_code=400, detail="level_cap must be a whole or half level")
+
+    loader = get_data_loader().pinned()
+    pokemon = loader.get_pokemon_by_id(pokemon_id)
+    if not pokemon:
+        raise HTTPException(status_code=404, detail=f"Pokémon {pokemon_id} not found")
+
+    return PvPRankResponse(
+        pokemon_id=pokemon_id,
+        pokemon_name_ko=pokemon["name_ko"],
+        pokemon_name_en=pokemon["name_en"],
+        league=league,
+        cp_cap=LEAGUE_CP_CAPS[league],
+        level_cap=level_cap,
+        attack_iv=atk,
+        defense_iv=def_,
+        stamina_iv=sta,
+        **league_rank(pokemon, league, atk, def_, sta, level_cap)
+    )
@@ -21,7 +21,7 @@ async def get_raid_counters(boss_id: int):
     - Recommended teams with Pokémon and move combinations
     - All names and moves in Korean
     """
-    loader = get_data_loader()
+    loader = get_data_loader().pinned()
 
     # Get boss Pokémon
     boss = loader.get_pokemon_by_id(boss_id)
@@ -89,7 +89,7 @@ async def get_top_raid_attackers(
 
     Returns S~A tier raid attackers with recommended move sets
     """
-    loader = get_data_loader()
+    loader = get_data_loader().pinned()
 
     attackers_data = loader.get_top_attackers(type_filter=type, min_tier=min_tier)
 
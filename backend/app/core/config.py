@@ -38,6 +38,17 @@ class Settings(BaseSettings):
 
     # OCR
     TESSERACT_CMD: Optional[str] = None
+    OCR_BACKEND: str = "pytesseract"  # "tesserocr" keeps engines loaded in each worker
+    OCR_LANGS: str = "kor+eng"  # Name OCR languages; missing ones are skipped
+    DIGIT_TEMPLATE_DIR: Optional[str] = None  # CP/HP glyph images; Hershey fonts if unset
+
+    # Screenshot analysis process pool
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_MAX_QUEUE: int = 8  # Waiting analyses before uploads get 429
+    ANALYSIS_MAX_UPLOAD_MB: int = 10  # Larger screenshots are rejected with 413
+    ANALYSIS_SAVE_UPLOADS: bool = True  # Keep originals under uploads/
+    ANALYSIS_MAX_RECORDING_MB: int = 500  # Larger screen recordings are rejected with 413
+    ANALYSIS_JOB_TIMEOUT_S: int = 300  # Background jobs still waiting after this are failed
 
     # YouTube RSS Feeds (comma-separated URLs)
     YOUTUBE_RSS_FEEDS: str = ""
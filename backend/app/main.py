@@ -51,10 +51,32 @@ async def lifespan(app: FastAPI):
                     conn.commit()
                     logger.info("✅ event_end_date column added")
 
+            if 'pokemon_analyses' in inspector.get_table_names():
+                columns = [col['name'] for col in inspector.get_columns('pokemon_analyses')]
+
+                if 'iv_details' not in columns:
+                    logger.info("Adding iv_details column...")
+                    conn.execute(text("ALTER TABLE pokemon_analyses ADD COLUMN iv_details JSON"))
+                    conn.commit()
+                    logger.info("✅ iv_details column added")
+
         logger.info("✅ Database migrations completed")
     except Exception as e:
         logger.warning(f"⚠️ Migration warning (may be safe to ignore): {str(e)}")
 
+    # Analysis jobs only run in this process's memory
+    try:
+        from app.core.database import SessionLocal
+        db = SessionLocal()
+        try:
+            interrupted = analysis.fail_interrupted_jobs(db)
+        finally:
+            db.close()
+        if interrupted:
+            logger.info(f"⚠️ Marked {interrupted} interrupted analysis jobs as failed")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not clean up analysis jobs: {str(e)}")
+
     logger.info("📅 Initializing scheduler...")
     from app.scheduler import start_scheduler
     start_scheduler()
@@ -70,6 +92,10 @@ async def lifespan(app: FastAPI):
     stop_scheduler()
     logger.info("✅ Scheduler stopped")
 
+    from app.services.analysis_engine import analysis_engine
+    analysis_engine.shutdown()
+    logger.info("✅ Analysis workers stopped")
+
 
 app = FastAPI(
     title="Pokemon GO Tracker API",
@@ -2,5 +2,8 @@ from .event import Event
 from .pokemon_analysis import PokemonAnalysis
 from .youtube_video import YouTubeVideo
 from .email_subscription import EmailSubscription
+from .iv_session import IVSession
+from .analysis_job import AnalysisJob
+from .screenshot_fingerprint import ScreenshotFingerprint
 
-__all__ = ["Event", "PokemonAnalysis", "YouTubeVideo", "EmailSubscription"]
+__all__ = ["Event", "PokemonAnalysis", "YouTubeVideo", "EmailSubscription", "IVSession", "AnalysisJob", "ScreenshotFingerprint"]
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AnalysisJob(Base):
+    """Background screenshot analysis, polled by the client"""
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending, completed, failed
+    analysis_id = Column(Integer, ForeignKey("pokemon_analyses.id"), nullable=True)
+    image_filename = Column(String(500))
+    error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<AnalysisJob {self.id} {self.status}>"
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, DateTime, JSON, LargeBinary, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class IVSession(Base):
+    """Multi-observation IV narrowing session for one Pokémon"""
+    __tablename__ = "iv_sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    analysis_id = Column(Integer, ForeignKey("pokemon_analyses.id"), nullable=True, index=True)
+    pokemon_id = Column(Integer, nullable=False)  # Current species (changes on evolution)
+
+    # Packed bitset over (level at session start, atk IV, def IV, sta IV)
+    candidates = Column(LargeBinary, nullable=False)
+    candidate_count = Column(Integer, nullable=False)
+    observations = Column(JSON)  # Applied observations, in order
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<IVSession {self.id} #{self.pokemon_id} candidates:{self.candidate_count}>"
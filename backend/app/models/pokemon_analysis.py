@@ -23,6 +23,9 @@ class PokemonAnalysis(Base):
     # Recommendations
     recommendations = Column(JSON)  # Store as JSON
 
+    # IV solver output: candidate count, min/avg/max IV%, possible levels
+    iv_details = Column(JSON)
+
     # Image metadata
     image_filename = Column(String(500))
     analyzed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ScreenshotFingerprint(Base):
+    """Content and perceptual hashes of an analyzed screenshot"""
+    __tablename__ = "screenshot_fingerprints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    analysis_id = Column(Integer, ForeignKey("pokemon_analyses.id"), nullable=False, index=True)
+    sha256 = Column(String(64), nullable=False, unique=True, index=True)
+
+    # 64-bit dHashes (stored signed) of the whole frame and the text regions
+    frame_hash = Column(BigInteger, nullable=False)
+    text_hash = Column(BigInteger, nullable=False)
+
+    # 16-bit bands of frame_hash for indexed Hamming-distance search
+    band0 = Column(Integer, nullable=False, index=True)
+    band1 = Column(Integer, nullable=False, index=True)
+    band2 = Column(Integer, nullable=False, index=True)
+    band3 = Column(Integer, nullable=False, index=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<ScreenshotFingerprint {self.sha256[:12]} analysis:{self.analysis_id}>"
@@ -32,6 +32,16 @@ class PokemonListItem(BaseModel):
         from_attributes = True
 
 
+class AutocompleteItem(BaseModel):
+    kind: str  # "pokemon" or "move"
+    pokemon_id: Optional[int] = None
+    move_id: Optional[str] = None
+    name_en: str
+    name_ko: str
+    sprite_url: Optional[str] = None
+    type: Optional[str] = None  # Move type
+
+
 class EvolutionInfo(BaseModel):
     id: int
     pokedex_number: int
@@ -0,0 +1,142 @@
+"""
+Screenshot Analysis Engine
+Runs OCR + IV solving in a bounded process pool so uploads never block the
+event loop, and rejects work once too many analyses are in flight
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisBusyError(Exception):
+    """Raised when every worker is busy and the queue is full"""
+
+
+def _init_worker():
+    """Load the Pokédex, digit templates and OCR engines once per worker instead of on the first analysis"""
+    from app.services.digit_recognizer import get_digit_recognizer
+    from app.services.iv_calculator import warm_up_ocr
+    from app.services.pokedex_data_loader import get_data_loader
+    get_data_loader()
+    get_digit_recognizer()
+    warm_up_ocr()
+
+
+def _analyze_image_bytes(data: bytes, trainer_level: Optional[int] = None) -> Dict:
+    from app.services.iv_calculator import iv_calculator
+    return iv_calculator.analyze_image_bytes(data, trainer_level)
+
+
+def _numbers_match(data: bytes, cp: int, hp: int) -> bool:
+    from app.services.iv_calculator import iv_calculator
+    return iv_calculator.numbers_match(data, cp, hp)
+
+
+class AnalysisEngine:
+    """
+    Bounded ProcessPoolExecutor for screenshot analysis
+
+    At most max_workers analyses run at once and max_queue more may wait;
+    beyond that submit() raises AnalysisBusyError so callers can shed
+    load (429) instead of queueing unboundedly.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 8):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+            return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise AnalysisBusyError(f"Analysis queue is full ({self.capacity} in flight)")
+            self._in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def submit(self, data: bytes, trainer_level: Optional[int] = None) -> "asyncio.Future[Dict]":
+        """
+        Queue an encoded screenshot for analysis in a worker process
+
+        The slot is taken immediately, so callers learn about saturation
+        before doing any other work; it is released when the future is done.
+
+        Raises:
+            AnalysisBusyError: if the pool and its queue are saturated
+        """
+        return self._submit(_analyze_image_bytes, data, trainer_level)
+
+    def submit_numbers_check(self, data: bytes, cp: int, hp: int) -> "asyncio.Future[bool]":
+        """
+        Queue a check that a screenshot shows exactly this CP and HP (reads
+        only those two crops)
+
+        Raises:
+            AnalysisBusyError: if the pool and its queue are saturated
+        """
+        return self._submit(_numbers_match, data, cp, hp)
+
+    def _submit(self, fn, *args) -> "asyncio.Future":
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            future = loop.run_in_executor(executor, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(functools.partial(self._on_done, executor))
+        return future
+
+    def _on_done(self, executor: ProcessPoolExecutor, future: "asyncio.Future"):
+        self._release()
+        if future.cancelled() or not isinstance(future.exception(), BrokenProcessPool):
+            return
+        # A worker died (e.g. OOM in OpenCV); start a fresh pool next time.
+        # Every future of the broken pool lands here, so only drop the pool
+        # if a newer one hasn't already replaced it
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        logger.error("Analysis worker pool broke, restarting it")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+analysis_engine = AnalysisEngine(
+    max_workers=settings.ANALYSIS_WORKERS,
+    max_queue=settings.ANALYSIS_MAX_QUEUE,
+)
@@ -0,0 +1,121 @@
+"""
+Appraisal Bar Reader
+Measures the attack, defense and HP bars of the in-game appraisal screen
+and turns their fill lengths into IV ranges, with no OCR
+
+Each bar is 15 IV points drawn as three segments separated by white gaps.
+Filled columns are orange (red at 15) and empty ones light gray, so the IV
+is 15 x filled / (filled + empty) over the bar's middle rows; the gaps
+count as neither.
+"""
+
+import math
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# Bars sit in the lower-left part of the appraisal card
+BAR_SEARCH_ROWS = (0.55, 0.95)
+BAR_SEARCH_COLUMNS = (0.0, 0.65)
+BAR_MIN_WIDTH = 0.15  # Share of the search width a row must cover to be a bar
+BAR_HEIGHT = (0.004, 0.03)  # Allowed bar thickness, as a share of the height
+BAR_ALIGNMENT = 0.03  # Bars must start and end within this share of the width
+
+# HSV ranges (OpenCV hue is 0-180): orange/red fill, light gray track
+FILL_MIN_SATURATION = 90
+FILL_MIN_VALUE = 150
+FILL_MAX_HUE = 25  # Orange
+FILL_MIN_RED_HUE = 165  # Red wraps around 180
+TRACK_MAX_SATURATION = 30
+TRACK_VALUE = (190, 242)  # Darker than the white card and the segment gaps
+
+IV_TOLERANCE = 0.3  # IV points of measurement error allowed either way
+
+IVRange = Tuple[int, int]
+
+
+class AppraisalBars(NamedTuple):
+    attack: IVRange
+    defense: IVRange
+    stamina: IVRange
+    fills: Tuple[float, float, float]  # Measured fill in IV points (0-15)
+
+    def iv_ranges(self) -> Dict[str, IVRange]:
+        """Ranges in solve_ivs' iv_ranges format"""
+        return {"attack": self.attack, "defense": self.defense, "stamina": self.stamina}
+
+    def to_observation(self) -> Dict:
+        """An "appraisal" observation for an IV session"""
+        return {
+            "type": "appraisal",
+            "attack_iv_range": list(self.attack),
+            "defense_iv_range": list(self.defense),
+            "stamina_iv_range": list(self.stamina),
+        }
+
+
+def fill_to_range(points: float) -> IVRange:
+    """IVs within IV_TOLERANCE of a measured fill, or the two it falls between"""
+    low = max(0, math.ceil(points - IV_TOLERANCE))
+    high = min(15, math.floor(points + IV_TOLERANCE))
+    if low > high:
+        low, high = max(0, math.floor(points)), min(15, math.ceil(points))
+    return low, high
+
+
+def _bar_masks(hsv: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    hue, saturation, value = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    fill = ((saturation >= FILL_MIN_SATURATION) & (value >= FILL_MIN_VALUE)
+            & ((hue <= FILL_MAX_HUE) | (hue >= FILL_MIN_RED_HUE)))
+    track = ((saturation <= TRACK_MAX_SATURATION)
+             & (value >= TRACK_VALUE[0]) & (value <= TRACK_VALUE[1]))
+    return fill, track
+
+
+def read_appraisal_bars(image: np.ndarray) -> Optional[AppraisalBars]:
+    """IV ranges from the three appraisal bars of a BGR screenshot, or None if there aren't three"""
+    height, width = image.shape[:2]
+    y0, y1 = int(BAR_SEARCH_ROWS[0] * height), int(BAR_SEARCH_ROWS[1] * height)
+    x0, x1 = int(BAR_SEARCH_COLUMNS[0] * width), int(BAR_SEARCH_COLUMNS[1] * width)
+    band = image[y0:y1, x0:x1]
+    if band.size == 0:
+        return None
+
+    fill, track = _bar_masks(cv2.cvtColor(band, cv2.COLOR_BGR2HSV))
+    bar_pixels = fill | track
+
+    # Rows where bar colours span a good part of the width, grouped into runs
+    rows = np.flatnonzero(bar_pixels.sum(axis=1) >= BAR_MIN_WIDTH * band.shape[1])
+    if not rows.size:
+        return None
+    runs = np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1)
+    min_height, max_height = BAR_HEIGHT[0] * height, BAR_HEIGHT[1] * height
+    runs = [run for run in runs if min_height <= run.size <= max_height]
+    if len(runs) != 3:
+        return None
+
+    fills = []
+    extents = []
+    for run in runs:
+        # Middle third of the bar, away from its rounded caps and edges
+        middle = run[run.size // 3:run.size - run.size // 3] if run.size >= 3 else run
+        votes = len(middle) / 2
+        filled = fill[middle].sum(axis=0) > votes
+        empty = track[middle].sum(axis=0) > votes
+        columns = np.flatnonzero(filled | empty)
+        if not columns.size:
+            return None
+        extents.append((columns[0], columns[-1]))
+        total = filled.sum() + empty.sum()
+        fills.append(15 * filled.sum() / total)
+
+    # The three bars are drawn with the same start and length
+    lefts, rights = zip(*extents)
+    tolerance = BAR_ALIGNMENT * width
+    if max(lefts) - min(lefts) > tolerance or max(rights) - min(rights) > tolerance:
+        return None
+
+    ranges = [fill_to_range(points) for points in fills]
+    return AppraisalBars(*ranges, fills=tuple(round(float(points), 2) for points in fills))
@@ -0,0 +1,211 @@
+"""
+Digit Recognizer
+Reads the CP and HP crops of a detail screen with connected components and
+a nearest-neighbour match against glyph templates, in-process and without
+Tesseract
+
+The game renders numbers in one fixed font, so a few hundred templates are
+enough. They are synthesized from OpenCV's Hershey fonts at startup, and
+replaced by real glyphs cut from screenshots when DIGIT_TEMPLATE_DIR points
+at a directory of them (files named "<label>_<anything>.png", with "slash"
+for "/").
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Characters that appear in the CP ("CP1234") and HP ("127/127HP") crops
+GLYPH_LABELS = "0123456789CPH/"
+FILE_LABELS = {"slash": "/"}
+
+# Glyphs are scaled to this height and centred in a square cell, so thin
+# glyphs ("1", "/") keep their aspect ratio
+GLYPH_SIZE = 24
+GLYPH_BLUR = 1.5  # Gaussian sigma in cell pixels; tolerates stroke and font differences
+
+# Enclosed regions per glyph; characters not listed have none
+GLYPH_HOLES = {"0": 1, "4": 1, "6": 1, "8": 2, "9": 1, "P": 1}
+
+HERSHEY_FONTS = (
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+)
+HERSHEY_THICKNESS = (3, 5, 7, 9)
+
+MIN_GLYPH_HEIGHT = 0.4  # Of the tallest component; smaller blobs are noise
+MAX_GLYPH_HEIGHT = 0.95  # Of the crop; taller blobs are borders
+MAX_GLYPH_ASPECT = 2.0  # Width over height; wider blobs are bar edges or underlines
+SPACE_GAP = 0.5  # Gaps wider than this share of the glyph height are spaces
+MIN_MATCH_SCORE = 0.5  # Correlation below this reads as an unknown glyph
+MIN_HOLE_AREA = 0.02  # Of the glyph's box; smaller gaps are JPEG or threshold noise
+
+
+def normalize_glyph(ink: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Unit vector of a glyph (ink = nonzero) scaled into a GLYPH_SIZE cell,
+    zero-mean so the dot product of two glyphs is their correlation
+    """
+    ys, xs = np.nonzero(ink)
+    if not ys.size:
+        return None
+    glyph = ink[ys.min():ys.max() + 1, xs.min():xs.max() + 1].astype(np.float32)
+
+    height, width = glyph.shape
+    scale = GLYPH_SIZE / max(height, width)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    glyph = cv2.resize(glyph, size, interpolation=cv2.INTER_AREA)
+
+    cell = np.zeros((GLYPH_SIZE, GLYPH_SIZE), dtype=np.float32)
+    y0, x0 = (GLYPH_SIZE - size[1]) // 2, (GLYPH_SIZE - size[0]) // 2
+    cell[y0:y0 + size[1], x0:x0 + size[0]] = glyph
+    cell = cv2.GaussianBlur(cell, (0, 0), GLYPH_BLUR)
+
+    vector = cell.ravel()
+    vector -= vector.mean()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+def count_holes(ink: np.ndarray) -> int:
+    """
+    Enclosed background regions of a glyph ("8" has two, "3" none), which
+    separates shapes that correlate closely once scaled down
+    """
+    ys, xs = np.nonzero(ink)
+    if not ys.size:
+        return 0
+    glyph = ink[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+    background = np.pad(glyph == 0, 1, constant_values=True).astype(np.uint8)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(background, connectivity=4)
+    min_area = MIN_HOLE_AREA * glyph.size
+    # Component 1 is the padded outside
+    return int(np.sum(stats[2:count, cv2.CC_STAT_AREA] >= min_area))
+
+
+def _render_hershey(label: str, font: int, thickness: int) -> np.ndarray:
+    canvas = np.zeros((160, 120), dtype=np.uint8)
+    cv2.putText(canvas, label, (10, 130), font, 4, 255, thickness, cv2.LINE_AA)
+    return canvas > 127
+
+
+class DigitRecognizer:
+    """Nearest-neighbour glyph classifier over a fixed template set"""
+
+    def __init__(self, templates: List[Tuple[str, int, np.ndarray]]):
+        if not templates:
+            raise ValueError("DigitRecognizer needs at least one template")
+        self.labels = [label for label, _, _ in templates]
+        self.holes = np.array([holes for _, holes, _ in templates])
+        self.vectors = np.stack([vector for _, _, vector in templates])
+
+    @classmethod
+    def from_hershey(cls) -> "DigitRecognizer":
+        templates = []
+        # Hole counts come from the table: thick Hershey strokes can close
+        # small gaps that the game font doesn't have
+        for label in GLYPH_LABELS:
+            for font in HERSHEY_FONTS:
+                for thickness in HERSHEY_THICKNESS:
+                    vector = normalize_glyph(_render_hershey(label, font, thickness))
+                    if vector is not None:
+                        templates.append((label, GLYPH_HOLES.get(label, 0), vector))
+        return cls(templates)
+
+    @classmethod
+    def from_directory(cls, path: str) -> "DigitRecognizer":
+        """Load glyph images (dark on light, one glyph each) named <label>_*.png"""
+        templates = []
+        for file in sorted(Path(path).glob("*.png")):
+            prefix = file.stem.split("_", 1)[0]
+            label = FILE_LABELS.get(prefix, prefix)
+            image = cv2.imread(str(file), cv2.IMREAD_GRAYSCALE)
+            if image is None or label not in GLYPH_LABELS:
+                logger.warning(f"Skipping digit template {file.name}")
+                continue
+            _, ink = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+            vector = normalize_glyph(ink)
+            if vector is not None:
+                templates.append((label, count_holes(ink), vector))
+        return cls(templates)
+
+    def classify(self, ink: np.ndarray) -> Tuple[str, float]:
+        """
+        (label, correlation) of the best template with the same number of
+        holes (any template if none has it); "?" below MIN_MATCH_SCORE
+        """
+        vector = normalize_glyph(ink)
+        if vector is None:
+            return "?", 0.0
+        scores = self.vectors @ vector
+        same_holes = self.holes == count_holes(ink)
+        if same_holes.any():
+            scores = np.where(same_holes, scores, -1.0)
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        return (self.labels[best] if score >= MIN_MATCH_SCORE else "?"), score
+
+    def read(self, crop: np.ndarray) -> str:
+        """
+        Text of a binarized crop (dark text on white, as from binarize_crop)
+
+        Unknown glyphs read as "?" and wide gaps as spaces, so the CP/HP
+        parsers see number boundaries.
+        """
+        ink = (crop < 128).astype(np.uint8)
+        count, labels, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+        if count <= 1:
+            return ""
+
+        crop_height = crop.shape[0]
+        boxes = [tuple(stats[i, :4]) + (i,) for i in range(1, count)
+                 if stats[i, cv2.CC_STAT_HEIGHT] <= MAX_GLYPH_HEIGHT * crop_height
+                 and stats[i, cv2.CC_STAT_WIDTH] <= MAX_GLYPH_ASPECT * stats[i, cv2.CC_STAT_HEIGHT]]
+        if not boxes:
+            return ""
+        tallest = max(box[3] for box in boxes)
+        boxes = sorted(box for box in boxes if box[3] >= MIN_GLYPH_HEIGHT * tallest)
+
+        # Merge components that overlap horizontally (broken strokes)
+        glyphs: List[List] = []
+        for x, y, w, h, index in boxes:
+            if glyphs and x < glyphs[-1][1]:
+                glyph = glyphs[-1]
+                glyph[1] = max(glyph[1], x + w)
+                glyph[2] = min(glyph[2], y)
+                glyph[3] = max(glyph[3], y + h)
+                glyph[4].append(index)
+            else:
+                glyphs.append([x, x + w, y, y + h, [index]])
+
+        text = []
+        previous_end = None
+        for x0, x1, y0, y1, indices in glyphs:
+            if previous_end is not None and x0 - previous_end > SPACE_GAP * tallest:
+                text.append(" ")
+            glyph = np.isin(labels[y0:y1, x0:x1], indices)
+            text.append(self.classify(glyph)[0])
+            previous_end = x1
+        return "".join(text)
+
+
+@lru_cache(maxsize=1)
+def get_digit_recognizer() -> DigitRecognizer:
+    """Process-wide recognizer, built on first use"""
+    if settings.DIGIT_TEMPLATE_DIR:
+        try:
+            return DigitRecognizer.from_directory(settings.DIGIT_TEMPLATE_DIR)
+        except ValueError:
+            logger.warning(f"No digit templates in {settings.DIGIT_TEMPLATE_DIR}, using Hershey fonts")
+    return DigitRecognizer.from_hershey()
@@ -5,71 +5,216 @@ import pytesseract
 from typing import Optional, Dict, Optional, Tuple
 import re
 import logging
+import threading
+from functools import lru_cache
 from app.core.config import settings
+from app.services.appraisal_reader import AppraisalBars, read_appraisal_bars
+from app.services.digit_recognizer import get_digit_recognizer
+from app.services.level_arc import read_level_arc
+from app.services.iv_solver import solve_ivs
+from app.services.pokedex_data_loader import get_data_loader
+from app.services.screen_layout import ScreenLayout, binarize_crop, locate_regions
+from app.services.species_inference import infer_species
+
+try:
+    import tesserocr
+except ImportError:  # Optional: only needed for OCR_BACKEND=tesserocr
+    tesserocr = None
 
 logger = logging.getLogger(__name__)
 
-# Pokemon level multipliers (CP multipliers for each level)
-LEVEL_CP_MULTIPLIERS = {
-    1: 0.094, 10: 0.4225, 20: 0.5974, 30: 0.7317, 40: 0.7903, 50: 0.8400
-}
+# Tesseract reads only the name crop (one text line); CP/HP use the digit recognizer
+NAME_OCR_PSM = 7
+FULL_FRAME_OCR_LANG = "eng"
 
-# Base stats for common Pokemon (simplified)
-# Korean names with base stats
-POKEMON_BASE_STATS = {
-    '피카츄': {'attack': 112, 'defense': 96, 'stamina': 111, 'english': 'pikachu'},
-    '리자몽': {'attack': 223, 'defense': 173, 'stamina': 186, 'english': 'charizard'},
-    '뮤츠': {'attack': 300, 'defense': 182, 'stamina': 214, 'english': 'mewtwo'},
-    '망나뇽': {'attack': 263, 'defense': 198, 'stamina': 209, 'english': 'dragonite'},
-    '마기라스': {'attack': 251, 'defense': 207, 'stamina': 225, 'english': 'tyranitar'},
-    '괴력몬': {'attack': 234, 'defense': 159, 'stamina': 207, 'english': 'machamp'},
-    '팬텀': {'attack': 261, 'defense': 149, 'stamina': 155, 'english': 'gengar'},
-    '갸라도스': {'attack': 237, 'defense': 186, 'stamina': 216, 'english': 'gyarados'},
-    # English fallback support
-    'pikachu': {'attack': 112, 'defense': 96, 'stamina': 111, 'korean': '피카츄'},
-    'charizard': {'attack': 223, 'defense': 173, 'stamina': 186, 'korean': '리자몽'},
-    'mewtwo': {'attack': 300, 'defense': 182, 'stamina': 214, 'korean': '뮤츠'},
-    'dragonite': {'attack': 263, 'defense': 198, 'stamina': 209, 'korean': '망나뇽'},
-    'tyranitar': {'attack': 251, 'defense': 207, 'stamina': 225, 'korean': '마기라스'},
-    'machamp': {'attack': 234, 'defense': 159, 'stamina': 207, 'korean': '괴력몬'},
-    'gengar': {'attack': 261, 'defense': 149, 'stamina': 155, 'korean': '팬텀'},
-    'gyarados': {'attack': 237, 'defense': 186, 'stamina': 216, 'korean': '갸라도스'},
-}
 
+class PytesseractBackend:
+    """Runs the tesseract binary per call (reloads language data every time)"""
+
+    name = "pytesseract"
 
-class IVCalculator:
     def __init__(self):
         if settings.TESSERACT_CMD:
             pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
 
-    def analyze_screenshot(self, image_path: str) -> Dict:
+    def languages(self) -> set:
+        return set(pytesseract.get_languages(config=''))
+
+    def image_to_string(self, image: np.ndarray, lang: Optional[str] = None, psm: Optional[int] = None) -> str:
+        config = f"--psm {psm}" if psm is not None else ""
+        return pytesseract.image_to_string(image, lang=lang or FULL_FRAME_OCR_LANG, config=config)
+
+
+class TesserocrBackend:
+    """
+    Keeps libtesseract engines loaded in-process, one per (lang, psm) and
+    created on first use, so each call only sets the image and recognizes
+    """
+
+    name = "tesserocr"
+
+    def __init__(self):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        self._apis = {}
+        self._lock = threading.Lock()
+
+    def languages(self) -> set:
+        return set(tesserocr.get_languages()[1])
+
+    def _api(self, lang: str, psm: Optional[int]):
+        key = (lang, psm)
+        with self._lock:
+            if key not in self._apis:
+                api = tesserocr.PyTessBaseAPI(lang=lang)
+                if psm is not None:
+                    api.SetPageSegMode(psm)
+                self._apis[key] = (api, threading.Lock())
+            return self._apis[key]
+
+    def image_to_string(self, image: np.ndarray, lang: Optional[str] = None, psm: Optional[int] = None) -> str:
+        api, lock = self._api(lang or FULL_FRAME_OCR_LANG, psm)
+        with lock:
+            api.SetImage(Image.fromarray(image))
+            return api.GetUTF8Text()
+
+    def warm_up(self, lang: Optional[str]):
+        """Load the engines analyses use, so the first upload doesn't pay for it"""
+        self._api(lang or FULL_FRAME_OCR_LANG, NAME_OCR_PSM)
+        self._api(FULL_FRAME_OCR_LANG, None)
+
+
+OCR_BACKENDS = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend,
+}
+
+
+@lru_cache(maxsize=1)
+def get_ocr_backend():
+    """Process-wide OCR backend selected by settings.OCR_BACKEND"""
+    backend_class = OCR_BACKENDS.get(settings.OCR_BACKEND)
+    if backend_class is None:
+        logger.warning(f"Unknown OCR_BACKEND {settings.OCR_BACKEND!r}, using pytesseract")
+        backend_class = PytesseractBackend
+    try:
+        return backend_class()
+    except RuntimeError as e:
+        logger.warning(f"OCR backend {settings.OCR_BACKEND} unavailable ({e}), using pytesseract")
+        return PytesseractBackend()
+
+
+@lru_cache(maxsize=1)
+def _name_ocr_lang() -> Optional[str]:
+    """Installed subset of settings.OCR_LANGS in Tesseract's lang format (e.g. kor+eng)"""
+    try:
+        installed = get_ocr_backend().languages()
+    except Exception:
+        return None
+    return "+".join(lang for lang in settings.OCR_LANGS.split("+") if lang in installed) or None
+
+
+def warm_up_ocr():
+    """Create the OCR backend (and its persistent engines) for this process"""
+    backend = get_ocr_backend()
+    if isinstance(backend, TesserocrBackend):
+        backend.warm_up(_name_ocr_lang())
+
+
+class IVCalculator:
+    def analyze_screenshot(self, image_path: str, trainer_level: Optional[int] = None) -> Dict:
         """
         Analyze Pokemon GO screenshot to extract IV information
         This is a simplified implementation using OCR
+
+        With the trainer's level, the level arc narrows the Pokémon's level.
+        """
+        return self._analyze_image(cv2.imread(image_path), trainer_level)
+
+    def analyze_image_bytes(self, data, trainer_level: Optional[int] = None) -> Dict:
+        """
+        Analyze an encoded screenshot (PNG/JPEG bytes, bytearray or memoryview)
+
+        Decodes straight from the buffer, without a temporary file.
         """
+        return self._analyze_image(self._decode(data), trainer_level)
+
+    def numbers_match(self, data, cp: int, hp: int) -> bool:
+        """True if the screenshot's CP/HP crops read as exactly these values"""
+        image = self._decode(data)
+        if image is None:
+            return False
         try:
-            # Load image
-            image = cv2.imread(image_path)
-            if image is None:
-                return self._get_mock_analysis()
+            return self._read_numbers(image, locate_regions(image)) == (cp, hp)
+        except Exception as e:
+            logger.error(f"Failed to read CP/HP: {str(e)}")
+            return False
 
-            # Preprocess image for better OCR
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    def read_appraisal(self, data) -> Optional[AppraisalBars]:
+        """IV ranges from the stat bars of an appraisal screenshot, or None"""
+        image = self._decode(data)
+        return read_appraisal_bars(image) if image is not None else None
 
-            # Extract text using OCR
-            text = pytesseract.image_to_string(gray)
-            logger.info(f"Extracted text: {text}")
+    def _decode(self, data) -> Optional[np.ndarray]:
+        try:
+            return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        except cv2.error as e:
+            logger.error(f"Failed to decode screenshot: {str(e)}")
+            return None
 
-            # Parse the extracted text
-            pokemon_name = self._extract_pokemon_name(text)
-            cp = self._extract_cp(text)
-            hp = self._extract_hp(text)
+    def _analyze_image(self, image: Optional[np.ndarray], trainer_level: Optional[int] = None) -> Dict:
+        """Run OCR and IV solving on a decoded BGR image"""
+        try:
+            if image is None:
+                return self._get_mock_analysis()
 
-            # Calculate IVs (simplified)
+            # OCR only the CP/name/HP crops; read the full frame for
+            # whatever the crops missed
+            pokemon_name, cp, hp, text = self._read_regions(image)
+            if not (cp and hp):
+                full_name, full_cp, full_hp, full_text = self._read_full_frame(image)
+                pokemon_name = pokemon_name or full_name
+                cp = cp or full_cp
+                hp = hp or full_hp
+                text = f"{text}\n{full_text}"
+
+            # The level arc's dot gives the level (within a half level or
+            # two) once the trainer's level cap is known
+            arc = None
+            if cp and hp and trainer_level:
+                arc = read_level_arc(image, trainer_level)
+            levels = arc.levels if arc is not None else None
+
+            # Fall back to species that can show this CP/HP, ranked by
+            # similarity to whatever partial name OCR did read
+            species_candidates = None
+            if cp and hp and not pokemon_name:
+                known_level = levels[0] if levels and len(levels) == 1 else None
+                species_candidates = infer_species(get_data_loader().pinned(), cp, hp, level=known_level, ocr_text=text)
+                if species_candidates:
+                    pokemon_name = species_candidates[0]['name_ko'] or species_candidates[0]['name_en']
+
+            # Appraisal bars, when shown, limit each IV without any OCR
+            appraisal = read_appraisal_bars(image)
+            iv_ranges = appraisal.iv_ranges() if appraisal is not None else None
+
+            # Solve IVs from the CP/HP formulas
+            analysis = None
             if cp and hp and pokemon_name:
-                analysis = self._calculate_ivs(pokemon_name, cp, hp)
-            else:
-                # Return mock data if extraction fails
+                analysis = self._calculate_ivs(pokemon_name, cp, hp, iv_ranges=iv_ranges, levels=levels)
+                if analysis is None and (iv_ranges or levels):
+                    logger.info(f"Appraisal {appraisal} / level arc {arc} contradict CP/HP, ignoring them")
+                    analysis = self._calculate_ivs(pokemon_name, cp, hp)
+                elif analysis is not None:
+                    if appraisal is not None:
+                        analysis['iv_details']['appraisal'] = appraisal.to_observation()
+                    if arc is not None:
+                        analysis['iv_details']['level_arc'] = arc._asdict()
+                if analysis is not None and species_candidates:
+                    analysis['iv_details']['species_candidates'] = species_candidates
+
+            if analysis is None:
+                # Return mock data if extraction or solving fails
                 analysis = self._get_mock_analysis()
 
             return analysis
@@ -78,24 +223,74 @@ class IVCalculator:
             logger.error(f"Failed to analyze screenshot: {str(e)}")
             return self._get_mock_analysis()
 
+    def _read_full_frame(self, image: np.ndarray) -> Tuple[Optional[str], Optional[int], Optional[int], str]:
+        """OCR the whole screenshot: (name, CP, HP, raw text)"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        text = get_ocr_backend().image_to_string(gray)
+        logger.info(f"Extracted text: {text}")
+        return self._extract_pokemon_name(text), self._extract_cp(text), self._extract_hp(text), text
+
+    def _read_regions(self, image: np.ndarray) -> Tuple[Optional[str], Optional[int], Optional[int], str]:
+        """
+        OCR the CP, name and HP crops found by the layout stage:
+        (name, CP, HP, raw name text)
+        """
+        layout = locate_regions(image)
+        cp, hp = self._read_numbers(image, layout)
+
+        name_text = ""
+        name_crop = binarize_crop(image, layout.name)
+        if name_crop is not None:
+            name_text = get_ocr_backend().image_to_string(name_crop, lang=_name_ocr_lang(), psm=NAME_OCR_PSM)
+
+        logger.info(f"Region OCR (anchored={layout.anchored}): name={name_text.strip()!r} CP={cp} HP={hp}")
+        return self._extract_pokemon_name(name_text), cp, hp, name_text
+
+    def _read_numbers(self, image: np.ndarray, layout: ScreenLayout) -> Tuple[Optional[int], Optional[int]]:
+        """Read the CP and HP crops with the in-process digit recognizer: (CP, max HP)"""
+        recognizer = get_digit_recognizer()
+        cp = hp = None
+        cp_crop = binarize_crop(image, layout.cp)
+        if cp_crop is not None:
+            cp = self._parse_cp_crop(recognizer.read(cp_crop))
+
+        hp_crop = binarize_crop(image, layout.hp)
+        if hp_crop is not None:
+            hp = self._parse_hp_crop(recognizer.read(hp_crop))
+        return cp, hp
+
+    def _parse_cp_crop(self, text: str) -> Optional[int]:
+        """
+        CP from the CP crop text ("CP1234"); None unless the whole crop
+        reads cleanly, so an unknown glyph ("CP12?4") never yields a
+        truncated number
+        """
+        match = re.fullmatch(r'CP(\d{2,5})', text.replace(" ", ""))
+        return int(match.group(1)) if match else None
+
+    def _parse_hp_crop(self, text: str) -> Optional[int]:
+        """Max HP from the HP crop text ("127/127HP"); None unless it reads cleanly"""
+        match = re.fullmatch(r'(\d+)/(\d+)(?:HP)?', text.replace(" ", ""))
+        return int(match.group(2)) if match else None
+
     def _extract_pokemon_name(self, text: str) -> Optional[str]:
         """Extract Pokemon name from OCR text"""
-        # Look for common Pokemon names (Korean and English)
-        text_lower = text.lower()
+        loader = get_data_loader().pinned()
+
+        # Match every Korean/English word against the Pokédex name index
+        words = re.findall(r'[가-힣]+|[A-Za-z]+', text)
 
         # Check Korean names first
-        korean_names = ['피카츄', '리자몽', '뮤츠', '망나뇽', '마기라스', '괴력몬', '팬텀', '갸라도스']
-        for pokemon in korean_names:
-            if pokemon in text:
-                return pokemon
-
-        # Fallback to English names
-        for pokemon in POKEMON_BASE_STATS.keys():
-            if pokemon.lower() in text_lower and pokemon.isascii():
-                # Convert to Korean if found in English
-                if 'korean' in POKEMON_BASE_STATS[pokemon]:
-                    return POKEMON_BASE_STATS[pokemon]['korean']
-                return pokemon.capitalize()
+        for word in words:
+            pokemon = loader.get_pokemon_by_name(word)
+            if pokemon and word == pokemon.get("name_ko"):
+                return pokemon["name_ko"]
+
+        # Fallback to English names, converted to Korean
+        for word in words:
+            pokemon = loader.get_pokemon_by_name(word)
+            if pokemon:
+                return pokemon.get("name_ko") or pokemon.get("name_en")
         return None
 
     def _extract_cp(self, text: str) -> Optional[int]:
@@ -118,29 +313,39 @@ class IVCalculator:
             return int(match.group(1))
         return None
 
-    def _calculate_ivs(self, pokemon_name: str, cp: int, hp: int, level: float = 20.0) -> Dict:
+    def _calculate_ivs(
+        self,
+        pokemon_name: str,
+        cp: int,
+        hp: int,
+        level: Optional[float] = None,
+        stardust: Optional[int] = None,
+        iv_ranges: Optional[Dict[str, Tuple[int, int]]] = None,
+        levels: Optional[Tuple[float, ...]] = None
+    ) -> Optional[Dict]:
         """
         Calculate IV stats based on CP and HP
-        Simplified calculation - real PokeGenie uses more sophisticated algorithms
-        """
-        # Check both Korean and English names
-        if pokemon_name not in POKEMON_BASE_STATS:
-            pokemon_lower = pokemon_name.lower()
-            if pokemon_lower not in POKEMON_BASE_STATS:
-                # Use average stats if Pokemon not in database
-                base_stats = {'attack': 200, 'defense': 180, 'stamina': 180}
-            else:
-                base_stats = POKEMON_BASE_STATS[pokemon_lower]
-        else:
-            base_stats = POKEMON_BASE_STATS[pokemon_name]
 
-        # Estimate IVs (simplified calculation)
-        # In reality, we'd need to reverse-engineer the CP formula
-        # This is a mock calculation for demonstration
-        attack_iv = np.random.randint(10, 16)
-        defense_iv = np.random.randint(10, 16)
-        stamina_iv = np.random.randint(10, 16)
+        Enumerates every (level, atk, def, sta) consistent with the CP/HP
+        formulas (and iv_ranges/levels, e.g. from appraisal and the level
+        arc) and reports the median-IV% candidate plus the full range.
+        Returns None if the species is unknown or nothing matches.
+        """
+        pokemon = get_data_loader().pinned().get_pokemon_by_name(pokemon_name)
+        if pokemon is None:
+            logger.info(f"Unknown Pokemon for IV solving: {pokemon_name}")
+            return None
+
+        solution = solve_ivs(
+            pokemon["base_attack"], pokemon["base_defense"], pokemon["base_stamina"],
+            cp, hp, level=level, stardust=stardust, iv_ranges=iv_ranges, levels=levels
+        )
+        best = solution.representative()
+        if best is None:
+            logger.info(f"No IV combination matches {pokemon_name} CP {cp} HP {hp}")
+            return None
 
+        level, attack_iv, defense_iv, stamina_iv = best
         iv_percentage = ((attack_iv + defense_iv + stamina_iv) / 45) * 100
 
         # Calculate ratings
@@ -163,7 +368,8 @@ class IVCalculator:
             'stamina_iv': stamina_iv,
             'battle_rating': battle_rating,
             'raid_rating': raid_rating,
-            'recommendations': recommendations
+            'recommendations': recommendations,
+            'iv_details': solution.to_dict()
         }
 
     def _get_battle_rating(self, attack_iv: int, defense_iv: int, iv_percentage: float) -> str:
@@ -259,6 +465,7 @@ class IVCalculator:
             'stamina_iv': 15,
             'battle_rating': 'A',
             'raid_rating': 'A+',
+            'iv_details': None,
             'recommendations': {
                 'should_power_up': True,
                 'best_use_case': '레이드 및 체육관 전투에 우수',
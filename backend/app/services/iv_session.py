@@ -0,0 +1,141 @@
+"""
+IV Narrowing Session Service
+Intersects observations (CP/HP after power-ups, appraisal, evolution) into a
+packed bitset over the (level, atk, def, sta) grid, one observation at a time
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.services.iv_solver import IVSolution, cp_hp_mask, iv_range_mask, level_mask
+from app.utils.cp_calculator import CPM_LEVELS, cp_hp_grid
+
+
+# Candidate space: level at session start x attack IV x defense IV x stamina IV
+GRID_SHAPE = (len(CPM_LEVELS), 16, 16, 16)
+GRID_SIZE = int(np.prod(GRID_SHAPE))
+
+OBSERVATION_TYPES = ("cp_hp", "appraisal", "evolution")
+
+# Appraisal stars -> inclusive IV sum range
+APPRAISAL_STAR_SUMS = {
+    0: (0, 22),
+    1: (23, 29),
+    2: (30, 36),
+    3: (37, 44),
+    4: (45, 45),
+}
+
+_IV_SUM = (
+    np.arange(16)[:, None, None] + np.arange(16)[None, :, None] + np.arange(16)[None, None, :]
+)
+
+
+def pack(mask: np.ndarray) -> bytes:
+    return np.packbits(mask.reshape(-1)).tobytes()
+
+
+def unpack(bits: bytes) -> np.ndarray:
+    packed = np.frombuffer(bits, dtype=np.uint8)
+    return np.unpackbits(packed, count=GRID_SIZE).astype(bool).reshape(GRID_SHAPE)
+
+
+def all_candidates() -> bytes:
+    """Packed bitset with every grid cell set"""
+    return pack(np.ones(GRID_SHAPE, dtype=bool))
+
+
+def count(bits: bytes) -> int:
+    return int(np.bitwise_count(np.frombuffer(bits, dtype=np.uint8)).sum())
+
+
+def _shift_to_start(mask: np.ndarray, power_ups: int) -> np.ndarray:
+    """
+    Express a mask observed after `power_ups` half-level power-ups in terms
+    of the session's starting level
+    """
+    if power_ups == 0:
+        return mask
+    shifted = np.zeros_like(mask)
+    if power_ups < mask.shape[0]:
+        shifted[:mask.shape[0] - power_ups] = mask[power_ups:]
+    return shifted
+
+
+def _range(value, name: str) -> Tuple[int, int]:
+    if value is None:
+        return 0, 15
+    low, high = value
+    if not (0 <= low <= high <= 15):
+        raise ValueError(f"{name} must be an IV range within 0-15")
+    return int(low), int(high)
+
+
+def observation_mask(observation: Dict, pokemon: Dict) -> np.ndarray:
+    """
+    Boolean GRID_SHAPE mask of candidates consistent with one observation
+
+    Args:
+        observation: {"type": "cp_hp" | "evolution", "cp", "hp", "power_ups",
+                      "level", "stardust"} or {"type": "appraisal", "stars",
+                      "attack_iv_range", "defense_iv_range", "stamina_iv_range"}
+        pokemon: Species seen in the observation (the evolved form for "evolution")
+
+    Raises:
+        ValueError: if the observation is malformed
+    """
+    obs_type = observation.get("type")
+
+    if obs_type in ("cp_hp", "evolution"):
+        cp = observation.get("cp")
+        hp = observation.get("hp")
+        if not cp or not hp:
+            raise ValueError(f"{obs_type} observation needs cp and hp")
+        power_ups = int(observation.get("power_ups") or 0)
+        if power_ups < 0:
+            raise ValueError("power_ups must not be negative")
+
+        grid = cp_hp_grid(pokemon["base_attack"], pokemon["base_defense"], pokemon["base_stamina"])
+        levels = level_mask(observation.get("level"), observation.get("stardust"))
+        return _shift_to_start(cp_hp_mask(grid, cp, hp, levels), power_ups)
+
+    if obs_type == "appraisal":
+        ivs = iv_range_mask(
+            attack=_range(observation.get("attack_iv_range"), "attack_iv_range"),
+            defense=_range(observation.get("defense_iv_range"), "defense_iv_range"),
+            stamina=_range(observation.get("stamina_iv_range"), "stamina_iv_range"),
+        )
+        stars = observation.get("stars")
+        if stars is not None:
+            if stars not in APPRAISAL_STAR_SUMS:
+                raise ValueError("stars must be between 0 and 4")
+            low, high = APPRAISAL_STAR_SUMS[stars]
+            ivs = ivs & (_IV_SUM >= low) & (_IV_SUM <= high)
+        return np.broadcast_to(ivs[None, :, :, :], GRID_SHAPE)
+
+    raise ValueError(f"Invalid observation type. Must be one of: {', '.join(OBSERVATION_TYPES)}")
+
+
+def narrow(bits: bytes, mask: np.ndarray) -> bytes:
+    """Intersect a packed candidate bitset with an observation mask"""
+    current = np.frombuffer(bits, dtype=np.uint8)
+    return np.bitwise_and(current, np.packbits(mask.reshape(-1))).tobytes()
+
+
+def summarize(bits: bytes) -> Dict:
+    """Candidate count, IV% range and levels (at session start) of a bitset"""
+    return IVSolution(unpack(bits)).to_dict()
+
+
+def apply_observation(bits: bytes, observation: Dict, pokemon: Dict) -> Tuple[bytes, int]:
+    """Apply one observation, returning the new bitset and its candidate count"""
+    new_bits = narrow(bits, observation_mask(observation, pokemon))
+    return new_bits, count(new_bits)
+
+
+def evolved_species(observation: Dict) -> Optional[int]:
+    """Species the session continues as after this observation, if it changed"""
+    if observation.get("type") == "evolution":
+        return observation.get("pokemon_id")
+    return None
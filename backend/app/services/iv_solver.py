@@ -0,0 +1,174 @@
+"""
+IV Solver Service
+Finds every (level, attack IV, defense IV, stamina IV) consistent with an
+observed CP/HP using the vectorized grids from cp_calculator
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.cp_calculator import CPM_LEVELS, CPGrid, cp_hp_grid, level_index
+
+
+# Stardust per power-up by level bracket: (first level, last level, cost)
+STARDUST_COSTS = (
+    (1, 2.5, 200), (3, 4.5, 400), (5, 6.5, 600), (7, 8.5, 800),
+    (9, 10.5, 1000), (11, 12.5, 1300), (13, 14.5, 1600), (15, 16.5, 1900),
+    (17, 18.5, 2200), (19, 20.5, 2500), (21, 22.5, 3000), (23, 24.5, 3500),
+    (25, 26.5, 4000), (27, 28.5, 4500), (29, 30.5, 5000), (31, 32.5, 6000),
+    (33, 34.5, 7000), (35, 36.5, 8000), (37, 38.5, 9000), (39, 39.5, 10000),
+)
+# Costs from level 40 on (Candy XL levels) aren't in the table, so a
+# stardust cost never rules those levels out
+STARDUST_KNOWN_MAX_LEVEL = 39.5
+
+# How many individual candidates to include in solution dicts
+MAX_LISTED_CANDIDATES = 20
+
+IVRange = Tuple[int, int]
+
+
+def level_mask(
+    level: Optional[float] = None,
+    stardust: Optional[int] = None,
+    levels: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    Boolean mask over CPM_LEVELS allowed by a known level, a set of possible
+    levels (e.g. from the level arc) and/or power-up cost
+    """
+    mask = np.ones(len(CPM_LEVELS), dtype=bool)
+
+    if level is not None:
+        only = np.zeros_like(mask)
+        only[level_index(level)] = True
+        mask &= only
+
+    if levels is not None:
+        only = np.zeros_like(mask)
+        only[[level_index(possible) for possible in levels]] = True
+        mask &= only
+
+    if stardust is not None:
+        dust_mask = CPM_LEVELS > STARDUST_KNOWN_MAX_LEVEL
+        for first, last, cost in STARDUST_COSTS:
+            if cost == stardust:
+                dust_mask |= (CPM_LEVELS >= first) & (CPM_LEVELS <= last)
+        mask &= dust_mask
+
+    return mask
+
+
+def iv_range_mask(
+    attack: IVRange = (0, 15),
+    defense: IVRange = (0, 15),
+    stamina: IVRange = (0, 15),
+) -> np.ndarray:
+    """Boolean (16, 16, 16) mask of IVs inside inclusive per-stat ranges"""
+    ivs = np.arange(16)
+    atk_ok = (ivs >= attack[0]) & (ivs <= attack[1])
+    def_ok = (ivs >= defense[0]) & (ivs <= defense[1])
+    sta_ok = (ivs >= stamina[0]) & (ivs <= stamina[1])
+    return atk_ok[:, None, None] & def_ok[None, :, None] & sta_ok[None, None, :]
+
+
+def cp_hp_mask(grid: CPGrid, cp: int, hp: int, levels: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Boolean (levels, 16, 16, 16) mask of grid cells with exactly this CP and HP
+
+    HP only depends on (level, stamina IV), so it is checked on the small
+    HP table first and CP is only compared on levels where HP can match.
+    """
+    mask = np.zeros(grid.cp.shape, dtype=bool)
+
+    hp_ok = grid.hp[:, 0, 0, :] == hp
+    level_ok = hp_ok.any(axis=1)
+    if levels is not None:
+        level_ok &= levels
+
+    rows = np.flatnonzero(level_ok)
+    if rows.size:
+        mask[rows] = (grid.cp[rows] == cp) & hp_ok[rows][:, None, None, :]
+    return mask
+
+
+class IVSolution:
+    """Candidate set for one observation plus IV% statistics"""
+
+    def __init__(self, mask: np.ndarray):
+        self.mask = mask
+        level_idx, atk, dfn, sta = np.nonzero(mask)
+        self.levels = CPM_LEVELS[level_idx]
+        self.attack = atk
+        self.defense = dfn
+        self.stamina = sta
+        self.iv_percentages = (atk + dfn + sta) / 45 * 100
+
+    @property
+    def count(self) -> int:
+        return int(self.levels.size)
+
+    def representative(self) -> Optional[Tuple[float, int, int, int]]:
+        """(level, atk, def, sta) of the median-IV% candidate"""
+        if not self.count:
+            return None
+        order = np.argsort(self.iv_percentages, kind="stable")
+        i = order[(self.count - 1) // 2]
+        return float(self.levels[i]), int(self.attack[i]), int(self.defense[i]), int(self.stamina[i])
+
+    def to_dict(self) -> Dict:
+        if not self.count:
+            return {"candidate_count": 0, "iv_min": None, "iv_avg": None, "iv_max": None,
+                    "levels": [], "candidates": []}
+
+        candidates: List[Dict] = []
+        for i in range(min(self.count, MAX_LISTED_CANDIDATES)):
+            candidates.append({
+                "level": float(self.levels[i]),
+                "attack_iv": int(self.attack[i]),
+                "defense_iv": int(self.defense[i]),
+                "stamina_iv": int(self.stamina[i]),
+                "iv_percentage": round(float(self.iv_percentages[i]), 2),
+            })
+
+        return {
+            "candidate_count": self.count,
+            "iv_min": round(float(self.iv_percentages.min()), 2),
+            "iv_avg": round(float(self.iv_percentages.mean()), 2),
+            "iv_max": round(float(self.iv_percentages.max()), 2),
+            "levels": sorted({float(level) for level in self.levels}),
+            "candidates": candidates,
+        }
+
+
+def solve_ivs(
+    base_attack: int,
+    base_defense: int,
+    base_stamina: int,
+    cp: int,
+    hp: int,
+    level: Optional[float] = None,
+    stardust: Optional[int] = None,
+    iv_ranges: Optional[Dict[str, IVRange]] = None,
+    levels: Optional[Sequence[float]] = None,
+) -> IVSolution:
+    """
+    Enumerate every (level, atk, def, sta) matching the observed CP and HP
+
+    Args:
+        base_attack, base_defense, base_stamina: Species base stats
+        cp, hp: Observed values
+        level: Known level, if any
+        stardust: Known power-up stardust cost, if any
+        iv_ranges: Optional {"attack": (min, max), ...} limits, e.g. from appraisal
+        levels: Possible levels, if narrowed down (e.g. from the level arc)
+
+    Returns:
+        IVSolution with the candidate set and min/avg/max IV%
+    """
+    grid = cp_hp_grid(base_attack, base_defense, base_stamina)
+    mask = cp_hp_mask(grid, cp, hp, level_mask(level, stardust, levels))
+    if iv_ranges:
+        mask &= iv_range_mask(**iv_ranges)[None, :, :, :]
+    return IVSolution(mask)
@@ -0,0 +1,176 @@
+"""
+Level Arc Reader
+Finds the white dot on the level arc above the Pokémon and converts its
+angle to candidate levels, so the IV solver only has to search those
+
+The arc is a half circle centred horizontally, running from level 1 at the
+left end to the trainer's power-up cap at the right end; the dot's angle is
+linear in the CP multiplier, not the level. Both the arc and the dot are
+found with vectorized polar sampling: a small grid of (centre height,
+radius) candidates is scored along the half circle, then a strip around
+the best one is unrolled with cv2.remap and scanned for the dot.
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.utils.cp_calculator import CPM_LEVELS, CPM_VALUES
+
+
+# Pokémon can be powered up to 2 levels above the trainer, up to level 50
+ARC_LEVELS_ABOVE_TRAINER = 2
+MAX_ARC_LEVEL = 50
+
+# Arc search space: centre height as a share of the screen height, radius
+# as a share of the width; the centre is always at mid-width
+ARC_CENTER_ROWS = (0.22, 0.45)
+ARC_RADIUS = (0.30, 0.46)
+ARC_FIT_WIDTH = 360  # Screens are scaled to this width to fit the arc
+ARC_FIT_ANGLES = 180  # Samples along the half circle per candidate
+ARC_FIT_COARSE_STEP = 3  # Pixels between candidates in the first pass
+ARC_RIDGE_OFFSET = 2  # Pixels inside/outside the arc to compare against
+ARC_MIN_RIDGE = 12  # Mean brightness of the arc over its surroundings
+
+# The dot: a solid white disc centred on the arc
+DOT_RADIUS = 0.011  # Share of the width
+DOT_MIN_VALUE = 220
+DOT_MIN_FILL = 0.7  # Share of its diameter a column must be white for
+DOT_MAX_SURROUNDING = 0.5  # White share just outside the dot; more is a bright background
+ANGLE_STEP = 0.05  # Degrees between dot samples
+ANGLE_TOLERANCE = 0.75  # Degrees of measurement error allowed either way
+
+
+class ArcReading(NamedTuple):
+    levels: Tuple[float, ...]  # Candidate levels, nearest to the measured angle first
+    angle: float  # Degrees from the left end of the arc (0-180)
+    max_level: float
+
+
+def arc_max_level(trainer_level: int) -> float:
+    return float(min(trainer_level + ARC_LEVELS_ABOVE_TRAINER, MAX_ARC_LEVEL))
+
+
+def level_angles(max_level: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(levels, dot angle in degrees from the left end) for levels up to max_level"""
+    in_range = CPM_LEVELS <= max_level
+    cpm = CPM_VALUES[in_range]
+    return CPM_LEVELS[in_range], 180 * (cpm - cpm[0]) / (cpm[-1] - cpm[0])
+
+
+def levels_at_angle(angle: float, max_level: float) -> Tuple[float, ...]:
+    """Levels whose dot lies within ANGLE_TOLERANCE of angle, nearest first"""
+    levels, angles = level_angles(max_level)
+    distance = np.abs(angles - angle)
+    close = np.flatnonzero(distance <= ANGLE_TOLERANCE)
+    if not close.size:
+        close = np.array([int(np.argmin(distance))])
+    close = close[np.argsort(distance[close])]
+    return tuple(float(level) for level in levels[close])
+
+
+def _sample(gray: np.ndarray, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+    """Nearest-pixel values at (ys, xs); outside the image reads as 0"""
+    height, width = gray.shape
+    ys, xs = np.broadcast_arrays(ys, xs)
+    yi, xi = np.rint(ys).astype(np.intp), np.rint(xs).astype(np.intp)
+    inside = (yi >= 0) & (yi < height) & (xi >= 0) & (xi < width)
+    values = np.zeros(ys.shape, dtype=np.float32)
+    values[inside] = gray[yi[inside], xi[inside]]
+    return values
+
+
+def _ridge_scores(gray: np.ndarray, centers: np.ndarray, radii: np.ndarray, angles: int,
+                  offset: float = ARC_RIDGE_OFFSET) -> np.ndarray:
+    """
+    Mean brightness of each (centre, radius) half circle over the pixels
+    just inside and outside it, for a thin bright arc
+    """
+    theta = np.linspace(0, np.pi, angles)
+    cos, sin = np.cos(theta), np.sin(theta)
+    cy = centers[:, None, None]
+    cx = gray.shape[1] / 2
+
+    def ring(shift):
+        r = radii[None, :, None] + shift
+        return _sample(gray, cy - r * sin, cx + r * cos)
+
+    ridge = ring(0) - np.maximum(ring(-offset), ring(offset))
+    return np.clip(ridge, 0, None).mean(axis=2)
+
+
+def fit_arc(gray: np.ndarray) -> Optional[Tuple[float, float]]:
+    """(centre y, radius) in pixels of the level arc in a grayscale screenshot, or None"""
+    height, width = gray.shape
+    scale = ARC_FIT_WIDTH / width
+    small = cv2.resize(gray, (ARC_FIT_WIDTH, max(1, round(height * scale))), interpolation=cv2.INTER_AREA)
+    small_height = small.shape[0]
+
+    # Coarse grid on a thumbnail, every thumbnail pixel around its best
+    # cell, then every full-resolution pixel around that
+    step = ARC_FIT_COARSE_STEP
+    centers = np.arange(ARC_CENTER_ROWS[0] * small_height, ARC_CENTER_ROWS[1] * small_height, step)
+    radii = np.arange(ARC_RADIUS[0] * ARC_FIT_WIDTH, ARC_RADIUS[1] * ARC_FIT_WIDTH, step)
+    scores = _ridge_scores(small, centers, radii, ARC_FIT_ANGLES // 2)
+    i, j = np.unravel_index(int(np.argmax(scores)), scores.shape)
+
+    centers = centers[i] + np.arange(-step + 1, step)
+    radii = radii[j] + np.arange(-step + 1, step)
+    scores = _ridge_scores(small, centers, radii, ARC_FIT_ANGLES)
+    i, j = np.unravel_index(int(np.argmax(scores)), scores.shape)
+    if scores[i, j] < ARC_MIN_RIDGE:
+        return None
+    if scale >= 1:
+        return centers[i] / scale, radii[j] / scale
+
+    spread = np.arange(-np.ceil(1 / scale), np.ceil(1 / scale) + 1)
+    centers = centers[i] / scale + spread
+    radii = radii[j] / scale + spread
+    scores = _ridge_scores(gray, centers, radii, 2 * ARC_FIT_ANGLES, ARC_RIDGE_OFFSET / scale)
+    i, j = np.unravel_index(int(np.argmax(scores)), scores.shape)
+    return centers[i], radii[j]
+
+
+def find_dot_angle(gray: np.ndarray, center_y: float, radius: float) -> Optional[float]:
+    """Angle of the dot in degrees from the arc's left end, or None"""
+    width = gray.shape[1]
+    dot_radius = DOT_RADIUS * width
+    offsets = np.arange(-2.5 * dot_radius, 2.5 * dot_radius + 1, 1.0)
+    angles = np.arange(0, 180 + ANGLE_STEP / 2, ANGLE_STEP)
+
+    # Unroll a strip around the arc: rows are radial offsets, columns angles
+    # (measured from the left end, so column order is level order)
+    theta = np.radians(180 - angles)
+    r = radius + offsets[:, None]
+    map_x = (width / 2 + r * np.cos(theta)).astype(np.float32)
+    map_y = (center_y - r * np.sin(theta)).astype(np.float32)
+    strip = cv2.remap(gray, map_x, map_y, cv2.INTER_LINEAR, borderValue=0)
+    white = strip >= DOT_MIN_VALUE
+
+    core = np.abs(offsets) <= dot_radius
+    surround = (np.abs(offsets) > 1.5 * dot_radius)
+    fill = white[core].mean(axis=0)
+    outside = white[surround].mean(axis=0)
+    is_dot = (fill >= DOT_MIN_FILL) & (outside <= DOT_MAX_SURROUNDING)
+    if not is_dot.any():
+        return None
+
+    # Middle of the widest run of dot columns
+    columns = np.flatnonzero(is_dot)
+    runs = np.split(columns, np.flatnonzero(np.diff(columns) > 1) + 1)
+    run = max(runs, key=len)
+    return float(angles[run].mean())
+
+
+def read_level_arc(image: np.ndarray, trainer_level: int) -> Optional[ArcReading]:
+    """Candidate levels from the level arc of a BGR detail screenshot, or None"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    arc = fit_arc(gray)
+    if arc is None:
+        return None
+    angle = find_dot_angle(gray, *arc)
+    if angle is None:
+        return None
+    max_level = arc_max_level(trainer_level)
+    return ArcReading(levels_at_angle(angle, max_level), round(angle, 2), max_level)
@@ -0,0 +1,99 @@
+"""
+Pokédex Data Bundle
+Compiles the data/ JSON files into one versioned binary bundle with the
+snapshot indexes prebuilt, so process start skips JSON parsing entirely
+"""
+
+import json
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.services.pokedex_data_loader import PokedexSnapshot
+
+
+BUNDLE_FILENAME = "pokedex.bundle"
+BUNDLE_MAGIC = b"PGOBNDL\x00"
+# Bump when the on-disk layout changes
+BUNDLE_FORMAT_VERSION = 1
+
+# magic, format version, header length
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def source_stats(data_dir: Path, filenames) -> Dict[str, List[int]]:
+    """(mtime_ns, size) of every source file, [0, 0] if missing"""
+    stats = {}
+    for filename in filenames:
+        try:
+            st = (data_dir / filename).stat()
+            stats[filename] = [st.st_mtime_ns, st.st_size]
+        except FileNotFoundError:
+            stats[filename] = [0, 0]
+    return stats
+
+
+def write_bundle(snapshot: "PokedexSnapshot", data_dir: Path, sources: Dict[str, List[int]]) -> Path:
+    """
+    Write a snapshot to data_dir/pokedex.bundle
+
+    sources must be the source_stats() of the JSON files the snapshot was built from,
+    captured before they were read.
+    """
+    from app.services.pokedex_data_loader import PokedexSnapshot
+
+    header = json.dumps({
+        "schema_version": PokedexSnapshot.SCHEMA_VERSION,
+        "data_version": snapshot.version,
+        "sources": sources,
+    }).encode("utf-8")
+    payload = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+
+    bundle_path = data_dir / BUNDLE_FILENAME
+    tmp_path = bundle_path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(payload)
+    # Atomic rename so a starting worker never reads a half-written bundle
+    os.replace(tmp_path, bundle_path)
+    return bundle_path
+
+
+def load_bundle(data_dir: Path, filenames) -> Optional["PokedexSnapshot"]:
+    """
+    Load the snapshot from the bundle if it is current
+
+    Returns None when there is no bundle, it was written by another
+    format/schema version, or any JSON source changed since it was built.
+    """
+    from app.services.pokedex_data_loader import PokedexSnapshot
+
+    bundle_path = data_dir / BUNDLE_FILENAME
+    if not bundle_path.exists():
+        return None
+
+    try:
+        with open(bundle_path, "rb") as f:
+            magic, format_version, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != BUNDLE_MAGIC or format_version != BUNDLE_FORMAT_VERSION:
+                return None
+
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            if header.get("schema_version") != PokedexSnapshot.SCHEMA_VERSION:
+                return None
+            if header.get("sources") != source_stats(data_dir, filenames):
+                print(f"Data bundle {bundle_path} is stale, loading JSON files instead")
+                return None
+
+            snapshot = pickle.load(f)
+    except Exception as e:
+        print(f"Error loading {bundle_path}: {e}")
+        return None
+
+    if not isinstance(snapshot, PokedexSnapshot):
+        return None
+    return snapshot
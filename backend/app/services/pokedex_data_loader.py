@@ -3,128 +3,428 @@ Pokédex Data Loader Service
 Loads and caches JSON data files for Pokémon GO features
 """
 
+import copy
+import hashlib
 import json
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import threading
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Optional, Sequence, Tuple
 from pathlib import Path
 
+import numpy as np
+
+from app.services.pokedex_bundle import load_bundle, write_bundle, source_stats
+from app.services.pokemon_search_index import NameSearchIndex, build_move_trie, build_pokemon_trie
+from app.services.pokemon_stat_store import PokemonStatStore, StatRange
+
+
+DATA_FILES = (
+    "pokemon_base.json",
+    "moves.json",
+    "pokemon_moves.json",
+    "seasonal_tiers.json",
+    "raid_counters.json",
+    "pvp_party_rankings.json",
+)
+
+# Results kept per autocomplete trie node
+AUTOCOMPLETE_TOP_K = 10
+
+
+class PokedexSnapshot:
+    """
+    One consistent, read-only version of all data files and their indexes.
+
+    A snapshot is fully built before it is published and is never mutated
+    afterwards, so a request that grabs a reference sees a single version of
+    every file for its whole lifetime.
+    """
+
+    # Bump whenever indexes change so stale binary bundles are ignored
+    SCHEMA_VERSION = 7
+
+    def __init__(
+        self,
+        version: str,
+        pokemon_base: Sequence[Dict],
+        moves: Sequence[Dict],
+        pokemon_moves: Sequence[Dict],
+        seasonal_tiers: Sequence[Dict],
+        raid_counters: Sequence[Dict],
+        pvp_party_rankings: Sequence[Dict],
+    ):
+        self.version = version
+        self.loaded_at = datetime.now()
+        self.source = "json"
+        self.pokemon_base: Tuple[Dict, ...] = tuple(pokemon_base)
+        self.moves: Tuple[Dict, ...] = tuple(moves)
+        self.pokemon_moves: Tuple[Dict, ...] = tuple(pokemon_moves)
+        self.seasonal_tiers: Tuple[Dict, ...] = tuple(seasonal_tiers)
+        self.raid_counters: Tuple[Dict, ...] = tuple(raid_counters)
+        self.pvp_party_rankings: Tuple[Dict, ...] = tuple(pvp_party_rankings)
+
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """Build dict indexes so lookups don't scan the data lists"""
+        # Keep the first entry on duplicate ids, matching the old linear scans
+        pokemon_by_id: Dict[int, Dict] = {}
+        pokemon_by_name: Dict[str, Dict] = {}
+        for pokemon in self.pokemon_base:
+            pokemon_by_id.setdefault(pokemon.get("pokedex_number"), pokemon)
+            for name in (pokemon.get("name_en"), pokemon.get("name_ko")):
+                if name:
+                    pokemon_by_name.setdefault(name.lower(), pokemon)
+        self.pokemon_by_id = pokemon_by_id
+        self.pokemon_by_name = pokemon_by_name
+
+        move_by_id: Dict[str, Dict] = {}
+        for move in self.moves:
+            move_by_id.setdefault(move.get("move_id"), move)
+        self.move_by_id = move_by_id
+
+        moves_by_pokemon: Dict[int, Dict[str, List[Dict]]] = {}
+        for pm in self.pokemon_moves:
+            move_data = move_by_id.get(pm.get("move_id"))
+            if not move_data or pm.get("category") not in ("fast", "charged"):
+                continue
+            entry = moves_by_pokemon.setdefault(pm.get("pokemon_id"), {"fast": [], "charged": []})
+            entry[pm.get("category")].append(move_data)
+        self.moves_by_pokemon = moves_by_pokemon
+
+        self.stat_store = PokemonStatStore(self.pokemon_base)
+        self.search_index = NameSearchIndex(self.pokemon_base)
+        self.autocomplete_tries = {
+            "pokemon": build_pokemon_trie(self.pokemon_base, top_k=AUTOCOMPLETE_TOP_K),
+            "move": build_move_trie(self.moves, top_k=AUTOCOMPLETE_TOP_K),
+        }
+
+        self._build_season_index()
+
+    def _build_season_index(self):
+        """Parse season dates once and build a sorted interval index"""
+        # (start, end, season_id) -> position of its first tier in the file
+        interval_order: Dict[Tuple[date, date, str], int] = {}
+        tier_by_season_pokemon: Dict[Tuple[str, int], Dict] = {}
+        tiers_by_season: Dict[str, List[Dict]] = {}
+
+        for tier in self.seasonal_tiers:
+            season_id = tier.get("season_id")
+            tier_by_season_pokemon.setdefault((season_id, tier.get("pokemon_id")), tier)
+            tiers_by_season.setdefault(season_id, []).append(tier)
+
+            try:
+                start = datetime.fromisoformat(tier.get("start_date")).date()
+                end = datetime.fromisoformat(tier.get("end_date")).date()
+            except (TypeError, ValueError) as e:
+                print(f"Warning: invalid dates for season {season_id}: {e}")
+                continue
+
+            interval_order.setdefault((start, end, season_id), len(interval_order))
+
+        # (start, end, season_id) sorted by start date
+        self.season_intervals: List[Tuple[date, date, str]] = sorted(interval_order)
+        self._season_order = [interval_order[interval] for interval in self.season_intervals]
+        self._season_starts = [interval[0] for interval in self.season_intervals]
+        # Running max of end dates lets season_at() stop early when seasons overlap
+        self._season_max_end: List[date] = []
+        max_end = date.min
+        for _, end, _ in self.season_intervals:
+            max_end = max(max_end, end)
+            self._season_max_end.append(max_end)
+
+        # Every date on which season_at() may change its answer
+        boundaries = set()
+        for start, end, _ in self.season_intervals:
+            boundaries.add(start)
+            if end < date.max:
+                boundaries.add(end + timedelta(days=1))
+        self._season_boundaries = sorted(boundaries)
+
+        self.tier_by_season_pokemon = tier_by_season_pokemon
+        self.tiers_by_season = tiers_by_season
+
+    def season_at(self, day: date) -> Optional[str]:
+        """
+        Find the season covering a date (past, present or future)
+
+        If seasons overlap, the one listed first in seasonal_tiers.json wins.
+        """
+        best = None
+        i = bisect_right(self._season_starts, day) - 1
+        while i >= 0 and self._season_max_end[i] >= day:
+            covers = self.season_intervals[i][1] >= day
+            if covers and (best is None or self._season_order[i] < self._season_order[best]):
+                best = i
+            i -= 1
+        return self.season_intervals[best][2] if best is not None else None
+
+    def season_validity(self, day: date) -> Tuple[date, date]:
+        """Return the [first, last] date range over which season_at(day) can't change"""
+        i = bisect_right(self._season_boundaries, day)
+        first = self._season_boundaries[i - 1] if i > 0 else date.min
+        last = self._season_boundaries[i] - timedelta(days=1) if i < len(self._season_boundaries) else date.max
+        return first, last
+
 
 class PokedexDataLoader:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", use_bundle: bool = True):
         self.data_dir = Path(data_dir)
-        self.pokemon_base: List[Dict] = []
-        self.moves: List[Dict] = []
-        self.pokemon_moves: List[Dict] = []
-        self.seasonal_tiers: List[Dict] = []
-        self.raid_counters: List[Dict] = []
-        self.pvp_party_rankings: List[Dict] = []
+        self.use_bundle = use_bundle
+        self._snapshot: Optional[PokedexSnapshot] = None
+        # Serializes reloads; readers never take this lock
+        self._reload_lock = threading.Lock()
+        self._is_view = False
+        # Current-season results per snapshot version, valid until the next season boundary.
+        # Shared with pinned views (copy.copy keeps the same dict).
+        self._season_cache: Dict[str, Tuple[date, date, Optional[str]]] = {}
 
         self.load_all_data()
 
-    def load_all_data(self):
-        """Load all JSON data files"""
-        self.pokemon_base = self._load_json("pokemon_base.json")
-        self.moves = self._load_json("moves.json")
-        self.pokemon_moves = self._load_json("pokemon_moves.json")
-        self.seasonal_tiers = self._load_json("seasonal_tiers.json")
-        self.raid_counters = self._load_json("raid_counters.json")
-        self.pvp_party_rankings = self._load_json("pvp_party_rankings.json")
-
-    def _load_json(self, filename: str) -> List[Dict]:
-        """Load a JSON file and return its contents"""
+    @property
+    def snapshot(self) -> PokedexSnapshot:
+        """Currently published data snapshot"""
+        return self._snapshot
+
+    @property
+    def data_version(self) -> str:
+        return self._snapshot.version
+
+    @property
+    def pokemon_base(self) -> Tuple[Dict, ...]:
+        return self._snapshot.pokemon_base
+
+    @property
+    def moves(self) -> Tuple[Dict, ...]:
+        return self._snapshot.moves
+
+    @property
+    def pokemon_moves(self) -> Tuple[Dict, ...]:
+        return self._snapshot.pokemon_moves
+
+    @property
+    def seasonal_tiers(self) -> Tuple[Dict, ...]:
+        return self._snapshot.seasonal_tiers
+
+    @property
+    def raid_counters(self) -> Tuple[Dict, ...]:
+        return self._snapshot.raid_counters
+
+    @property
+    def pvp_party_rankings(self) -> Tuple[Dict, ...]:
+        return self._snapshot.pvp_party_rankings
+
+    def load_all_data(self) -> PokedexSnapshot:
+        """Load all JSON data files into a new snapshot and publish it"""
+        if self._is_view:
+            raise RuntimeError("Cannot reload data through a pinned loader view")
+
+        with self._reload_lock:
+            snapshot = self._build_snapshot()
+            # Single reference assignment: readers see either the old or the new snapshot
+            self._snapshot = snapshot
+            self._season_cache.clear()
+        return snapshot
+
+    def _build_snapshot(self) -> PokedexSnapshot:
+        """Build a snapshot (not yet published), preferring a current binary bundle"""
+        if self.use_bundle:
+            snapshot = load_bundle(self.data_dir, DATA_FILES)
+            if snapshot is not None:
+                snapshot.loaded_at = datetime.now()
+                snapshot.source = "bundle"
+                return snapshot
+
+        return self._build_snapshot_from_json()
+
+    def _build_snapshot_from_json(self) -> PokedexSnapshot:
+        """Read every JSON data file and build a snapshot"""
+        digest = hashlib.sha256()
+        contents = {}
+        for filename in DATA_FILES:
+            raw = self._read_file(filename)
+            digest.update(filename.encode("utf-8"))
+            digest.update(raw)
+            contents[filename] = self._parse_json(filename, raw)
+
+        return PokedexSnapshot(
+            version=digest.hexdigest()[:12],
+            pokemon_base=contents["pokemon_base.json"],
+            moves=contents["moves.json"],
+            pokemon_moves=contents["pokemon_moves.json"],
+            seasonal_tiers=contents["seasonal_tiers.json"],
+            raid_counters=contents["raid_counters.json"],
+            pvp_party_rankings=contents["pvp_party_rankings.json"],
+        )
+
+    def build_bundle(self) -> Path:
+        """Compile the JSON data files into data/pokedex.bundle"""
+        # Stat the sources before reading them so a concurrent edit makes the bundle stale
+        sources = source_stats(self.data_dir, DATA_FILES)
+        snapshot = self._build_snapshot_from_json()
+        return write_bundle(snapshot, self.data_dir, sources)
+
+    def _read_file(self, filename: str) -> bytes:
+        """Read raw file bytes, or empty bytes if the file is missing"""
         file_path = self.data_dir / filename
         if not file_path.exists():
             print(f"Warning: {file_path} not found. Returning empty list.")
-            return []
+            return b""
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return file_path.read_bytes()
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
+            return b""
+
+    def _parse_json(self, filename: str, raw: bytes) -> List[Dict]:
+        """Parse JSON file contents and return them"""
+        if not raw:
             return []
 
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except Exception as e:
+            print(f"Error loading {self.data_dir / filename}: {e}")
+            return []
+
+    def pinned(self) -> "PokedexDataLoader":
+        """
+        Return a view of this loader bound to the current snapshot.
+
+        Use one per request so that several lookups can't straddle a reload.
+        """
+        view = copy.copy(self)
+        view._is_view = True
+        return view
+
     def get_pokemon_by_id(self, pokemon_id: int) -> Optional[Dict]:
         """Get Pokémon base data by pokedex_number"""
-        for pokemon in self.pokemon_base:
-            if pokemon.get("pokedex_number") == pokemon_id:
-                return pokemon
-        return None
+        return self._snapshot.pokemon_by_id.get(pokemon_id)
+
+    def get_pokemon_by_name(self, name: str) -> Optional[Dict]:
+        """Get Pokémon base data by exact Korean or English name (case-insensitive)"""
+        return self._snapshot.pokemon_by_name.get(name.strip().lower())
 
     def get_all_pokemon(self) -> List[Dict]:
         """Get all Pokémon"""
-        return self.pokemon_base
+        return self._snapshot.pokemon_base
 
     def search_pokemon(self, query: str) -> List[Dict]:
-        """Search Pokémon by Korean or English name"""
-        query = query.lower()
-        results = []
-        for pokemon in self.pokemon_base:
-            name_en = pokemon.get("name_en", "").lower()
-            name_ko = pokemon.get("name_ko", "").lower()
-            if query in name_en or query in name_ko:
-                results.append(pokemon)
-        return results
+        """
+        Search Pokémon by Korean or English name
+
+        Initial-consonant queries (ㅍㅋㅊ) match Korean names; results are
+        ranked exact > prefix > infix.
+        """
+        return self._snapshot.search_index.search(query)
+
+    def autocomplete(self, query: str, kind: Optional[str] = None, limit: int = AUTOCOMPLETE_TOP_K) -> List[Dict]:
+        """
+        Prefix-complete Pokémon and/or move names (English, Korean or chosung)
+
+        Returns small payloads (kind, ids, names, sprite/type), shortest
+        matching names first.
+        """
+        tries = self._snapshot.autocomplete_tries
+        kinds = [kind] if kind else ["pokemon", "move"]
+
+        matches = []
+        for name in kinds:
+            trie = tries[name]
+            matches.extend((length, order, idx, trie) for order, (length, idx) in
+                           enumerate(trie.lookup(query)[:limit]))
+        matches.sort(key=lambda m: (m[0], m[1]))
+        return [trie.payloads[idx] for _, _, idx, trie in matches[:limit]]
+
+    def query_pokemon(
+        self,
+        types: Optional[Sequence[str]] = None,
+        attack: StatRange = (None, None),
+        defense: StatRange = (None, None),
+        stamina: StatRange = (None, None),
+        number: StatRange = (None, None),
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        within: Optional[Sequence[Dict]] = None,
+    ) -> List[Dict]:
+        """
+        Filter and sort Pokémon with vectorized masks over the stat store
+
+        If `within` is given (e.g. search results), only those Pokémon are
+        considered and, without sort_by, their order is kept.
+        """
+        store = self._snapshot.stat_store
+        rows = store.query(
+            types=types, attack=attack, defense=defense, stamina=stamina,
+            number=number, sort_by=sort_by, descending=descending
+        )
+
+        if within is None:
+            return store.rows_to_records(rows)
+
+        if sort_by is None:
+            matched = set(store.pokedex_number[rows].tolist())
+            return [p for p in within if p.get("pokedex_number") in matched]
+
+        wanted = np.array([p.get("pokedex_number", 0) for p in within], dtype=np.int32)
+        rows = rows[np.isin(store.pokedex_number[rows], wanted)]
+        return store.rows_to_records(rows)
 
     def get_move_by_id(self, move_id: str) -> Optional[Dict]:
         """Get move data by move_id"""
-        for move in self.moves:
-            if move.get("move_id") == move_id:
-                return move
-        return None
+        return self._snapshot.move_by_id.get(move_id)
 
     def get_pokemon_moves(self, pokemon_id: int) -> Dict[str, List[Dict]]:
         """Get all moves for a Pokémon"""
-        fast_moves = []
-        charged_moves = []
-
-        for pm in self.pokemon_moves:
-            if pm.get("pokemon_id") == pokemon_id:
-                move_data = self.get_move_by_id(pm.get("move_id"))
-                if move_data:
-                    if pm.get("category") == "fast":
-                        fast_moves.append(move_data)
-                    elif pm.get("category") == "charged":
-                        charged_moves.append(move_data)
+        moves = self._snapshot.moves_by_pokemon.get(pokemon_id)
+        if moves is None:
+            return {"fast": [], "charged": []}
 
+        # Return copies so callers can't mutate the shared index
         return {
-            "fast": fast_moves,
-            "charged": charged_moves
+            "fast": list(moves["fast"]),
+            "charged": list(moves["charged"])
         }
 
-    def get_current_season(self) -> Optional[str]:
-        """Get current season_id based on today's date"""
+    def get_current_season(self, on_date: Optional[date] = None) -> Optional[str]:
+        """Get current season_id based on today's date (or the given date)"""
+        if on_date is not None:
+            return self._snapshot.season_at(on_date)
+        return self._current_season(self._snapshot)
+
+    def _current_season(self, snapshot: PokedexSnapshot) -> Optional[str]:
         today = datetime.now().date()
 
-        for tier in self.seasonal_tiers:
-            start = datetime.fromisoformat(tier.get("start_date")).date()
-            end = datetime.fromisoformat(tier.get("end_date")).date()
-            if start <= today <= end:
-                return tier.get("season_id")
+        cached = self._season_cache.get(snapshot.version)
+        if cached is not None and cached[0] <= today <= cached[1]:
+            return cached[2]
 
-        return None
+        season_id = snapshot.season_at(today)
+        first, last = snapshot.season_validity(today)
+        self._season_cache[snapshot.version] = (first, last, season_id)
+        return season_id
 
     def get_seasonal_tier(self, pokemon_id: int, season_id: Optional[str] = None) -> Optional[Dict]:
         """Get seasonal tier info for a Pokémon"""
+        snapshot = self._snapshot
         if season_id is None:
-            season_id = self.get_current_season()
+            season_id = self._current_season(snapshot)
 
         if season_id is None:
             return None
 
-        for tier in self.seasonal_tiers:
-            if tier.get("season_id") == season_id and tier.get("pokemon_id") == pokemon_id:
-                return tier
-
-        return None
+        return snapshot.tier_by_season_pokemon.get((season_id, pokemon_id))
 
     def get_raid_counters(self, boss_id: int, season_id: Optional[str] = None) -> Optional[Dict]:
         """Get raid counter teams for a boss"""
+        snapshot = self._snapshot
         if season_id is None:
-            season_id = self.get_current_season()
+            season_id = self._current_season(snapshot)
 
-        for counter in self.raid_counters:
+        for counter in snapshot.raid_counters:
             if counter.get("boss_pokemon_id") == boss_id:
                 # Match season_id or use general counters (season_id = null)
                 if counter.get("season_id") == season_id or counter.get("season_id") is None:
@@ -134,7 +434,8 @@ class PokedexDataLoader:
 
     def get_top_attackers(self, type_filter: Optional[str] = None, min_tier: str = "A") -> List[Dict]:
         """Get top raid attackers for current season"""
-        season_id = self.get_current_season()
+        snapshot = self._snapshot
+        season_id = self._current_season(snapshot)
         if season_id is None:
             return []
 
@@ -142,10 +443,7 @@ class PokedexDataLoader:
         min_tier_value = tier_order.get(min_tier, 2)
 
         attackers = []
-        for tier in self.seasonal_tiers:
-            if tier.get("season_id") != season_id:
-                continue
-
+        for tier in snapshot.tiers_by_season.get(season_id, []):
             raid_attack_tier = tier.get("raid_attack_tier", "NONE")
             tier_value = tier_order.get(raid_attack_tier, 5)
 
@@ -153,7 +451,7 @@ class PokedexDataLoader:
                 continue
 
             pokemon_id = tier.get("pokemon_id")
-            pokemon = self.get_pokemon_by_id(pokemon_id)
+            pokemon = snapshot.pokemon_by_id.get(pokemon_id)
 
             if pokemon is None:
                 continue
@@ -175,9 +473,10 @@ class PokedexDataLoader:
 
     def get_pvp_party_rankings(self, league: str = "Great", limit: int = 20) -> Optional[Dict]:
         """Get PvP party rankings for a specific league"""
-        season_id = self.get_current_season()
+        snapshot = self._snapshot
+        season_id = self._current_season(snapshot)
 
-        for ranking_data in self.pvp_party_rankings:
+        for ranking_data in snapshot.pvp_party_rankings:
             if ranking_data.get("league") == league:
                 # Check if it matches current season or is a general ranking
                 if ranking_data.get("season_id") == season_id or ranking_data.get("season_id") is None:
@@ -190,9 +489,14 @@ class PokedexDataLoader:
 
         return None
 
-    def reload_data(self):
-        """Reload all JSON data files"""
-        self.load_all_data()
+    def reload_data(self) -> PokedexSnapshot:
+        """
+        Reload all JSON data files
+
+        The new snapshot is built off to the side while requests keep reading
+        the old one, then published with a single reference swap.
+        """
+        return self.load_all_data()
 
 
 # Global instance
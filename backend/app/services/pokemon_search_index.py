@@ -0,0 +1,229 @@
+"""
+Pokédex Name Search Indexes
+N-gram postings over English/Korean names plus a Hangul initial-consonant
+(chosung) index, so name search doesn't scan every species per request,
+and prefix tries with bounded top-k results for autocomplete
+"""
+
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+
+# Initial consonants in Unicode syllable order (compatibility jamo)
+CHOSUNG = (
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+)
+_CHOSUNG_SET = frozenset(CHOSUNG)
+_HANGUL_FIRST = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_SYLLABLES_PER_CHOSUNG = 21 * 28
+
+# Postings are kept for every gram up to this length; longer queries
+# intersect their trigrams and verify the candidates
+MAX_GRAM = 3
+
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_INFIX = 2
+
+
+def to_chosung(text: str) -> str:
+    """Replace every Hangul syllable by its initial consonant (피카츄 -> ㅍㅋㅊ)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+            chars.append(CHOSUNG[(code - _HANGUL_FIRST) // _SYLLABLES_PER_CHOSUNG])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def is_chosung_query(query: str) -> bool:
+    """True if the query is made only of initial consonants (and spaces)"""
+    stripped = query.replace(" ", "")
+    return bool(stripped) and all(ch in _CHOSUNG_SET for ch in stripped)
+
+
+class _GramIndex:
+    """Gram -> row ids postings over one or more keys per row"""
+
+    def __init__(self, keys_per_row: Sequence[Tuple[str, ...]]):
+        self.keys_per_row = keys_per_row
+        # gram -> {row: best rank of that gram within the row's keys}
+        gram_ranks: Dict[str, Dict[int, int]] = {}
+        for row, keys in enumerate(keys_per_row):
+            for key in keys:
+                for n in range(1, MAX_GRAM + 1):
+                    for i in range(len(key) - n + 1):
+                        gram = key[i:i + n]
+                        if i > 0:
+                            rank = RANK_INFIX
+                        elif n == len(key):
+                            rank = RANK_EXACT
+                        else:
+                            rank = RANK_PREFIX
+                        rows = gram_ranks.setdefault(gram, {})
+                        if rank < rows.get(row, RANK_INFIX + 1):
+                            rows[row] = rank
+
+        self.postings: Dict[str, FrozenSet[int]] = {g: frozenset(rows) for g, rows in gram_ranks.items()}
+        # Short queries are answered straight from pre-ranked postings
+        self.ranked: Dict[str, Tuple[int, ...]] = {
+            gram: tuple(sorted(rows, key=lambda row, rows=rows: (rows[row], row)))
+            for gram, rows in gram_ranks.items()
+        }
+
+    def candidates(self, query: str) -> FrozenSet[int]:
+        if len(query) <= MAX_GRAM:
+            # Postings for short grams are exact, no verification needed
+            return self.postings.get(query, frozenset())
+
+        gram_sets = []
+        for i in range(len(query) - MAX_GRAM + 1):
+            rows = self.postings.get(query[i:i + MAX_GRAM])
+            if not rows:
+                return frozenset()
+            gram_sets.append(rows)
+        gram_sets.sort(key=len)
+        return frozenset.intersection(*gram_sets)
+
+    def match(self, query: str) -> Tuple[int, ...]:
+        """Rows with a key containing the query, best ranked first"""
+        if len(query) <= MAX_GRAM:
+            return self.ranked.get(query, ())
+        return tuple(row for _, row in sorted(self._rank(query, self.candidates(query))))
+
+    def _rank(self, query: str, rows) -> List[Tuple[int, int]]:
+        """(rank, row) for every candidate row with a key containing the query"""
+        matches = []
+        for row in rows:
+            best = None
+            for key in self.keys_per_row[row]:
+                if key == query:
+                    best = RANK_EXACT
+                    break
+                if key.startswith(query):
+                    best = RANK_PREFIX
+                elif best is None and query in key:
+                    best = RANK_INFIX
+            if best is not None:
+                matches.append((best, row))
+        return matches
+
+
+class NameSearchIndex:
+    """
+    Search index over Pokémon records
+
+    Results are ranked exact > prefix > infix, then by data file order.
+    """
+
+    def __init__(self, records: Sequence[Dict]):
+        self.records: Tuple[Dict, ...] = tuple(records)
+
+        names = []
+        chosung_names = []
+        for record in self.records:
+            name_en = record.get("name_en", "").lower()
+            name_ko = record.get("name_ko", "").lower()
+            names.append((name_en, name_ko))
+            chosung_names.append((to_chosung(name_ko),))
+
+        self._names = _GramIndex(names)
+        self._chosung = _GramIndex(chosung_names)
+
+    def search(self, query: str) -> List[Dict]:
+        query = query.lower()
+        if not query:
+            return list(self.records)
+
+        index = self._chosung if is_chosung_query(query) else self._names
+        records = self.records
+        return [records[row] for row in index.match(query)]
+
+
+class PrefixTrie:
+    """
+    Character trie over entry names for autocomplete
+
+    Every node keeps only its best `top_k` entries (shortest matching name
+    first, then insertion order), so a lookup is one walk down the query and
+    never visits the subtree.
+    """
+
+    def __init__(self, entries: Sequence[Tuple[Sequence[str], Dict]], top_k: int = 10):
+        """entries: (names, payload) pairs, inserted in priority order"""
+        self.top_k = top_k
+        self.payloads: Tuple[Dict, ...] = tuple(payload for _, payload in entries)
+
+        # node = [children by char, [(name length, entry index), ...]]
+        self._root: list = [{}, []]
+        for idx, (names, _) in enumerate(entries):
+            for name in names:
+                key = name.lower()
+                node = self._root
+                for ch in key:
+                    node = node[0].setdefault(ch, [{}, []])
+                    node[1].append((len(key), idx))
+
+        self._finalize(self._root)
+
+    def _finalize(self, root: list):
+        """Dedupe, rank and cut every node's entries down to top_k"""
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            best: Dict[int, int] = {}
+            for length, idx in node[1]:
+                if length < best.get(idx, length + 1):
+                    best[idx] = length
+            node[1] = tuple(sorted((length, idx) for idx, length in best.items())[:self.top_k])
+            stack.extend(node[0].values())
+
+    def lookup(self, prefix: str) -> Tuple[Tuple[int, int], ...]:
+        """(name length, entry index) of the best entries starting with prefix"""
+        node = self._root
+        for ch in prefix.lower():
+            node = node[0].get(ch)
+            if node is None:
+                return ()
+        return node[1] if node is not self._root else ()
+
+
+def build_pokemon_trie(records: Sequence[Dict], top_k: int = 10) -> PrefixTrie:
+    entries = []
+    for record in records:
+        name_ko = record.get("name_ko", "")
+        entries.append((
+            (record.get("name_en", ""), name_ko, to_chosung(name_ko)),
+            {
+                "kind": "pokemon",
+                "pokemon_id": record.get("pokedex_number"),
+                "move_id": None,
+                "name_en": record.get("name_en", ""),
+                "name_ko": name_ko,
+                "sprite_url": record.get("sprite_url") or record.get("image_url"),
+                "type": None,
+            },
+        ))
+    return PrefixTrie(entries, top_k=top_k)
+
+
+def build_move_trie(moves: Sequence[Dict], top_k: int = 10) -> PrefixTrie:
+    entries = []
+    for move in moves:
+        name_ko = move.get("name_ko", "")
+        entries.append((
+            (move.get("name_en", ""), name_ko, to_chosung(name_ko)),
+            {
+                "kind": "move",
+                "pokemon_id": None,
+                "move_id": move.get("move_id"),
+                "name_en": move.get("name_en", ""),
+                "name_ko": name_ko,
+                "sprite_url": None,
+                "type": move.get("type"),
+            },
+        ))
+    return PrefixTrie(entries, top_k=top_k)
@@ -0,0 +1,122 @@
+"""
+Pokémon Stat Store
+Columnar NumPy view of pokemon_base for vectorized whole-dex queries
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+SORT_KEYS = ("number", "attack", "defense", "stamina", "stat_product")
+
+StatRange = Tuple[Optional[int], Optional[int]]
+
+
+class PokemonStatStore:
+    """
+    Base stats of every species as parallel NumPy arrays
+
+    Row i of every column describes records[i]. Types are stored as a bitmask
+    so type filters are a single vectorized AND.
+    """
+
+    def __init__(self, records: Sequence[Dict]):
+        self.records: Tuple[Dict, ...] = tuple(records)
+
+        # Type names are matched case-insensitively ("fire" finds "Fire")
+        type_names = sorted({t.lower() for r in self.records for t in r.get("types", [])})
+        if len(type_names) > 63:
+            raise ValueError(f"Too many distinct types for a 64-bit mask: {len(type_names)}")
+        self.type_bits: Dict[str, int] = {name: 1 << i for i, name in enumerate(type_names)}
+
+        self.pokedex_number = np.array([r.get("pokedex_number", 0) for r in self.records], dtype=np.int32)
+        self.base_attack = np.array([r.get("base_attack", 0) for r in self.records], dtype=np.int32)
+        self.base_defense = np.array([r.get("base_defense", 0) for r in self.records], dtype=np.int32)
+        self.base_stamina = np.array([r.get("base_stamina", 0) for r in self.records], dtype=np.int32)
+        self.type_mask = np.array(
+            [self._mask_for(r.get("types", [])) for r in self.records], dtype=np.uint64
+        )
+        self.stat_product = (
+            self.base_attack.astype(np.float64) * self.base_defense * self.base_stamina
+        )
+
+        for column in (self.pokedex_number, self.base_attack, self.base_defense,
+                       self.base_stamina, self.type_mask, self.stat_product):
+            column.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _mask_for(self, types: Sequence[str]) -> int:
+        mask = 0
+        for name in types:
+            mask |= self.type_bits.get(name.lower(), 0)
+        return mask
+
+    def query(
+        self,
+        types: Optional[Sequence[str]] = None,
+        attack: StatRange = (None, None),
+        defense: StatRange = (None, None),
+        stamina: StatRange = (None, None),
+        number: StatRange = (None, None),
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+    ) -> np.ndarray:
+        """
+        Return row indices matching every filter
+
+        - types: every listed type must be present, any case (unknown types match nothing)
+        - attack/defense/stamina/number: inclusive (min, max), None = unbounded
+        - sort_by: one of SORT_KEYS; None keeps data file order
+        """
+        mask = np.ones(len(self.records), dtype=bool)
+
+        if types:
+            wanted = 0
+            for name in types:
+                bit = self.type_bits.get(name.lower())
+                if bit is None:
+                    return np.empty(0, dtype=np.intp)
+                wanted |= bit
+            wanted = np.uint64(wanted)
+            mask &= (self.type_mask & wanted) == wanted
+
+        for column, (low, high) in (
+            (self.base_attack, attack),
+            (self.base_defense, defense),
+            (self.base_stamina, stamina),
+            (self.pokedex_number, number),
+        ):
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+
+        rows = np.flatnonzero(mask)
+
+        if sort_by is not None:
+            values = self._sort_column(sort_by)[rows]
+            # Stable sort so ties keep data file order
+            order = np.argsort(-values if descending else values, kind="stable")
+            rows = rows[order]
+
+        return rows
+
+    def _sort_column(self, sort_by: str) -> np.ndarray:
+        if sort_by == "number":
+            return self.pokedex_number
+        if sort_by == "attack":
+            return self.base_attack
+        if sort_by == "defense":
+            return self.base_defense
+        if sort_by == "stamina":
+            return self.base_stamina
+        if sort_by == "stat_product":
+            return self.stat_product
+        raise ValueError(f"Invalid sort key: {sort_by}. Must be one of: {', '.join(SORT_KEYS)}")
+
+    def rows_to_records(self, rows: np.ndarray) -> List[Dict]:
+        records = self.records
+        return [records[i] for i in rows.tolist()]
@@ -0,0 +1,233 @@
+"""
+PvP League Rank Service
+Ranks all 4096 IV combinations of a species under a league CP cap by
+stat product, fully vectorized over the CP grid
+
+Rank tables for the whole dex can be precomputed with
+build_pvp_rank_tables.py; they are memory-mapped at runtime so workers
+share them through the OS page cache instead of computing on request.
+"""
+
+import json
+import math
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.utils.cp_calculator import CPM_LEVELS, CPM_VALUES, cp_hp_grid
+
+
+LEAGUE_CP_CAPS = {
+    "Great": 1500,
+    "Ultra": 2500,
+    "Master": None,  # Uncapped
+}
+
+DEFAULT_LEVEL_CEILING = float(CPM_LEVELS[-1])
+
+# Precomputed tables: uint16 ranks shaped (species, league, atk, def, sta)
+# plus a JSON index describing the rows
+RANK_TABLE_FILENAME = "pvp_ranks.npy"
+RANK_INDEX_FILENAME = "pvp_ranks.json"
+RANK_TABLE_FORMAT_VERSION = 1
+
+
+class LeagueRankTable:
+    """
+    Best level, CP, stats and rank of every IV combination for one
+    (species, CP cap, level ceiling). Arrays are indexed [atk, def, sta].
+    """
+
+    def __init__(self, base_attack: int, base_defense: int, base_stamina: int,
+                 cp_cap: Optional[int], level_ceiling: float = DEFAULT_LEVEL_CEILING):
+        self.base_attack = base_attack
+        self.base_defense = base_defense
+        self.base_stamina = base_stamina
+        self.cp_cap = cp_cap
+        self.level_ceiling = level_ceiling
+
+        grid = cp_hp_grid(base_attack, base_defense, base_stamina)
+
+        # CP grows with level, so the levels under the cap form a prefix and
+        # the best level index is (number of fitting levels - 1)
+        fits = np.broadcast_to((CPM_LEVELS <= level_ceiling)[:, None, None, None], grid.cp.shape)
+        if cp_cap is not None:
+            fits = fits & (grid.cp <= cp_cap)
+        fit_count = fits.sum(axis=0)
+        self.valid = fit_count > 0
+        self.level_idx = np.maximum(fit_count - 1, 0).astype(np.uint8)
+
+        ivs = np.arange(16)
+        cpm = CPM_VALUES[self.level_idx]
+        self.cp = np.take_along_axis(grid.cp, self.level_idx[None, :, :, :].astype(np.intp), axis=0)[0]
+        attack = (base_attack + ivs)[:, None, None] * cpm
+        defense = (base_defense + ivs)[None, :, None] * cpm
+        hp = np.maximum(np.floor((base_stamina + ivs)[None, None, :] * cpm), 10)
+        self.stat_product = np.where(self.valid, attack * defense * hp, 0.0)
+
+        # Competition ranking: 1 + number of IVs with a strictly higher stat product
+        descending = np.sort(self.stat_product, axis=None)[::-1]
+        self.rank = (np.searchsorted(-descending, -self.stat_product, side="left") + 1).astype(np.uint16)
+
+        best = np.unravel_index(np.argmax(self.stat_product), self.stat_product.shape)
+        self.best_ivs = tuple(int(i) for i in best)
+        self.max_stat_product = float(self.stat_product[best])
+
+        for array in (self.valid, self.level_idx, self.cp, self.stat_product, self.rank):
+            array.flags.writeable = False
+
+    def lookup(self, attack_iv: int, defense_iv: int, stamina_iv: int) -> Dict:
+        """Rank and stats of one IV combination"""
+        i = (attack_iv, defense_iv, stamina_iv)
+        cpm = float(CPM_VALUES[self.level_idx[i]])
+        stat_product = float(self.stat_product[i])
+        return {
+            "rank": int(self.rank[i]),
+            "eligible": bool(self.valid[i]),
+            "level": float(CPM_LEVELS[self.level_idx[i]]),
+            "cp": int(self.cp[i]),
+            "attack": round((self.base_attack + attack_iv) * cpm, 2),
+            "defense": round((self.base_defense + defense_iv) * cpm, 2),
+            "hp": max(10, math.floor((self.base_stamina + stamina_iv) * cpm)),
+            "stat_product": round(stat_product),
+            "percent_of_best": round(stat_product / self.max_stat_product * 100, 2) if self.max_stat_product else 0.0,
+            "best_ivs": {
+                "attack_iv": self.best_ivs[0],
+                "defense_iv": self.best_ivs[1],
+                "stamina_iv": self.best_ivs[2],
+            },
+        }
+
+
+@lru_cache(maxsize=256)
+def league_rank_table(base_attack: int, base_defense: int, base_stamina: int,
+                      cp_cap: Optional[int], level_ceiling: float = DEFAULT_LEVEL_CEILING) -> LeagueRankTable:
+    """Memoized rank table per (species base stats, CP cap, level ceiling)"""
+    return LeagueRankTable(base_attack, base_defense, base_stamina, cp_cap, level_ceiling)
+
+
+def iv_league_stats(base_attack: int, base_defense: int, base_stamina: int,
+                    attack_iv: int, defense_iv: int, stamina_iv: int,
+                    cp_cap: Optional[int], level_ceiling: float = DEFAULT_LEVEL_CEILING) -> Dict:
+    """Best level under the cap and resulting stats for a single IV combination"""
+    attack = base_attack + attack_iv
+    defense = base_defense + defense_iv
+    stamina = base_stamina + stamina_iv
+
+    # Same operation order as calculate_cp so CPs match the grid exactly
+    cp = np.maximum(np.floor(attack * math.sqrt(defense) * math.sqrt(stamina) * CPM_VALUES * CPM_VALUES / 10), 10)
+    fits = CPM_LEVELS <= level_ceiling
+    if cp_cap is not None:
+        fits &= cp <= cp_cap
+    fit_count = int(fits.sum())
+    idx = max(fit_count - 1, 0)
+
+    cpm = float(CPM_VALUES[idx])
+    hp = max(10, math.floor(stamina * cpm))
+    stat_product = (attack * cpm) * (defense * cpm) * hp if fit_count else 0.0
+    return {
+        "eligible": fit_count > 0,
+        "level": float(CPM_LEVELS[idx]),
+        "cp": int(cp[idx]),
+        "attack": round(attack * cpm, 2),
+        "defense": round(defense * cpm, 2),
+        "hp": hp,
+        "stat_product": stat_product,
+    }
+
+
+class PrecomputedRankTables:
+    """Memory-mapped rank tables written by build_pvp_rank_tables.py"""
+
+    def __init__(self, data_dir: Path):
+        with open(data_dir / RANK_INDEX_FILENAME, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("format_version") != RANK_TABLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported rank table format: {index.get('format_version')}")
+
+        self.level_ceiling = float(index["level_ceiling"])
+        self.leagues = {league: i for i, league in enumerate(index["leagues"])}
+        self.data_version = index.get("data_version")
+
+        # pokedex_number -> (row, base stats, best per league)
+        self.rows: Dict[int, Tuple[int, Tuple[int, int, int], list]] = {}
+        for row, species in enumerate(index["species"]):
+            self.rows.setdefault(
+                species["pokedex_number"],
+                (row, tuple(species["base_stats"]), species["best"])
+            )
+
+        self.ranks = np.load(data_dir / RANK_TABLE_FILENAME, mmap_mode="r")
+        expected = (len(index["species"]), len(self.leagues), 16, 16, 16)
+        if self.ranks.shape != expected:
+            raise ValueError(f"Rank table shape {self.ranks.shape} does not match index {expected}")
+
+    def lookup(self, pokemon: Dict, league: str, level_ceiling: float,
+               attack_iv: int, defense_iv: int, stamina_iv: int) -> Optional[Dict]:
+        """Rank from the mapped table, or None if this query isn't covered"""
+        entry = self.rows.get(pokemon.get("pokedex_number"))
+        if entry is None or level_ceiling != self.level_ceiling or league not in self.leagues:
+            return None
+
+        row, base_stats, best = entry
+        if base_stats != (pokemon["base_attack"], pokemon["base_defense"], pokemon["base_stamina"]):
+            # Base stats changed since the tables were built
+            return None
+
+        league_idx = self.leagues[league]
+        best_atk, best_def, best_sta, max_stat_product = best[league_idx]
+        stats = iv_league_stats(*base_stats, attack_iv, defense_iv, stamina_iv,
+                                LEAGUE_CP_CAPS[league], level_ceiling)
+        stat_product = stats["stat_product"]
+        stats.update({
+            "rank": int(self.ranks[row, league_idx, attack_iv, defense_iv, stamina_iv]),
+            "stat_product": round(stat_product),
+            "percent_of_best": round(stat_product / max_stat_product * 100, 2) if max_stat_product else 0.0,
+            "best_ivs": {"attack_iv": best_atk, "defense_iv": best_def, "stamina_iv": best_sta},
+        })
+        return stats
+
+
+_precomputed: Optional[PrecomputedRankTables] = None
+_precomputed_loaded = False
+_precomputed_lock = threading.Lock()
+
+
+def get_precomputed_tables(data_dir: str = "data") -> Optional[PrecomputedRankTables]:
+    """Load the mapped rank tables once per process; None if they weren't built"""
+    global _precomputed, _precomputed_loaded
+    if not _precomputed_loaded:
+        with _precomputed_lock:
+            if not _precomputed_loaded:
+                path = Path(data_dir)
+                if (path / RANK_INDEX_FILENAME).exists() and (path / RANK_TABLE_FILENAME).exists():
+                    try:
+                        _precomputed = PrecomputedRankTables(path)
+                    except Exception as e:
+                        print(f"Error loading PvP rank tables from {path}: {e}")
+                _precomputed_loaded = True
+    return _precomputed
+
+
+def league_rank(pokemon: Dict, league: str, attack_iv: int, defense_iv: int, stamina_iv: int,
+                level_ceiling: float = DEFAULT_LEVEL_CEILING) -> Dict:
+    """
+    Rank and stats of one IV combination in a league
+
+    Served from the precomputed tables when they cover the query, otherwise
+    from a memoized in-process table.
+    """
+    precomputed = get_precomputed_tables()
+    if precomputed is not None:
+        result = precomputed.lookup(pokemon, league, level_ceiling, attack_iv, defense_iv, stamina_iv)
+        if result is not None:
+            return result
+
+    table = league_rank_table(
+        pokemon["base_attack"], pokemon["base_defense"], pokemon["base_stamina"],
+        LEAGUE_CP_CAPS[league], level_ceiling
+    )
+    return table.lookup(attack_iv, defense_iv, stamina_iv)
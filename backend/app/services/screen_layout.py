@@ -0,0 +1,122 @@
+"""
+Pokémon Screen Layout
+Locates the CP, name and HP regions of a Pokémon detail screen so OCR only
+has to read small crops instead of the whole screenshot
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class Region(NamedTuple):
+    """Box as fractions of the screenshot height (top/bottom) and width (left/right)"""
+    top: float
+    bottom: float
+    left: float
+    right: float
+
+
+# Default positions on a portrait Pokémon detail screen
+CP_REGION = Region(0.03, 0.13, 0.22, 0.78)
+NAME_REGION = Region(0.40, 0.49, 0.08, 0.92)
+HP_REGION = Region(0.49, 0.56, 0.25, 0.75)
+
+# Anchor: the green HP bar between the name and the HP text. Its row is
+# searched inside this band and the name/HP boxes are placed relative to it.
+HP_BAR_SEARCH_BAND = (0.35, 0.70)
+HP_BAR_COLUMNS = (0.30, 0.70)
+HP_BAR_MIN_FILL = 0.5  # Share of green pixels for a row to count as the bar
+HP_BAR_HSV_LOW = np.array([35, 80, 120], dtype=np.uint8)
+HP_BAR_HSV_HIGH = np.array([90, 255, 255], dtype=np.uint8)
+NAME_ABOVE_BAR = (0.075, 0.008)  # (top, bottom) offsets above the bar
+HP_TEXT_BELOW_BAR = (0.004, 0.045)  # (top, bottom) offsets below the bar
+
+# Crops are scaled so text lines are about this tall before thresholding
+OCR_CROP_HEIGHT = 96
+
+Box = Tuple[int, int, int, int]  # (y0, y1, x0, x1) in pixels
+
+
+class ScreenLayout(NamedTuple):
+    cp: Box
+    name: Box
+    hp: Box
+    anchored: bool  # True if name/HP were placed from the detected HP bar
+
+
+def _to_box(region: Region, height: int, width: int) -> Box:
+    y0 = max(0, int(region.top * height))
+    y1 = min(height, int(np.ceil(region.bottom * height)))
+    x0 = max(0, int(region.left * width))
+    x1 = min(width, int(np.ceil(region.right * width)))
+    return y0, y1, x0, x1
+
+
+def find_hp_bar(image: np.ndarray) -> Optional[float]:
+    """Row of the green HP bar as a fraction of the height, or None"""
+    height, width = image.shape[:2]
+    y0, y1 = int(HP_BAR_SEARCH_BAND[0] * height), int(HP_BAR_SEARCH_BAND[1] * height)
+    x0, x1 = int(HP_BAR_COLUMNS[0] * width), int(HP_BAR_COLUMNS[1] * width)
+    band = image[y0:y1, x0:x1]
+    if band.size == 0:
+        return None
+
+    hsv = cv2.cvtColor(band, cv2.COLOR_BGR2HSV)
+    fill = cv2.inRange(hsv, HP_BAR_HSV_LOW, HP_BAR_HSV_HIGH).mean(axis=1) / 255
+    rows = np.flatnonzero(fill >= HP_BAR_MIN_FILL)
+    if not rows.size:
+        return None
+
+    # Take the first run of consecutive bar rows
+    breaks = np.flatnonzero(np.diff(rows) > 1)
+    run = rows[:breaks[0] + 1] if breaks.size else rows
+    return (y0 + (run[0] + run[-1]) / 2) / height
+
+
+def locate_regions(image: np.ndarray) -> ScreenLayout:
+    """Pixel boxes of the CP, name and HP text on a detail screen"""
+    height, width = image.shape[:2]
+    name, hp = NAME_REGION, HP_REGION
+
+    bar = find_hp_bar(image)
+    if bar is not None:
+        name = name._replace(top=bar - NAME_ABOVE_BAR[0], bottom=bar - NAME_ABOVE_BAR[1])
+        hp = hp._replace(top=bar + HP_TEXT_BELOW_BAR[0], bottom=bar + HP_TEXT_BELOW_BAR[1])
+
+    return ScreenLayout(
+        cp=_to_box(CP_REGION, height, width),
+        name=_to_box(name, height, width),
+        hp=_to_box(hp, height, width),
+        anchored=bar is not None,
+    )
+
+
+def binarize_crop(image: np.ndarray, box: Box) -> Optional[np.ndarray]:
+    """
+    Crop, scale and adaptively threshold one text region
+
+    Returns dark text on a white background (what Tesseract expects) or
+    None for an empty box.
+    """
+    y0, y1, x0, x1 = box
+    crop = image[y0:y1, x0:x1]
+    if crop.size == 0:
+        return None
+
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    scale = OCR_CROP_HEIGHT / gray.shape[0]
+    gray = cv2.resize(gray, None, fx=scale, fy=scale,
+                      interpolation=cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA)
+
+    # The border is background; if text sits further above it than below
+    # (white CP over the background), invert so text is dark
+    border = np.concatenate((gray[0], gray[-1], gray[:, 0], gray[:, -1]))
+    background = np.median(border)
+    low, high = np.percentile(gray, (1, 99))
+    if high - background > background - low:
+        gray = cv2.bitwise_not(gray)
+
+    block = (OCR_CROP_HEIGHT // 2) | 1
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block, 10)
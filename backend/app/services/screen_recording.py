@@ -0,0 +1,118 @@
+"""
+Screen Recording Service
+Turns a recording of someone swiping through their Pokémon into one frame
+per detail screen, decoding lazily so memory stays flat however long the
+video is
+
+Frames are sampled a few times per second and compared by their CP, name
+and HP text strips, which the Pokémon's idle animation never touches. A
+frame is kept once its strip has held still since the previous sample (the
+swipe has settled) and differs from the last kept frame's, so an aborted
+swipe back to the same Pokémon is not analyzed twice.
+"""
+
+import logging
+from typing import Iterator, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+from app.services.screen_layout import locate_regions
+
+logger = logging.getLogger(__name__)
+
+
+SAMPLE_FPS = 4  # Frames inspected per second of video
+TEXT_STRIP_WIDTH = 192  # CP/name/HP crops are resized to this width
+TEXT_BLOCK = 16  # Side of the blocks compared between text strips
+TEXT_CHANGE_THRESHOLD = 20.0  # Mean gray-level change of any block that means a new Pokémon
+FRAME_JPEG_QUALITY = 95
+
+
+class RecordedFrame(NamedTuple):
+    index: int  # Frame number in the video
+    seconds: float
+    image: np.ndarray  # BGR
+
+
+class EncodedFrame(NamedTuple):
+    index: int
+    seconds: float
+    data: bytes  # JPEG
+
+
+def _text_strip(image: np.ndarray) -> np.ndarray:
+    """CP, name and HP crops, resized to one width and stacked (grayscale)"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    layout = locate_regions(image)
+    strips = []
+    for y0, y1, x0, x1 in (layout.cp, layout.name, layout.hp):
+        crop = gray[y0:y1, x0:x1]
+        if crop.size:
+            height = max(TEXT_BLOCK, round(crop.shape[0] * TEXT_STRIP_WIDTH / crop.shape[1]))
+            strips.append(cv2.resize(crop, (TEXT_STRIP_WIDTH, height), interpolation=cv2.INTER_AREA))
+    return np.vstack(strips) if strips else np.zeros((TEXT_BLOCK, TEXT_STRIP_WIDTH), dtype=np.uint8)
+
+
+def text_changed(a: np.ndarray, b: np.ndarray) -> bool:
+    """
+    True if two text strips differ somewhere by more than compression
+    noise; compares block means so a single changed digit is enough
+    """
+    if a.shape != b.shape:
+        return True
+    diff = cv2.absdiff(a, b).astype(np.float32)
+    rows = diff.shape[0] // TEXT_BLOCK * TEXT_BLOCK
+    cols = diff.shape[1] // TEXT_BLOCK * TEXT_BLOCK
+    blocks = diff[:rows, :cols].reshape(rows // TEXT_BLOCK, TEXT_BLOCK, cols // TEXT_BLOCK, TEXT_BLOCK)
+    return float(blocks.mean(axis=(1, 3)).max()) > TEXT_CHANGE_THRESHOLD
+
+
+def iter_detail_frames(path: str, sample_fps: float = SAMPLE_FPS) -> Iterator[RecordedFrame]:
+    """
+    Yield one frame per distinct detail screen in a video file
+
+    Only one decoded frame is held at a time; skipped frames are grabbed
+    without being converted.
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError("Could not open the recording")
+
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        step = max(1, round(fps / sample_fps))
+
+        previous: Optional[np.ndarray] = None
+        kept: Optional[np.ndarray] = None
+        index = -1
+
+        while True:
+            index += 1
+            if index % step:
+                if not capture.grab():
+                    break
+                continue
+            ok, frame = capture.read()
+            if not ok:
+                break
+
+            text = _text_strip(frame)
+            settled = previous is not None and not text_changed(text, previous)
+            previous = text
+            if not settled or (kept is not None and not text_changed(text, kept)):
+                continue
+            kept = text
+            yield RecordedFrame(index, round(index / fps, 2), frame)
+    finally:
+        capture.release()
+
+
+def iter_encoded_frames(path: str, sample_fps: float = SAMPLE_FPS) -> Iterator[EncodedFrame]:
+    """iter_detail_frames with each image JPEG-encoded, ready for the analysis engine"""
+    for frame in iter_detail_frames(path, sample_fps):
+        ok, buffer = cv2.imencode(".jpg", frame.image, [cv2.IMWRITE_JPEG_QUALITY, FRAME_JPEG_QUALITY])
+        if not ok:
+            logger.warning(f"Could not encode frame {frame.index}")
+            continue
+        yield EncodedFrame(frame.index, frame.seconds, buffer.tobytes())
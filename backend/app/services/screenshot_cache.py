@@ -0,0 +1,231 @@
+"""
+Screenshot Cache Service
+Recognizes repeat uploads of a screenshot (byte-identical or re-compressed)
+so they return the stored analysis instead of running OCR again
+
+Screenshots are keyed by the SHA-256 of their bytes and by two 64-bit
+dHashes: one of the whole frame and one of the CP/name/HP text regions.
+Recent entries live in a memory tier that evicts the least recently used
+and expires entries a fixed time after they are stored; everything is
+persisted in screenshot_fingerprints, where the frame hash is split into
+four 16-bit bands so a Hamming search is an indexed lookup (pigeonhole:
+within 3 bits, at least one band matches exactly).
+
+A SHA-256 hit is the same file. A perceptual hit is only a candidate:
+9x8 hashes can't see a single CP digit, so callers must confirm the
+numbers before reusing the stored analysis.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import cv2
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.screenshot_fingerprint import ScreenshotFingerprint
+from app.services.screen_layout import locate_regions
+
+logger = logging.getLogger(__name__)
+
+
+HASH_BANDS = 4
+HASH_BAND_BITS = 64 // HASH_BANDS
+MAX_HASH_DISTANCE = HASH_BANDS - 1  # Largest distance the band index can guarantee
+
+# Text regions are resized to this width and stacked before hashing
+TEXT_STRIP_WIDTH = 64
+
+
+class Fingerprint(NamedTuple):
+    sha256: str
+    frame_hash: int  # Unsigned 64-bit dHash
+    text_hash: int
+
+
+def dhash(gray: np.ndarray) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9x8 thumbnail"""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def hash_bands(value: int):
+    mask = (1 << HASH_BAND_BITS) - 1
+    return tuple((value >> (HASH_BAND_BITS * i)) & mask for i in range(HASH_BANDS))
+
+
+def to_signed64(value: int) -> int:
+    """Store unsigned 64-bit hashes in a signed BIGINT column"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def fingerprint(data: bytes) -> Optional[Fingerprint]:
+    """
+    Fingerprint an encoded screenshot, or None if it can't be decoded
+
+    Decodes at quarter resolution, which is plenty for 9x8 hashes and much
+    cheaper than a full decode.
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_REDUCED_COLOR_4)
+    if image is None:
+        return None
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    layout = locate_regions(image)
+    strips = []
+    for y0, y1, x0, x1 in (layout.cp, layout.name, layout.hp):
+        crop = gray[y0:y1, x0:x1]
+        if crop.size:
+            height = max(1, round(crop.shape[0] * TEXT_STRIP_WIDTH / crop.shape[1]))
+            strips.append(cv2.resize(crop, (TEXT_STRIP_WIDTH, height), interpolation=cv2.INTER_AREA))
+    text_hash = dhash(np.vstack(strips)) if strips else 0
+
+    return Fingerprint(sha256=sha256, frame_hash=dhash(gray), text_hash=text_hash)
+
+
+class CacheMatch(NamedTuple):
+    analysis_id: int
+    exact: bool  # Same bytes (SHA-256) rather than a perceptual match
+
+
+class _MemoryEntry(NamedTuple):
+    analysis_id: int
+    frame_hash: int
+    text_hash: int
+    expires_at: float
+
+
+class ScreenshotCache:
+    """Two-tier (memory LRU with TTL, then database) screenshot -> analysis_id cache"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 max_distance: int = MAX_HASH_DISTANCE):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = min(max_distance, MAX_HASH_DISTANCE)
+        self._entries: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _matches(self, fp: Fingerprint, frame_hash: int, text_hash: int) -> bool:
+        return (hamming(fp.frame_hash, frame_hash) <= self.max_distance
+                and hamming(fp.text_hash, text_hash) <= self.max_distance)
+
+    def _lookup_memory(self, fp: Fingerprint) -> Optional[CacheMatch]:
+        now = time.monotonic()
+        with self._lock:
+            # Hits reorder entries, so expiry can't stop at the first live
+            # one; the perceptual scan below visits every entry anyway
+            expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+
+            entry = self._entries.get(fp.sha256)
+            if entry is not None:
+                self._entries.move_to_end(fp.sha256)
+                return CacheMatch(entry.analysis_id, exact=True)
+            for key, candidate in self._entries.items():
+                if self._matches(fp, candidate.frame_hash, candidate.text_hash):
+                    self._entries.move_to_end(key)
+                    return CacheMatch(candidate.analysis_id, exact=False)
+            return None
+
+    def _remember(self, fp: Fingerprint, analysis_id: int):
+        with self._lock:
+            self._entries[fp.sha256] = _MemoryEntry(analysis_id, fp.frame_hash, fp.text_hash,
+                                                    time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(fp.sha256)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def lookup(self, db: Session, fp: Fingerprint) -> Optional[CacheMatch]:
+        """Analysis stored for this screenshot or a near-duplicate, if any"""
+        match = self._lookup_memory(fp)
+
+        if match is None:
+            row = db.query(ScreenshotFingerprint).filter(ScreenshotFingerprint.sha256 == fp.sha256).first()
+            exact = row is not None
+            if row is None:
+                bands = hash_bands(fp.frame_hash)
+                candidates = (
+                    db.query(ScreenshotFingerprint)
+                    .filter(or_(*(getattr(ScreenshotFingerprint, f"band{i}") == band
+                                  for i, band in enumerate(bands))))
+                    .order_by(ScreenshotFingerprint.id.desc())
+                    .limit(100)
+                    .all()
+                )
+                row = next((c for c in candidates
+                            if self._matches(fp, to_unsigned64(c.frame_hash), to_unsigned64(c.text_hash))), None)
+            if row is not None:
+                match = CacheMatch(row.analysis_id, exact=exact)
+                if exact:
+                    self._remember(fp, row.analysis_id)
+
+        with self._lock:
+            if match is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return match
+
+    def add(self, db: Session, fp: Fingerprint, analysis_id: int) -> ScreenshotFingerprint:
+        """Stage a fingerprint row for a new analysis (caller commits)"""
+        self._remember(fp, analysis_id)
+        bands = hash_bands(fp.frame_hash)
+        row = ScreenshotFingerprint(
+            analysis_id=analysis_id,
+            sha256=fp.sha256,
+            frame_hash=to_signed64(fp.frame_hash),
+            text_hash=to_signed64(fp.text_hash),
+            **{f"band{i}": band for i, band in enumerate(bands)},
+        )
+        db.add(row)
+        return row
+
+    def store(self, db: Session, fp: Fingerprint, analysis_id: int):
+        """
+        Persist a fingerprint for a just-saved analysis
+
+        Best effort: the analysis is already committed, so duplicates and
+        database errors are rolled back here instead of failing the request
+        """
+        try:
+            self.add(db, fp, analysis_id)
+            db.commit()
+        except IntegrityError:
+            # The same bytes were stored concurrently
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not store screenshot fingerprint for analysis {analysis_id}: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """(memory entries, hits, misses)"""
+        with self._lock:
+            return len(self._entries), self.hits, self.misses
+
+
+# Screenshot -> analysis cache for upload endpoints
+screenshot_cache = ScreenshotCache(max_entries=1024, ttl_seconds=3600)
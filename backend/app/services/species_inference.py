@@ -0,0 +1,176 @@
+"""
+Species Inference Service
+Recovers the species of a screenshot from its OCR'd CP/HP when the name
+could not be read, using an inverted index from (HP, level bucket) to the
+species' CP range there, then verifying the shortlist exactly
+"""
+
+import difflib
+import re
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.iv_solver import level_mask
+from app.utils.cp_calculator import CPM_LEVELS, CPM_VALUES, IV_VALUES, compute_cp_rows, compute_hp_table
+
+
+# Level indices per bucket (4 half levels = 2 levels)
+LEVEL_BUCKET_SIZE = 4
+LEVEL_BUCKETS = -(-len(CPM_LEVELS) // LEVEL_BUCKET_SIZE)
+
+# How many candidate species to return
+SPECIES_SHORTLIST_SIZE = 10
+
+# Weight of OCR name similarity vs. share of matching IV combinations
+NAME_SIMILARITY_WEIGHT = 0.6
+
+
+class SpeciesIndex:
+    """
+    Inverted index (HP, level bucket) -> species with the CP range they can
+    reach there
+
+    CP grows with attack and defense IVs, so the CP at atk = def = 0 and
+    atk = def = 15 bound every CP for a (species, level, stamina IV); a
+    species whose range misses the observed CP can't match it.
+    """
+
+    def __init__(self, records: Sequence[Dict]):
+        self.records = tuple(r for r in records if r.get("base_attack") and r.get("base_defense") and r.get("base_stamina"))
+        count = len(self.records)
+
+        base_attack = np.array([r["base_attack"] for r in self.records], dtype=np.float64)
+        base_defense = np.array([r["base_defense"] for r in self.records], dtype=np.float64)
+        base_stamina = np.array([r["base_stamina"] for r in self.records], dtype=np.float64)
+
+        # (species, level, stamina IV), same operation order as the CP grid
+        stamina = base_stamina[:, None] + IV_VALUES[None, :]
+        cpm = CPM_VALUES[None, :, None]
+        hp = np.maximum(np.floor(stamina[:, None, :] * cpm), 10).astype(np.int64)
+        sqrt_stamina = np.sqrt(stamina)[:, None, :]
+        cpm2 = cpm * cpm
+        low = (base_attack * np.sqrt(base_defense))[:, None, None] * sqrt_stamina
+        high = ((base_attack + 15) * np.sqrt(base_defense + 15))[:, None, None] * sqrt_stamina
+        cp_low = np.maximum(np.floor(low * cpm2 / 10), 10).astype(np.int32)
+        cp_high = np.maximum(np.floor(high * cpm2 / 10), 10).astype(np.int32)
+
+        # One row per (HP, bucket, species) holding the widest CP range
+        bucket = (np.arange(len(CPM_LEVELS)) // LEVEL_BUCKET_SIZE)[None, :, None]
+        species = np.arange(count)[:, None, None]
+        composite = ((hp * LEVEL_BUCKETS + bucket) * count + species).ravel()
+        order = np.argsort(composite, kind="stable")
+        composite = composite[order]
+        starts = np.flatnonzero(np.r_[True, composite[1:] != composite[:-1]])
+
+        self.keys = (composite[starts] // count).astype(np.int64)
+        self.species = (composite[starts] % count).astype(np.int32)
+        self.cp_low = np.minimum.reduceat(cp_low.ravel()[order], starts)
+        self.cp_high = np.maximum.reduceat(cp_high.ravel()[order], starts)
+
+    def feasible(self, cp: int, hp: int, levels: np.ndarray) -> np.ndarray:
+        """Row indices of species whose CP range covers cp at this HP in any allowed bucket"""
+        buckets = np.unique(np.flatnonzero(levels) // LEVEL_BUCKET_SIZE)
+        keys = hp * LEVEL_BUCKETS + buckets
+        lo = np.searchsorted(self.keys, keys, side="left")
+        hi = np.searchsorted(self.keys, keys, side="right")
+        rows = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi)]) if len(keys) else np.array([], dtype=np.int64)
+        rows = rows[(self.cp_low[rows] <= cp) & (self.cp_high[rows] >= cp)]
+        return np.unique(self.species[rows])
+
+
+def count_matches(pokemon: Dict, cp: int, hp: int, levels: np.ndarray) -> int:
+    """Exact number of (level, atk, def, sta) giving this CP/HP"""
+    hp_ok = (compute_hp_table(pokemon["base_stamina"]) == hp) & levels[:, None]
+    rows = np.flatnonzero(hp_ok.any(axis=1))
+    if not rows.size:
+        return 0
+    cps = compute_cp_rows(pokemon["base_attack"], pokemon["base_defense"], pokemon["base_stamina"], rows)
+    return int(((cps == cp) & hp_ok[rows][:, None, None, :]).sum())
+
+
+def name_similarity(ocr_text: Optional[str], pokemon: Dict) -> float:
+    """Best difflib ratio between any OCR word and the species' names"""
+    if not ocr_text:
+        return 0.0
+    words = [w.lower() for w in re.findall(r'[가-힣]+|[A-Za-z]+', ocr_text) if len(w) >= 2]
+    names = [n.lower() for n in (pokemon.get("name_ko"), pokemon.get("name_en")) if n]
+    best = 0.0
+    for word in words:
+        for name in names:
+            best = max(best, difflib.SequenceMatcher(None, word, name).ratio())
+    return best
+
+
+_index: Optional[SpeciesIndex] = None
+_index_version: Optional[str] = None
+_index_lock = threading.Lock()
+
+
+def get_species_index(loader) -> SpeciesIndex:
+    """Index for the loader's snapshot, built on first use after each reload"""
+    global _index, _index_version
+    version = loader.data_version
+    if _index_version != version:
+        with _index_lock:
+            if _index_version != version:
+                _index = SpeciesIndex(loader.get_all_pokemon())
+                _index_version = version
+    return _index
+
+
+def infer_species(
+    loader,
+    cp: int,
+    hp: int,
+    level: Optional[float] = None,
+    stardust: Optional[int] = None,
+    ocr_text: Optional[str] = None,
+    limit: int = SPECIES_SHORTLIST_SIZE,
+) -> List[Dict]:
+    """
+    Ranked shortlist of species that can show this CP and HP
+
+    Candidates are scored by name similarity to the OCR text (when given)
+    and by their share of matching IV combinations.
+
+    Args:
+        loader: Pinned PokedexDataLoader
+        cp, hp: OCR'd values
+        level, stardust: Known level or power-up cost, if any
+        ocr_text: Raw OCR text, for partial name matches
+    """
+    index = get_species_index(loader)
+    levels = level_mask(level, stardust)
+
+    matches = []
+    for row in index.feasible(cp, hp, levels):
+        pokemon = index.records[row]
+        count = count_matches(pokemon, cp, hp, levels)
+        if count:
+            matches.append((pokemon, count))
+    if not matches:
+        return []
+
+    max_count = max(count for _, count in matches)
+    results = {}
+    for pokemon, count in matches:
+        similarity = name_similarity(ocr_text, pokemon)
+        if ocr_text:
+            score = NAME_SIMILARITY_WEIGHT * similarity + (1 - NAME_SIMILARITY_WEIGHT) * count / max_count
+        else:
+            score = count / max_count
+        number = pokemon["pokedex_number"]
+        if number not in results or score > results[number]["score"]:
+            results[number] = {
+                "pokemon_id": number,
+                "name_en": pokemon.get("name_en"),
+                "name_ko": pokemon.get("name_ko"),
+                "candidate_count": count,
+                "name_similarity": round(similarity, 3),
+                "score": round(score, 4),
+            }
+
+    ranked = sorted(results.values(), key=lambda r: (-r["score"], r["pokemon_id"]))
+    return ranked[:limit]
@@ -9,9 +9,16 @@ Where:
 - Defense = BaseDefense + IV_Defense
 - Stamina = BaseStamina + IV_Stamina
 - CPM = CP Multiplier for the given level
+
+cp_hp_grid() evaluates the same formulas for every IV combination at every
+half level in one NumPy broadcast.
 """
 
 import math
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
 
 # CP Multipliers for each level (Level 1-50)
 CP_MULTIPLIERS = {
@@ -124,3 +131,89 @@ def calculate_hp(base_stamina: int, iv_stamina: int, level: float) -> int:
 
     # HP cannot be less than 10
     return max(10, hp)
+
+
+# Level-indexed CPM table: index i is level 1 + 0.5 * i
+CPM_LEVELS = np.array(sorted(CP_MULTIPLIERS), dtype=np.float64)
+CPM_VALUES = np.array([CP_MULTIPLIERS[level] for level in sorted(CP_MULTIPLIERS)], dtype=np.float64)
+CPM_LEVELS.flags.writeable = False
+CPM_VALUES.flags.writeable = False
+
+IV_VALUES = np.arange(16)
+
+
+def level_index(level: float) -> int:
+    """
+    Index of a level in CPM_LEVELS
+
+    Raises:
+        ValueError: if the level is not a valid half level
+    """
+    if level not in CP_MULTIPLIERS:
+        raise ValueError(f"Invalid level: {level}. Must be between 1 and 50 (including half levels)")
+    return int(round((level - CPM_LEVELS[0]) * 2))
+
+
+class CPGrid(NamedTuple):
+    """
+    CP and HP for every (level, attack IV, defense IV, stamina IV)
+
+    cp and hp both have shape (len(CPM_LEVELS), 16, 16, 16); hp is a
+    broadcast view of a (levels, stamina IV) table. Arrays are read-only
+    because grids are shared through the cache.
+    """
+    levels: np.ndarray
+    cp: np.ndarray
+    hp: np.ndarray
+
+
+def _stat_term(base_attack: int, base_defense: int, base_stamina: int) -> np.ndarray:
+    """(atk, def, sta) part of the CP formula, shared by every level"""
+    attack = (base_attack + IV_VALUES).astype(np.float64)
+    sqrt_defense = np.sqrt((base_defense + IV_VALUES).astype(np.float64))
+    sqrt_stamina = np.sqrt((base_stamina + IV_VALUES).astype(np.float64))
+    return attack[:, None, None] * sqrt_defense[None, :, None] * sqrt_stamina[None, None, :]
+
+
+def compute_cp_rows(base_attack: int, base_defense: int, base_stamina: int,
+                    level_indices: np.ndarray) -> np.ndarray:
+    """
+    CP of every IV combination at a subset of levels, shaped
+    (len(level_indices), 16, 16, 16); values equal the matching grid rows
+    """
+    cpm = CPM_VALUES[level_indices][:, None, None, None]
+    cp = np.floor(_stat_term(base_attack, base_defense, base_stamina)[None, :, :, :] * cpm * cpm / 10).astype(np.int32)
+    np.maximum(cp, 10, out=cp)
+    return cp
+
+
+def compute_hp_table(base_stamina: int) -> np.ndarray:
+    """HP for every (level, stamina IV), shaped (len(CPM_LEVELS), 16)"""
+    stamina = (base_stamina + IV_VALUES).astype(np.float64)
+    hp_table = np.floor(stamina[None, :] * CPM_VALUES[:, None]).astype(np.int32)
+    np.maximum(hp_table, 10, out=hp_table)
+    return hp_table
+
+
+def compute_cp_hp_grid(base_attack: int, base_defense: int, base_stamina: int) -> CPGrid:
+    """
+    Calculate the full CP/HP grid for a species (uncached)
+
+    Uses the same operation order as calculate_cp/calculate_hp so every
+    value matches the scalar functions exactly.
+    """
+    cp = compute_cp_rows(base_attack, base_defense, base_stamina, np.arange(len(CPM_LEVELS)))
+    hp = np.broadcast_to(compute_hp_table(base_stamina)[:, None, None, :], cp.shape)
+
+    cp.flags.writeable = False
+    return CPGrid(levels=CPM_LEVELS, cp=cp, hp=hp)
+
+
+@lru_cache(maxsize=64)
+def cp_hp_grid(base_attack: int, base_defense: int, base_stamina: int) -> CPGrid:
+    """
+    Cached CP/HP grid for a species (about 1.6 MB each)
+
+    Keyed by base stats, so forms sharing stats share one grid.
+    """
+    return compute_cp_hp_grid(base_attack, base_defense, base_stamina)
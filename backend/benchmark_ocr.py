@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compare full-frame OCR with the region-of-interest OCR pipeline
+
+Runs both paths of IVCalculator over a directory of Pokémon detail
+screenshots and reports latency and, given a labels file, accuracy.
+The "digits" path times the CP/HP digit recognizer on its own.
+
+Run from the backend directory:
+    python benchmark_ocr.py screenshots/ [--labels labels.json] [--runs 3]
+
+labels.json maps file names to expected values:
+    {"charizard.png": {"name": "리자몽", "cp": 2889, "hp": 156}}
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import cv2
+
+from app.core.config import settings
+from app.services.iv_calculator import iv_calculator
+from app.services.screen_layout import locate_regions
+
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+
+
+def _read_digits(image):
+    cp, hp = iv_calculator._read_numbers(image, locate_regions(image))
+    return None, cp, hp, ""
+
+
+PATHS = {
+    "full": iv_calculator._read_full_frame,
+    "roi": iv_calculator._read_regions,
+    "digits": _read_digits,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-frame vs region OCR")
+    parser.add_argument("images", help="Directory of detail screen screenshots")
+    parser.add_argument("--labels", help="JSON file with expected name/cp/hp per file")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per image and path")
+    args = parser.parse_args()
+
+    labels = {}
+    if args.labels:
+        with open(args.labels, "r", encoding="utf-8") as f:
+            labels = json.load(f)
+
+    files = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not files:
+        print(f"⚠️ No screenshots found in {args.images}")
+        return
+
+    timings = {path: [] for path in PATHS}
+    correct = {path: {"name": 0, "cp": 0, "hp": 0} for path in PATHS}
+    labelled = 0
+
+    for file in files:
+        image = cv2.imread(str(file))
+        if image is None:
+            print(f"⚠️ Could not read {file.name}")
+            continue
+        expected = labels.get(file.name)
+        labelled += expected is not None
+
+        for path, read in PATHS.items():
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                name, cp, hp, _ = read(image)
+                timings[path].append((time.perf_counter() - start) * 1000)
+
+            if expected:
+                correct[path]["name"] += name == expected.get("name")
+                correct[path]["cp"] += cp == expected.get("cp")
+                correct[path]["hp"] += hp == expected.get("hp")
+
+    print(f"\nOCR latency over {len(files)} screenshots x {args.runs} runs "
+          f"(backend {settings.OCR_BACKEND}, langs {settings.OCR_LANGS}) (ms):")
+    print(f"{'path':<7} {'median':>8} {'p90':>8} {'max':>8}")
+    for path, values in timings.items():
+        p90 = statistics.quantiles(values, n=10)[-1] if len(values) > 1 else values[0]
+        print(f"{path:<7} {statistics.median(values):>8.1f} {p90:>8.1f} {max(values):>8.1f}")
+
+    speedup = statistics.median(timings["full"]) / statistics.median(timings["roi"])
+    if speedup >= 1:
+        print(f"\nRegion OCR is {speedup:.1f}x faster than full-frame OCR")
+    else:
+        print(f"\n⚠️ Region OCR is {1 / speedup:.1f}x slower than full-frame OCR")
+
+    if labelled:
+        print(f"\nAccuracy over {labelled} labelled screenshots:")
+        print(f"{'path':<7} {'name':>7} {'cp':>7} {'hp':>7}")
+        for path, fields in correct.items():
+            name = "-" if path == "digits" else f"{fields['name'] / labelled:.0%}"
+            print(f"{path:<7} {name:>7} " + " ".join(f"{fields[field] / labelled:>7.0%}" for field in ("cp", "hp")))
+
+
+if __name__ == "__main__":
+    main()
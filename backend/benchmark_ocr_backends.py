@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compare the pytesseract (subprocess) and tesserocr (in-process) OCR backends
+
+Runs the name crop and the full frame of each screenshot through every
+available backend and reports latency and how often each backend's text
+matches the subprocess path.
+
+Run from the backend directory:
+    python benchmark_ocr_backends.py screenshots/ [--runs 3]
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import cv2
+
+from app.services.iv_calculator import (
+    NAME_OCR_PSM,
+    OCR_BACKENDS,
+    _name_ocr_lang,
+)
+from app.services.screen_layout import binarize_crop, locate_regions
+
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR backends")
+    parser.add_argument("images", help="Directory of detail screen screenshots")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per image and backend")
+    args = parser.parse_args()
+
+    backends = {}
+    for name, backend_class in OCR_BACKENDS.items():
+        try:
+            start = time.perf_counter()
+            backends[name] = backend_class()
+            print(f"{name}: ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except RuntimeError as e:
+            print(f"⚠️ Skipping {name}: {e}")
+
+    files = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not files:
+        print(f"⚠️ No screenshots found in {args.images}")
+        return
+
+    lang = _name_ocr_lang()
+    tasks = {}
+    for file in files:
+        image = cv2.imread(str(file))
+        if image is None:
+            print(f"⚠️ Could not read {file.name}")
+            continue
+        name_crop = binarize_crop(image, locate_regions(image).name)
+        if name_crop is not None:
+            tasks[(file.name, "name")] = (name_crop, lang, NAME_OCR_PSM)
+        tasks[(file.name, "full")] = (cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), None, None)
+
+    timings = {(backend, kind): [] for backend in backends for kind in ("name", "full")}
+    texts = {}
+    for backend_name, backend in backends.items():
+        # First call loads engines; keep it out of the timings
+        for image, task_lang, psm in list(tasks.values())[:1]:
+            backend.image_to_string(image, lang=task_lang, psm=psm)
+
+        for (file_name, kind), (image, task_lang, psm) in tasks.items():
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                text = backend.image_to_string(image, lang=task_lang, psm=psm)
+                timings[(backend_name, kind)].append((time.perf_counter() - start) * 1000)
+            texts[(backend_name, file_name, kind)] = text.strip()
+
+    print(f"\nOCR latency over {len(files)} screenshots x {args.runs} runs (ms):")
+    print(f"{'backend':<12} {'region':<6} {'median':>8} {'p90':>8} {'max':>8} {'same text':>10}")
+    for (backend_name, kind), values in timings.items():
+        if not values:
+            continue
+        p90 = statistics.quantiles(values, n=10)[-1] if len(values) > 1 else values[0]
+        keys = [(file_name, k) for file_name, k in tasks if k == kind]
+        same = sum(texts[(backend_name, f, k)] == texts.get(("pytesseract", f, k)) for f, k in keys)
+        print(f"{backend_name:<12} {kind:<6} {statistics.median(values):>8.1f} {p90:>8.1f} "
+              f"{max(values):>8.1f} {same / len(keys):>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
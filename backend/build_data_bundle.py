@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Compile data/*.json into data/pokedex.bundle for faster cold starts
+
+Run from the backend directory as part of the build:
+    python build_data_bundle.py
+
+Compare loader startup with and without the bundle:
+    python build_data_bundle.py --benchmark
+"""
+
+import argparse
+import statistics
+import time
+
+from app.services.pokedex_data_loader import PokedexDataLoader
+
+
+def benchmark(data_dir: str, runs: int):
+    """Time building a PokedexDataLoader from JSON vs from the bundle"""
+    results = {}
+    for label, use_bundle in (("json", False), ("bundle", True)):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            loader = PokedexDataLoader(data_dir, use_bundle=use_bundle)
+            timings.append((time.perf_counter() - start) * 1000)
+        if loader.snapshot.source != label:
+            print(f"⚠️ Expected to load from {label} but loaded from {loader.snapshot.source}")
+        results[label] = timings
+
+    print(f"\nStartup time over {runs} runs (ms):")
+    print(f"{'path':<8} {'median':>8} {'min':>8} {'max':>8}")
+    for label, timings in results.items():
+        print(f"{label:<8} {statistics.median(timings):>8.2f} {min(timings):>8.2f} {max(timings):>8.2f}")
+
+    speedup = statistics.median(results["json"]) / statistics.median(results["bundle"])
+    print(f"\nBundle is {speedup:.1f}x faster than JSON")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Pokédex binary data bundle")
+    parser.add_argument("--data-dir", default="data", help="Directory with the JSON data files")
+    parser.add_argument("--benchmark", action="store_true", help="Benchmark JSON vs bundle startup")
+    parser.add_argument("--runs", type=int, default=20, help="Benchmark iterations per path")
+    args = parser.parse_args()
+
+    loader = PokedexDataLoader(args.data_dir, use_bundle=False)
+    bundle_path = loader.build_bundle()
+    print(f"✅ Wrote {bundle_path} ({bundle_path.stat().st_size / 1024:.0f} KB, data version {loader.data_version})")
+
+    if args.benchmark:
+        benchmark(args.data_dir, args.runs)
+
+
+if __name__ == "__main__":
+    main()
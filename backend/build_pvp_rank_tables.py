@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Precompute PvP league rank tables for the whole Pokédex
+
+Writes data/pvp_ranks.npy (uint16 ranks shaped species x league x 16 x 16 x 16)
+and data/pvp_ranks.json (row index, base stats, best IVs per league). The API
+memory-maps them, so rank queries need no computation and every worker
+shares one copy through the OS page cache.
+
+Run from the backend directory:
+    python build_pvp_rank_tables.py [--workers N]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from app.services.pokedex_data_loader import PokedexDataLoader
+from app.services.pvp_rank import (
+    DEFAULT_LEVEL_CEILING, LEAGUE_CP_CAPS, RANK_INDEX_FILENAME,
+    RANK_TABLE_FILENAME, RANK_TABLE_FORMAT_VERSION, LeagueRankTable
+)
+
+
+LEAGUES = tuple(LEAGUE_CP_CAPS)
+
+
+def compute_species(base_stats):
+    """Rank tables of one species for every league (runs in a worker process)"""
+    ranks = np.empty((len(LEAGUES), 16, 16, 16), dtype=np.uint16)
+    best = []
+    for i, league in enumerate(LEAGUES):
+        table = LeagueRankTable(*base_stats, LEAGUE_CP_CAPS[league], DEFAULT_LEVEL_CEILING)
+        ranks[i] = table.rank
+        best.append([*table.best_ivs, table.max_stat_product])
+    return ranks, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute PvP league rank tables")
+    parser.add_argument("--data-dir", default="data", help="Directory with the JSON data files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    loader = PokedexDataLoader(args.data_dir)
+
+    species = []
+    seen = set()
+    for pokemon in loader.get_all_pokemon():
+        number = pokemon.get("pokedex_number")
+        if number in seen:
+            continue
+        seen.add(number)
+        species.append({
+            "pokedex_number": number,
+            "base_stats": [pokemon["base_attack"], pokemon["base_defense"], pokemon["base_stamina"]],
+        })
+
+    print(f"Computing {len(species)} species x {len(LEAGUES)} leagues with {args.workers} workers...")
+    start = time.perf_counter()
+
+    table_tmp = data_dir / (RANK_TABLE_FILENAME + ".tmp")
+    index_tmp = data_dir / (RANK_INDEX_FILENAME + ".tmp")
+
+    ranks = np.lib.format.open_memmap(
+        table_tmp, mode="w+", dtype=np.uint16, shape=(len(species), len(LEAGUES), 16, 16, 16)
+    )
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = executor.map(compute_species, [tuple(s["base_stats"]) for s in species], chunksize=16)
+        for row, (species_ranks, best) in enumerate(results):
+            ranks[row] = species_ranks
+            species[row]["best"] = best
+    ranks.flush()
+    del ranks
+
+    with open(index_tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "format_version": RANK_TABLE_FORMAT_VERSION,
+            "data_version": loader.data_version,
+            "level_ceiling": DEFAULT_LEVEL_CEILING,
+            "leagues": list(LEAGUES),
+            "species": species,
+        }, f)
+
+    # Table first, then index: a reader never sees an index for a missing table
+    os.replace(table_tmp, data_dir / RANK_TABLE_FILENAME)
+    os.replace(index_tmp, data_dir / RANK_INDEX_FILENAME)
+
+    elapsed = time.perf_counter() - start
+    size_mb = (data_dir / RANK_TABLE_FILENAME).stat().st_size / 1024 / 1024
+    print(f"✅ Wrote {data_dir / RANK_TABLE_FILENAME} ({size_mb:.1f} MB) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
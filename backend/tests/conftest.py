@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+# The services import the app settings; keep the tests off the real database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+@pytest.fixture
+def db():
+    """Session on a fresh in-memory database with every table"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import app.models  # noqa: F401  (registers the tables)
+    from app.core.database import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
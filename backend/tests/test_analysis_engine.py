@@ -0,0 +1,46 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services.analysis_engine import AnalysisBusyError, AnalysisEngine
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.shut_down = False
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def _broken_future():
+    future = Future()
+    future.set_exception(BrokenProcessPool("worker died"))
+    return future
+
+
+def test_broken_pool_is_dropped_and_shut_down():
+    engine = AnalysisEngine()
+    old = engine._executor = FakeExecutor()
+    engine._in_flight = 2
+
+    engine._on_done(old, _broken_future())
+    assert engine._executor is None
+    assert old.shut_down
+
+    # A later callback from the old pool must not drop a pool started since
+    new = engine._executor = FakeExecutor()
+    engine._on_done(old, _broken_future())
+    assert engine._executor is new
+    assert not new.shut_down
+    assert engine.in_flight == 0
+
+
+def test_saturated_engine_rejects_work():
+    engine = AnalysisEngine(max_workers=1, max_queue=0)
+    engine._acquire()
+    with pytest.raises(AnalysisBusyError):
+        engine._acquire()
+    engine._release()
+    assert engine.in_flight == 0
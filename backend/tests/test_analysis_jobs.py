@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+
+from app.api.analysis import fail_interrupted_jobs
+from app.core.config import settings
+from app.models.analysis_job import AnalysisJob
+
+
+def test_fail_interrupted_jobs(db):
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=3 * settings.ANALYSIS_JOB_TIMEOUT_S)
+    db.add_all([
+        AnalysisJob(id="stale", status="pending", created_at=stale),
+        AnalysisJob(id="live", status="pending", created_at=now),  # Another instance's running job
+        AnalysisJob(id="completed", status="completed", created_at=stale),
+        AnalysisJob(id="failed", status="failed", error="OCR failed", created_at=stale),
+    ])
+    db.commit()
+
+    assert fail_interrupted_jobs(db) == 1
+
+    jobs = {job.id: job for job in db.query(AnalysisJob)}
+    assert jobs["stale"].status == "failed"
+    assert jobs["stale"].error and jobs["stale"].finished_at is not None
+    assert jobs["live"].status == "pending"
+    assert jobs["completed"].status == "completed"
+    assert jobs["failed"].error == "OCR failed"
+    assert fail_interrupted_jobs(db) == 0
@@ -0,0 +1,66 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.services.appraisal_reader import fill_to_range, read_appraisal_bars
+
+TRACK = (226, 226, 226)
+ORANGE = (60, 160, 245)  # BGR
+RED = (110, 115, 230)
+
+
+def appraisal_screen(ivs, width=1080, height=1920, quality=90):
+    """Appraisal card with three 15-point bars drawn as 3 segments of 5, JPEG round-tripped"""
+    image = np.full((height, width, 3), (200, 170, 120), dtype=np.uint8)
+    cv2.rectangle(image, (0, int(height * 0.6)), (width, height), (255, 255, 255), -1)
+    segment, gap, left = int(width * 0.105), int(width * 0.006), int(width * 0.08)
+    bar_height = int(height * 0.011)
+    for row, iv in enumerate(ivs):
+        y = int(height * (0.71 + row * 0.06))
+        for s in range(3):
+            x = left + s * (segment + gap)
+            cv2.rectangle(image, (x, y), (x + segment - 1, y + bar_height), TRACK, -1)
+            points = min(max(iv - 5 * s, 0), 5)
+            if points:
+                fill = RED if iv == 15 else ORANGE
+                cv2.rectangle(image, (x, y), (x + round(segment * points / 5) - 1, y + bar_height), fill, -1)
+    _, data = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+@pytest.mark.parametrize("ivs", [(15, 15, 15), (0, 0, 0), (7, 13, 2), (5, 10, 14), (1, 14, 6)])
+@pytest.mark.parametrize("width, height", [(1080, 1920), (720, 1280)])
+def test_reads_every_bar(ivs, width, height):
+    bars = read_appraisal_bars(appraisal_screen(ivs, width, height))
+    assert bars is not None
+    for iv, (low, high) in zip(ivs, (bars.attack, bars.defense, bars.stamina)):
+        assert low <= iv <= high
+        assert high - low <= 1
+
+
+def test_observation_format():
+    bars = read_appraisal_bars(appraisal_screen((15, 0, 8)))
+    observation = bars.to_observation()
+    assert observation["type"] == "appraisal"
+    assert observation["attack_iv_range"] == [15, 15]
+    assert observation["defense_iv_range"] == [0, 0]
+    assert bars.iv_ranges()["stamina"] == tuple(observation["stamina_iv_range"])
+
+
+def test_no_bars_on_other_screens():
+    assert read_appraisal_bars(np.full((1920, 1080, 3), 255, dtype=np.uint8)) is None
+    image = appraisal_screen((10, 10, 10))
+    image[int(1920 * 0.82):] = 255  # Only two bars left
+    assert read_appraisal_bars(image) is None
+
+
+@pytest.mark.parametrize("points, expected", [
+    (0.0, (0, 0)),
+    (15.0, (15, 15)),
+    (7.1, (7, 7)),
+    (7.5, (7, 8)),
+    (-0.2, (0, 0)),
+    (15.2, (15, 15)),
+])
+def test_fill_to_range(points, expected):
+    assert fill_to_range(points) == expected
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from app.utils.cp_calculator import (
+    CPM_LEVELS,
+    calculate_cp,
+    calculate_hp,
+    compute_cp_rows,
+    cp_hp_grid,
+    level_index,
+)
+
+SPECIES = [(112, 96, 111), (228, 188, 200), (1, 1, 1), (300, 182, 214)]
+
+
+@pytest.mark.parametrize("base", SPECIES)
+def test_grid_matches_scalar_formulas(base):
+    grid = cp_hp_grid(*base)
+    assert grid.cp.shape == grid.hp.shape == (len(CPM_LEVELS), 16, 16, 16)
+
+    rng = np.random.default_rng(sum(base))
+    for level_idx, atk, dfn, sta in zip(rng.integers(0, len(CPM_LEVELS), 200),
+                                        *rng.integers(0, 16, (3, 200))):
+        level = float(CPM_LEVELS[level_idx])
+        assert grid.cp[level_idx, atk, dfn, sta] == calculate_cp(*base, atk, dfn, sta, level)
+        assert grid.hp[level_idx, atk, dfn, sta] == calculate_hp(base[2], sta, level)
+
+
+def test_grid_floors_at_ten():
+    grid = cp_hp_grid(1, 1, 1)
+    assert grid.cp.min() == 10 and grid.hp.min() == 10
+
+
+def test_grid_is_cached_and_read_only():
+    grid = cp_hp_grid(*SPECIES[0])
+    assert cp_hp_grid(*SPECIES[0]) is grid
+    with pytest.raises(ValueError):
+        grid.cp[0, 0, 0, 0] = 1
+
+
+def test_cp_rows_match_grid_rows():
+    grid = cp_hp_grid(*SPECIES[1])
+    rows = np.array([0, 37, len(CPM_LEVELS) - 1])
+    assert np.array_equal(compute_cp_rows(*SPECIES[1], rows), grid.cp[rows])
+
+
+def test_level_index():
+    assert CPM_LEVELS[level_index(1)] == 1
+    assert CPM_LEVELS[level_index(40.5)] == 40.5
+    with pytest.raises(ValueError):
+        level_index(40.25)
@@ -0,0 +1,107 @@
+import cv2
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from app.services.digit_recognizer import DigitRecognizer, count_holes, normalize_glyph
+from app.services.screen_layout import binarize_crop
+
+
+# Pillow's bundled TrueType font: a different design from the Hershey templates
+FONT = ImageFont.load_default(size=64)
+
+
+def _text_crop(text, light_on_dark=False):
+    """BGR crop with text, like a CP (light on dark) or HP (dark on light) region"""
+    background, ink = ((60, 90, 40), (255, 255, 255)) if light_on_dark else ((245, 245, 245), (60, 60, 60))
+    left, top, right, bottom = FONT.getbbox(text)
+    image = Image.new("RGB", (right - left + 40, bottom - top + 40), background)
+    ImageDraw.Draw(image).text((20 - left, 20 - top), text, font=FONT, fill=ink)
+    return np.array(image)[:, :, ::-1].copy()
+
+
+def _glyph_ink(label):
+    """Binary ink mask (nonzero = ink) of one glyph"""
+    gray = cv2.cvtColor(_text_crop(label), cv2.COLOR_BGR2GRAY)
+    return (gray < 128).astype(np.uint8)
+
+
+def _read(recognizer, image):
+    return recognizer.read(binarize_crop(image, (0, image.shape[0], 0, image.shape[1])))
+
+
+@pytest.fixture(scope="module")
+def hershey():
+    return DigitRecognizer.from_hershey()
+
+
+@pytest.fixture(scope="module")
+def from_templates(tmp_path_factory):
+    """Recognizer built from glyphs cut from the test font, as DIGIT_TEMPLATE_DIR would hold"""
+    path = tmp_path_factory.mktemp("glyphs")
+    for label in "0123456789CPH/":
+        name = "slash" if label == "/" else label
+        cv2.imwrite(str(path / f"{name}_font.png"), cv2.cvtColor(_text_crop(label), cv2.COLOR_BGR2GRAY))
+    return DigitRecognizer.from_directory(str(path))
+
+
+@pytest.mark.parametrize("text", ["CP1234", "CP567", "127/127HP", "45/68HP"])
+def test_hershey_templates_read_unseen_stroke_widths(hershey, text):
+    # Hershey's own zero has a slash through it, so it reads as two holes
+    (width, height), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_PLAIN, 3, 4)
+    image = np.full((height + 40, width + 40, 3), 245, dtype=np.uint8)
+    cv2.putText(image, text, (20, height + 20), cv2.FONT_HERSHEY_PLAIN, 3, (60, 60, 60), 4, cv2.LINE_AA)
+    assert _read(hershey, image) == text
+
+
+@pytest.mark.parametrize("text, light_on_dark", [
+    ("CP1234", True),
+    ("CP9080", True),
+    ("CP10", True),
+    ("127/127HP", False),
+    ("45/68HP", False),
+])
+def test_directory_templates_read_numbers(from_templates, text, light_on_dark):
+    assert _read(from_templates, _text_crop(text, light_on_dark=light_on_dark)) == text
+
+
+def test_wide_gaps_read_as_spaces(from_templates):
+    assert _read(from_templates, _text_crop("CP      10")) == "CP 10"
+
+
+def test_blank_crop_reads_empty(hershey):
+    assert hershey.read(np.full((96, 300), 255, dtype=np.uint8)) == ""
+
+
+@pytest.mark.parametrize("label, holes", [("8", 2), ("0", 1), ("6", 1), ("3", 0), ("1", 0)])
+def test_count_holes(label, holes):
+    assert count_holes(_glyph_ink(label)) == holes
+
+
+def test_normalized_glyphs_are_unit_vectors():
+    ink = np.zeros((50, 30), dtype=np.uint8)
+    ink[5:45, 10:18] = 1
+    vector = normalize_glyph(ink)
+    assert vector.shape == (24 * 24,)
+    assert np.linalg.norm(vector) == pytest.approx(1.0)
+    assert abs(vector.mean()) < 1e-6
+    assert normalize_glyph(np.zeros((10, 10), dtype=np.uint8)) is None
+
+
+def test_from_directory_skips_unknown_labels(tmp_path):
+    for label, name in (("1", "1_a"), ("/", "slash_a"), ("7", "7_a")):
+        image = np.full((120, 100), 255, dtype=np.uint8)
+        cv2.putText(image, label, (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 3, 0, 8)
+        cv2.imwrite(str(tmp_path / f"{name}.png"), image)
+    cv2.imwrite(str(tmp_path / "x_bad.png"), np.zeros((10, 10), dtype=np.uint8))
+
+    recognizer = DigitRecognizer.from_directory(str(tmp_path))
+    assert sorted(recognizer.labels) == ["/", "1", "7"]
+    ink = np.zeros((120, 100), dtype=np.uint8)
+    cv2.putText(ink, "7", (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 3, 255, 8)
+    assert recognizer.classify(ink)[0] == "7"
+
+
+def test_from_empty_directory(tmp_path):
+    with pytest.raises(ValueError):
+        DigitRecognizer.from_directory(str(tmp_path))
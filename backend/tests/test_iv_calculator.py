@@ -0,0 +1,31 @@
+import pytest
+
+from app.services.iv_calculator import iv_calculator
+
+
+@pytest.mark.parametrize("text, cp", [
+    ("CP1234", 1234),
+    ("CP 10", 10),
+    ("CP12?4", None),
+    ("CP?234", None),
+    ("CP 12 34", 1234),
+    ("1234", None),
+    ("CP123456", None),
+    ("", None),
+])
+def test_parse_cp_crop(text, cp):
+    assert iv_calculator._parse_cp_crop(text) == cp
+
+
+@pytest.mark.parametrize("text, hp", [
+    ("127/127HP", 127),
+    ("12/127", 127),
+    ("127 / 127 HP", 127),
+    ("127/1?7HP", None),
+    ("1?7/127HP", None),
+    ("127HP", None),
+    ("127/127H?", None),
+    ("", None),
+])
+def test_parse_hp_crop(text, hp):
+    assert iv_calculator._parse_hp_crop(text) == hp
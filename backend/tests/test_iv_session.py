@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from app.services import iv_session
+from app.utils.cp_calculator import CPM_LEVELS, calculate_cp, calculate_hp, level_index
+
+PIKACHU = {"base_attack": 112, "base_defense": 96, "base_stamina": 111}
+RAICHU = {"base_attack": 193, "base_defense": 151, "base_stamina": 155}
+LEVEL, IVS = 20.0, (13, 5, 9)
+
+
+def _cp_hp(pokemon, level, power_ups=0):
+    stats = (pokemon["base_attack"], pokemon["base_defense"], pokemon["base_stamina"])
+    return {
+        "type": "cp_hp",
+        "cp": calculate_cp(*stats, *IVS, level),
+        "hp": calculate_hp(stats[2], IVS[2], level),
+        "power_ups": power_ups,
+    }
+
+
+def _contains_truth(bits):
+    return bool(iv_session.unpack(bits)[(level_index(LEVEL), *IVS)])
+
+
+def test_pack_round_trip_and_count():
+    mask = np.zeros(iv_session.GRID_SHAPE, dtype=bool)
+    mask[3, 1, 2, 3] = mask[-1, 15, 15, 15] = True
+    bits = iv_session.pack(mask)
+    assert np.array_equal(iv_session.unpack(bits), mask)
+    assert iv_session.count(bits) == 2
+    assert iv_session.count(iv_session.all_candidates()) == iv_session.GRID_SIZE
+
+
+def test_power_ups_narrow_towards_the_truth():
+    bits, first = iv_session.apply_observation(iv_session.all_candidates(), _cp_hp(PIKACHU, LEVEL), PIKACHU)
+    assert _contains_truth(bits)
+
+    bits, second = iv_session.apply_observation(bits, _cp_hp(PIKACHU, LEVEL + 1, power_ups=2), PIKACHU)
+    assert _contains_truth(bits)
+    assert 1 <= second <= first
+
+    summary = iv_session.summarize(bits)
+    assert summary["candidate_count"] == second
+    assert LEVEL in summary["levels"]
+
+
+def test_appraisal_and_evolution_keep_the_truth():
+    bits = iv_session.all_candidates()
+    appraisal = {"type": "appraisal", "stars": 1, "attack_iv_range": [13, 13]}
+    bits, _ = iv_session.apply_observation(bits, appraisal, PIKACHU)
+    assert _contains_truth(bits)
+    assert set(np.nonzero(iv_session.unpack(bits))[1].tolist()) == {13}
+
+    evolution = dict(_cp_hp(RAICHU, LEVEL), type="evolution", pokemon_id=26)
+    bits, remaining = iv_session.apply_observation(bits, evolution, RAICHU)
+    assert remaining >= 1 and _contains_truth(bits)
+    assert iv_session.evolved_species(evolution) == 26
+    assert iv_session.evolved_species(appraisal) is None
+
+
+def test_power_ups_beyond_the_grid_leave_nothing():
+    observation = _cp_hp(PIKACHU, LEVEL, power_ups=len(CPM_LEVELS))
+    assert not iv_session.observation_mask(observation, PIKACHU).any()
+
+
+@pytest.mark.parametrize("observation", [
+    {"type": "cp_hp", "cp": 500},
+    {"type": "cp_hp", "cp": 500, "hp": 60, "power_ups": -1},
+    {"type": "appraisal", "stars": 5},
+    {"type": "appraisal", "attack_iv_range": [10, 16]},
+    {"type": "unknown"},
+])
+def test_malformed_observations(observation):
+    with pytest.raises(ValueError):
+        iv_session.observation_mask(observation, PIKACHU)
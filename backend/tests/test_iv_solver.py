@@ -0,0 +1,66 @@
+import pytest
+
+from app.services.iv_solver import iv_range_mask, level_mask, solve_ivs
+from app.utils.cp_calculator import CPM_LEVELS, calculate_cp, calculate_hp
+
+# Pikachu
+BASE = (112, 96, 111)
+
+
+def _allowed(mask):
+    return [float(level) for level in CPM_LEVELS[mask]]
+
+
+def test_level_mask_known_level_and_levels():
+    assert _allowed(level_mask(level=20)) == [20.0]
+    assert _allowed(level_mask(levels=[20, 20.5, 30])) == [20.0, 20.5, 30.0]
+    assert _allowed(level_mask(level=20, levels=[20.5])) == []
+
+
+def test_level_mask_stardust_bracket():
+    allowed = _allowed(level_mask(stardust=2500))
+    assert [level for level in allowed if level <= 39.5] == [19.0, 19.5, 20.0, 20.5]
+
+
+def test_level_mask_stardust_never_rules_out_xl_levels():
+    xl_levels = _allowed(CPM_LEVELS >= 40)
+    for stardust in (200, 10000, 15000):
+        allowed = _allowed(level_mask(stardust=stardust))
+        assert allowed[-len(xl_levels):] == xl_levels
+
+
+def test_iv_range_mask():
+    mask = iv_range_mask(attack=(15, 15), defense=(0, 1), stamina=(10, 15))
+    assert mask.shape == (16, 16, 16)
+    assert mask.sum() == 1 * 2 * 6
+    assert mask[15, 1, 10] and not mask[14, 1, 10]
+
+
+@pytest.mark.parametrize("level, ivs", [(20.0, (15, 15, 15)), (31.5, (0, 7, 12)), (45.0, (10, 0, 3))])
+def test_solve_ivs_contains_the_truth(level, ivs):
+    cp = calculate_cp(*BASE, *ivs, level)
+    hp = calculate_hp(BASE[2], ivs[2], level)
+    solution = solve_ivs(*BASE, cp, hp)
+
+    assert solution.count >= 1
+    found = set(zip(solution.levels.tolist(), solution.attack.tolist(),
+                    solution.defense.tolist(), solution.stamina.tolist()))
+    assert (level, *ivs) in found
+    for cand_level, atk, dfn, sta in found:
+        assert calculate_cp(*BASE, atk, dfn, sta, cand_level) == cp
+        assert calculate_hp(BASE[2], sta, cand_level) == hp
+
+
+def test_solve_ivs_narrowed_by_level_and_ranges():
+    cp = calculate_cp(*BASE, 15, 15, 15, 20.0)
+    hp = calculate_hp(BASE[2], 15, 20.0)
+    solution = solve_ivs(*BASE, cp, hp, levels=[20.0], iv_ranges={"attack": (15, 15)})
+    assert solution.count >= 1
+    assert set(solution.levels.tolist()) == {20.0}
+    assert set(solution.attack.tolist()) == {15}
+    assert solution.to_dict()["iv_max"] == 100.0
+
+
+def test_solve_ivs_impossible_reading():
+    assert solve_ivs(*BASE, 10, 9999).count == 0
+    assert solve_ivs(*BASE, 10, 9999).to_dict()["candidate_count"] == 0
@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.services.level_arc import (
+    ANGLE_TOLERANCE,
+    arc_max_level,
+    level_angles,
+    levels_at_angle,
+    read_level_arc,
+)
+
+
+def arc_screen(level, trainer_level, width=1080, height=1920, center=0.33, radius=0.38, seed=0):
+    """Detail screen top: gradient background, Pokémon blob, white arc and dot, JPEG round-tripped"""
+    rng = np.random.default_rng(seed)
+    top, bottom = rng.integers(60, 200, 3), rng.integers(60, 200, 3)
+    t = np.linspace(0, 1, height)[:, None, None]
+    image = (top * (1 - t) + bottom * t).repeat(width, axis=1) + rng.normal(0, 6, (height, width, 3))
+    image = np.clip(image, 0, 255).astype(np.uint8)
+
+    cx, cy, r = width // 2, int(center * height), int(radius * width)
+    blob = tuple(int(v) for v in rng.integers(0, 255, 3))
+    cv2.ellipse(image, (cx, cy), (int(r * 0.6), int(r * 0.7)), 0, 0, 360, blob, -1)
+    cv2.ellipse(image, (cx, cy), (r, r), 0, 180, 360, (245, 245, 245), max(2, width // 270), cv2.LINE_AA)
+
+    levels, angles = level_angles(arc_max_level(trainer_level))
+    theta = np.radians(180 - float(angles[list(levels).index(level)]))
+    dot = (int(round(cx + r * np.cos(theta))), int(round(cy - r * np.sin(theta))))
+    cv2.circle(image, dot, int(0.011 * width), (255, 255, 255), -1, cv2.LINE_AA)
+    cv2.rectangle(image, (0, int(height * 0.4)), (width, height), (250, 250, 250), -1)
+
+    _, data = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+@pytest.mark.parametrize("level, trainer_level, width, height, center, radius, seed", [
+    (1.0, 40, 1080, 1920, 0.33, 0.38, 0),
+    (20.0, 30, 1080, 1920, 0.30, 0.40, 1),
+    (31.5, 40, 720, 1280, 0.35, 0.36, 2),
+    (42.0, 50, 1080, 2340, 0.28, 0.42, 3),
+    (50.0, 50, 720, 1280, 0.33, 0.38, 4),
+])
+def test_reads_the_level(level, trainer_level, width, height, center, radius, seed):
+    reading = read_level_arc(arc_screen(level, trainer_level, width, height, center, radius, seed), trainer_level)
+    assert reading is not None
+    assert level in reading.levels
+    assert reading.max_level == arc_max_level(trainer_level)
+
+
+def test_no_arc():
+    assert read_level_arc(np.full((1920, 1080, 3), 120, dtype=np.uint8), 40) is None
+
+
+def test_arc_max_level():
+    assert arc_max_level(30) == 32.0
+    assert arc_max_level(49) == 50.0
+
+
+def test_level_angles_span_the_half_circle():
+    levels, angles = level_angles(42.0)
+    assert levels[0] == 1 and levels[-1] == 42
+    assert angles[0] == 0 and angles[-1] == pytest.approx(180)
+    assert np.all(np.diff(angles) > 0)
+
+
+def test_levels_at_angle_nearest_first():
+    levels, angles = level_angles(40.0)
+    target = float(angles[list(levels).index(25.0)])
+    found = levels_at_angle(target, 40.0)
+    assert found[0] == 25.0
+    assert all(abs(float(angles[list(levels).index(level)]) - target) <= ANGLE_TOLERANCE for level in found)
+    # Far outside the arc still gives the nearest level
+    assert levels_at_angle(200.0, 40.0) == (40.0,)
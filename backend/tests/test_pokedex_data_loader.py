@@ -0,0 +1,47 @@
+from datetime import date, datetime, timedelta
+
+from app.services.pokedex_data_loader import PokedexSnapshot
+
+
+def _tier(season_id, start, end, pokemon_id=1):
+    return {"season_id": season_id, "pokemon_id": pokemon_id, "start_date": start, "end_date": end}
+
+
+def _snapshot(tiers):
+    return PokedexSnapshot("test", [], [], [], tiers, [], [])
+
+
+def _linear_season(tiers, day):
+    """The original scan: first tier in file order whose dates cover the day"""
+    for tier in tiers:
+        start = datetime.fromisoformat(tier["start_date"]).date()
+        end = datetime.fromisoformat(tier["end_date"]).date()
+        if start <= day <= end:
+            return tier["season_id"]
+    return None
+
+
+def test_season_at_matches_file_order_when_seasons_overlap():
+    tiers = [
+        _tier("long", "2024-01-01", "2024-12-31"),
+        _tier("spring", "2024-03-01", "2024-05-31"),
+        _tier("summer", "2024-06-01", "2024-08-31"),
+        _tier("summer", "2024-09-15", "2024-09-30", pokemon_id=2),
+        _tier("next", "2025-01-01", "2025-03-31"),
+        _tier("overlap", "2024-12-01", "2025-01-31"),
+        _tier("split", "2026-01-01", "2026-01-10"),
+        _tier("split", "2026-02-01", "2026-02-10", pokemon_id=2),
+    ]
+    snapshot = _snapshot(tiers)
+
+    day = date(2023, 12, 1)
+    while day <= date(2026, 3, 1):
+        assert snapshot.season_at(day) == _linear_season(tiers, day), day
+        day += timedelta(days=1)
+
+
+def test_season_validity_brackets_season_changes():
+    snapshot = _snapshot([_tier("a", "2024-01-01", "2024-01-31"), _tier("b", "2024-02-01", "2024-02-29")])
+    assert snapshot.season_validity(date(2024, 1, 15)) == (date(2024, 1, 1), date(2024, 1, 31))
+    assert snapshot.season_validity(date(2023, 6, 1)) == (date.min, date(2023, 12, 31))
+    assert snapshot.season_validity(date(2024, 6, 1)) == (date(2024, 3, 1), date.max)
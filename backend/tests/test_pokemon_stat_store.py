@@ -0,0 +1,37 @@
+import pytest
+
+from app.services.pokemon_stat_store import PokemonStatStore
+
+RECORDS = [
+    {"pokedex_number": 4, "types": ["Fire"], "base_attack": 116, "base_defense": 93, "base_stamina": 118},
+    {"pokedex_number": 6, "types": ["Fire", "Flying"], "base_attack": 223, "base_defense": 173, "base_stamina": 186},
+    {"pokedex_number": 7, "types": ["Water"], "base_attack": 94, "base_defense": 121, "base_stamina": 127},
+    {"pokedex_number": 16, "types": ["Normal", "Flying"], "base_attack": 85, "base_defense": 73, "base_stamina": 120},
+]
+
+
+def _numbers(store, rows):
+    return [record["pokedex_number"] for record in store.rows_to_records(rows)]
+
+
+@pytest.mark.parametrize("types", [["Fire"], ["fire"], ["FIRE"]])
+def test_type_filter_ignores_case(types):
+    store = PokemonStatStore(RECORDS)
+    assert _numbers(store, store.query(types=types)) == [4, 6]
+
+
+def test_every_listed_type_must_match():
+    store = PokemonStatStore(RECORDS)
+    assert _numbers(store, store.query(types=["flying", "Fire"])) == [6]
+    assert _numbers(store, store.query(types=["fire", "dragon"])) == []
+
+
+def test_stat_ranges_and_sort():
+    store = PokemonStatStore(RECORDS)
+    rows = store.query(attack=(90, None), defense=(None, 180), sort_by="stamina", descending=False)
+    assert _numbers(store, rows) == [4, 7, 6]
+
+
+def test_unknown_sort_key():
+    with pytest.raises(ValueError):
+        PokemonStatStore(RECORDS).query(sort_by="speed")
@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+import pytest
+
+from app.services.pvp_rank import (
+    DEFAULT_LEVEL_CEILING,
+    LEAGUE_CP_CAPS,
+    RANK_INDEX_FILENAME,
+    RANK_TABLE_FILENAME,
+    RANK_TABLE_FORMAT_VERSION,
+    LeagueRankTable,
+    PrecomputedRankTables,
+    iv_league_stats,
+)
+
+AZUMARILL = {"pokedex_number": 184, "base_attack": 112, "base_defense": 152, "base_stamina": 225}
+# Azumarill, Medicham, Mewtwo
+SPECIES = [(112, 152, 225), (121, 152, 155), (300, 182, 214)]
+
+
+@pytest.mark.parametrize("base", SPECIES)
+@pytest.mark.parametrize("league", ["Great", "Ultra", "Master"])
+def test_table_matches_single_iv_stats(base, league):
+    cap = LEAGUE_CP_CAPS[league]
+    table = LeagueRankTable(*base, cap)
+    rng = np.random.default_rng(sum(base))
+    for atk, dfn, sta in rng.integers(0, 16, (50, 3)):
+        stats = iv_league_stats(*base, atk, dfn, sta, cap)
+        assert bool(table.valid[atk, dfn, sta]) == stats["eligible"]
+        if stats["eligible"]:
+            assert table.cp[atk, dfn, sta] == stats["cp"]
+            assert cap is None or stats["cp"] <= cap
+            assert table.stat_product[atk, dfn, sta] == pytest.approx(stats["stat_product"])
+
+
+def test_ranks_follow_stat_product():
+    table = LeagueRankTable(*SPECIES[0], LEAGUE_CP_CAPS["Great"])
+    assert table.rank[table.best_ivs] == 1
+    assert table.rank.min() == 1 and table.rank.max() <= 4096
+
+    flat_product = table.stat_product.ravel()
+    flat_rank = table.rank.ravel()
+    for i in np.random.default_rng(0).integers(0, 4096, 200):
+        assert flat_rank[i] == 1 + np.sum(flat_product > flat_product[i])
+
+
+def test_master_league_best_is_hundo():
+    table = LeagueRankTable(*SPECIES[2], LEAGUE_CP_CAPS["Master"])
+    assert table.best_ivs == (15, 15, 15)
+    assert table.lookup(15, 15, 15)["level"] == DEFAULT_LEVEL_CEILING
+
+
+def test_ineligible_ivs_rank_last():
+    # Even level 1 is over a CP cap of 10
+    table = LeagueRankTable(*SPECIES[2], 10)
+    assert not table.valid.all()
+    assert table.stat_product[~table.valid].max() == 0
+
+
+def test_precomputed_tables_match_in_process(tmp_path):
+    leagues = list(LEAGUE_CP_CAPS)
+    tables = [LeagueRankTable(*SPECIES[0], LEAGUE_CP_CAPS[league]) for league in leagues]
+    np.save(tmp_path / RANK_TABLE_FILENAME, np.stack([t.rank for t in tables])[None])
+    with open(tmp_path / RANK_INDEX_FILENAME, "w", encoding="utf-8") as f:
+        json.dump({
+            "format_version": RANK_TABLE_FORMAT_VERSION,
+            "level_ceiling": DEFAULT_LEVEL_CEILING,
+            "leagues": leagues,
+            "species": [{
+                "pokedex_number": AZUMARILL["pokedex_number"],
+                "base_stats": list(SPECIES[0]),
+                "best": [[*t.best_ivs, t.max_stat_product] for t in tables],
+            }],
+        }, f)
+
+    precomputed = PrecomputedRankTables(tmp_path)
+    for league, table in zip(leagues, tables):
+        for ivs in [(0, 15, 15), (15, 15, 15), (7, 3, 12)]:
+            expected = table.lookup(*ivs)
+            got = precomputed.lookup(AZUMARILL, league, DEFAULT_LEVEL_CEILING, *ivs)
+            assert {k: got[k] for k in expected} == expected
+
+    changed = dict(AZUMARILL, base_attack=113)
+    assert precomputed.lookup(changed, "Great", DEFAULT_LEVEL_CEILING, 0, 0, 0) is None
+    assert precomputed.lookup(AZUMARILL, "Great", 40.0, 0, 0, 0) is None
@@ -0,0 +1,42 @@
+import numpy as np
+
+from app.api.analysis import _release_recording
+from app.services.screen_recording import TEXT_BLOCK, iter_encoded_frames, text_changed
+
+
+def _strip(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(6 * TEXT_BLOCK, 12 * TEXT_BLOCK), dtype=np.uint8)
+
+
+def test_identical_strips_are_unchanged():
+    strip = _strip()
+    assert not text_changed(strip, strip.copy())
+
+
+def test_compression_noise_is_unchanged():
+    strip = _strip()
+    noisy = np.clip(strip.astype(np.int16) + np.random.default_rng(1).integers(-8, 9, strip.shape), 0, 255)
+    assert not text_changed(strip, noisy.astype(np.uint8))
+
+
+def test_one_changed_block_is_a_change():
+    strip = _strip()
+    changed = strip.copy()
+    changed[:TEXT_BLOCK, :TEXT_BLOCK] = 255 - changed[:TEXT_BLOCK, :TEXT_BLOCK]
+    assert text_changed(strip, changed)
+
+
+def test_different_shapes_are_a_change():
+    strip = _strip()
+    assert text_changed(strip, strip[:-TEXT_BLOCK])
+
+
+def test_release_recording_is_idempotent(tmp_path):
+    path = tmp_path / "recording.mp4"
+    path.write_bytes(b"\0" * 16)
+    frames = iter_encoded_frames(str(path))
+
+    _release_recording(str(path), frames)
+    assert not path.exists()
+    _release_recording(str(path), frames)  # Stream's finally, then the background task
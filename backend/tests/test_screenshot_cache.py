@@ -0,0 +1,94 @@
+from sqlalchemy.exc import OperationalError
+
+from app.models.pokemon_analysis import PokemonAnalysis
+from app.services import screenshot_cache as cache_module
+from app.services.screenshot_cache import Fingerprint, ScreenshotCache
+
+
+# Frame hashes far apart (16+ bits), so only the exact key matches
+A, B, C = 0, 0xFFFF, 0xFFFF_0000
+
+
+def _fp(name, frame_hash=A, text_hash=0):
+    return Fingerprint(sha256=name, frame_hash=frame_hash, text_hash=text_hash)
+
+
+def _analysis(db):
+    row = PokemonAnalysis(pokemon_name="피카츄", cp=500, hp=60)
+    db.add(row)
+    db.commit()
+    return row.id
+
+
+def test_memory_hit_is_exact(db):
+    cache = ScreenshotCache()
+    cache.store(db, _fp("a", 0x0F0F), 1)
+    assert cache.lookup(db, _fp("a", 0x0F0F)) == (1, True)
+
+
+def test_near_duplicate_is_not_exact(db):
+    cache = ScreenshotCache()
+    cache.store(db, _fp("a", 0b1111_0000, 0b1010), 1)
+    assert cache.lookup(db, _fp("b", 0b1111_0001, 0b1010)) == (1, False)
+    assert cache.lookup(db, _fp("c", 0b0000_1111, 0b1010)) is None
+
+
+def test_evicts_least_recently_used(db):
+    cache = ScreenshotCache(max_entries=2)
+    cache._remember(_fp("a", A), 1)
+    cache._remember(_fp("b", B), 2)
+    assert cache._lookup_memory(_fp("a", A)) == (1, True)
+    cache._remember(_fp("c", C), 3)
+    assert cache._lookup_memory(_fp("a", A)) is not None
+    assert cache._lookup_memory(_fp("b", B)) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = ScreenshotCache(ttl_seconds=10)
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache._remember(_fp("a"), 1)
+    cache._remember(_fp("b", B), 2)
+    now[0] = 105.0
+    assert cache._lookup_memory(_fp("b", B)) == (2, True)
+    now[0] = 111.0
+    assert cache._lookup_memory(_fp("a")) is None
+    assert cache._lookup_memory(_fp("b", B)) is None
+    assert cache.stats()[0] == 0
+
+
+def test_database_tier_after_memory_is_cleared(db):
+    cache = ScreenshotCache()
+    analysis_id = _analysis(db)
+    fp = _fp("a", (1 << 63) | 0xFFFF, 0x1234)
+    cache.store(db, fp, analysis_id)
+    cache.clear()
+
+    assert cache.lookup(db, fp) == (analysis_id, True)
+    cache.clear()
+    near = _fp("b", fp.frame_hash ^ 0b101, fp.text_hash)
+    assert cache.lookup(db, near) == (analysis_id, False)
+    assert cache.lookup(db, _fp("c", ~fp.frame_hash & ((1 << 64) - 1), 0)) is None
+
+
+def test_store_ignores_duplicate_rows(db):
+    cache = ScreenshotCache()
+    analysis_id = _analysis(db)
+    cache.store(db, _fp("a"), analysis_id)
+    cache.clear()
+    cache.store(db, _fp("a"), analysis_id)
+    assert cache.lookup(db, _fp("a")) == (analysis_id, True)
+
+
+def test_store_survives_database_errors(db, monkeypatch):
+    cache = ScreenshotCache()
+    analysis_id = _analysis(db)
+
+    def locked():
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(db, "commit", locked)
+    cache.store(db, _fp("a"), analysis_id)
+    monkeypatch.undo()
+
+    assert db.query(PokemonAnalysis).filter(PokemonAnalysis.id == analysis_id).count() == 1
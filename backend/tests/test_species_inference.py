@@ -0,0 +1,63 @@
+import numpy as np
+
+from app.services.iv_solver import level_mask
+from app.services.species_inference import SpeciesIndex, count_matches, infer_species, name_similarity
+from app.utils.cp_calculator import calculate_cp, calculate_hp
+
+SPECIES = [
+    {"pokedex_number": 25, "name_en": "Pikachu", "name_ko": "피카츄", "base_attack": 112, "base_defense": 96, "base_stamina": 111},
+    {"pokedex_number": 26, "name_en": "Raichu", "name_ko": "라이츄", "base_attack": 193, "base_defense": 151, "base_stamina": 155},
+    {"pokedex_number": 133, "name_en": "Eevee", "name_ko": "이브이", "base_attack": 104, "base_defense": 114, "base_stamina": 146},
+    {"pokedex_number": 143, "name_en": "Snorlax", "name_ko": "잠만보", "base_attack": 190, "base_defense": 169, "base_stamina": 330},
+    {"pokedex_number": 150, "name_en": "Mewtwo", "name_ko": "뮤츠", "base_attack": 300, "base_defense": 182, "base_stamina": 214},
+]
+
+
+class FakeLoader:
+    def __init__(self, records, version="test"):
+        self.records = records
+        self.data_version = version
+
+    def get_all_pokemon(self):
+        return list(self.records)
+
+
+def _observe(pokemon, level, ivs):
+    stats = (pokemon["base_attack"], pokemon["base_defense"], pokemon["base_stamina"])
+    return calculate_cp(*stats, *ivs, level), calculate_hp(stats[2], ivs[2], level)
+
+
+def test_index_never_misses_a_matching_species():
+    index = SpeciesIndex(SPECIES)
+    levels = level_mask()
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        pokemon = SPECIES[rng.integers(len(SPECIES))]
+        cp, hp = _observe(pokemon, float(rng.integers(2, 80)) / 2, rng.integers(0, 16, 3))
+        feasible = {index.records[row]["pokedex_number"] for row in index.feasible(cp, hp, levels)}
+        exact = {p["pokedex_number"] for p in SPECIES if count_matches(p, cp, hp, levels)}
+        assert pokemon["pokedex_number"] in exact
+        assert exact <= feasible
+
+
+def test_infer_species_ranks_the_ocr_name_first():
+    loader = FakeLoader(SPECIES, version="ranking")
+    cp, hp = _observe(SPECIES[0], 20.0, (10, 10, 10))
+    results = infer_species(loader, cp, hp, ocr_text="Pikachv CP")
+    assert results[0]["pokemon_id"] == 25
+    assert results[0]["candidate_count"] >= 1
+    assert results == sorted(results, key=lambda r: -r["score"])
+
+
+def test_infer_species_known_level_and_impossible_readings():
+    loader = FakeLoader(SPECIES, version="level")
+    cp, hp = _observe(SPECIES[3], 30.0, (15, 0, 7))
+    assert 143 in [r["pokemon_id"] for r in infer_species(loader, cp, hp, level=30.0)]
+    assert infer_species(loader, 10, 5000) == []
+
+
+def test_name_similarity():
+    assert name_similarity("Raichu", SPECIES[1]) == 1.0
+    assert name_similarity("라이츄 CP", SPECIES[1]) == 1.0
+    assert name_similarity(None, SPECIES[1]) == 0.0
+    assert name_similarity("Raichv", SPECIES[1]) > name_similarity("Raichv", SPECIES[0])